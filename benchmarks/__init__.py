@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the ingest, query and render paths
+
+Run with ``python -m benchmarks.run --help``.
+"""
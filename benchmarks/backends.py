@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Compare the database backends on the queries one dashboard session issues
+
+    python -m benchmarks.backends --rows 1000000
+    python -m benchmarks.backends --backends sqlite,duckdb --repeat 5
+
+SQLite and DuckDB run on fresh embedded files; postgres uses DATABASE_URL/DB_*
+and replaces the registrations already stored there.
+"""
+import argparse
+import json
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_CHOICES = ['sqlite', 'duckdb', 'postgres']
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time the dashboard query set on each database backend")
+    parser.add_argument(
+        "--backends", default='sqlite,duckdb',
+        help=f"Comma-separated backends from {', '.join(BACKEND_CHOICES)} (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000,
+        help="Synthetic vehicle_registrations rows (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Timed runs per query (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Write the timings to this JSON file"
+    )
+    return parser.parse_args(argv)
+
+def time_query(db_manager, query, params, repeat):
+    """Median seconds and row count of fetch_data(query) over repeat runs"""
+    seconds = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(db_manager.fetch_data(query, params=params))
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), rows
+
+def measure_backend(backend, registrations, filter_selection, repeat, workdir):
+    """Load registrations into one backend and time every dashboard query on it"""
+    from src.config import Config
+    from src.database import DatabaseManager
+    from .scenarios import dashboard_queries
+    from .standin import create_standin_database
+    
+    if backend != 'postgres':
+        Config.DATABASE_URL = create_standin_database(workdir, backend)
+    db_manager = DatabaseManager()
+    if backend == 'postgres':
+        if not db_manager.is_postgres:
+            print("postgres needs a PostgreSQL DATABASE_URL; skipped")
+            return None
+        db_manager.execute_schema()
+        with db_manager.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM vehicle_registrations")
+    
+    start = time.perf_counter()
+    db_manager.insert_dataframe(registrations, 'vehicle_registrations')
+    db_manager.refresh_rollups()
+    load_seconds = time.perf_counter() - start
+    
+    timings = {'load': {'seconds': load_seconds, 'rows': len(registrations)}}
+    for name, (query, params) in dashboard_queries(db_manager, filter_selection).items():
+        seconds, rows = time_query(db_manager, query, params, repeat)
+        timings[name] = {'seconds': seconds, 'rows': rows}
+    
+    db_manager.engine.dispose()
+    return timings
+
+def print_table(results):
+    backends = list(results)
+    names = list(next(iter(results.values())))
+    print(f"{'query':<28}" + "".join(f"{backend:>12}" for backend in backends) + f"{'rows':>12}")
+    for name in names:
+        cells = "".join(f"{results[backend][name]['seconds']:>11.3f}s" for backend in backends)
+        print(f"{name:<28}{cells}{results[backends[0]][name]['rows']:>12,}")
+    totals = "".join(
+        f"{sum(t['seconds'] for query, t in results[backend].items() if query != 'load'):>11.3f}s"
+        for backend in backends
+    )
+    print(f"{'total (queries)':<28}{totals}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    backends = args.backends.split(',')
+    unknown = [backend for backend in backends if backend not in BACKEND_CHOICES]
+    if unknown:
+        print(f"Unknown backends: {', '.join(unknown)}. Available: {', '.join(BACKEND_CHOICES)}")
+        return 2
+    
+    from .scenarios import BenchmarkContext
+    
+    workdir = tempfile.mkdtemp(prefix='vehicle_dashboard_backends_')
+    try:
+        ctx = BenchmarkContext(None, workdir, args.rows, 0, seed=args.seed)
+        registrations = ctx.registrations
+        filter_selection = ctx.filter_selection
+        
+        results = {}
+        for backend in backends:
+            timings = measure_backend(backend, registrations, filter_selection, args.repeat, workdir)
+            if timings is not None:
+                results[backend] = timings
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    if not results:
+        return 2
+    print_table(results)
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'rows': args.rows, 'repeat': args.repeat, 'backends': results}, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
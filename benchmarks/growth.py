@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Time the quarterly growth view against the row-filtering loop it replaced
+
+    python -m benchmarks.growth --rows 1000000
+    python -m benchmarks.growth --rows 5000000 --repeat 5
+
+Both paths start from the same compact dashboard frame and must produce
+the same quarterly frame; the command exits with status 1 if they differ.
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import pandas as pd
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the vectorized quarterly growth view with the loop it replaced")
+    parser.add_argument(
+        "--rows", type=int, default=1000000,
+        help="Synthetic registration rows (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Timed runs per implementation (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Write the timings to this JSON file"
+    )
+    return parser.parse_args(argv)
+
+def timed(function, repeat):
+    """(median seconds, last result) of repeat calls"""
+    seconds = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), result
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    from src.utils.frame_types import compact_registrations_frame
+    from src.utils.growth_calculator import GrowthCalculator
+    from . import reference, synthetic
+    
+    frame = compact_registrations_frame(synthetic.dashboard_frame(synthetic.generate_registrations(args.rows, seed=args.seed)))
+    
+    # Each run builds its own cube, as a dashboard rerun without a shared one does
+    vectorized_seconds, vectorized = timed(lambda: GrowthCalculator.calculate_view('qoq', frame), args.repeat)
+    loop_seconds, loop = timed(lambda: reference.expand_quarters_loop(frame), args.repeat)
+    
+    print(f"{'vectorized':<12} {vectorized_seconds:>9.3f}s median  {len(frame):>12,} rows")
+    print(f"{'loop':<12} {loop_seconds:>9.3f}s median  {len(frame):>12,} rows")
+    print(f"{'speedup':<12} {loop_seconds / vectorized_seconds:>9.1f}x")
+    
+    try:
+        # Only the loop's pre-sort row labels are expected to differ
+        pd.testing.assert_frame_equal(vectorized, loop.reset_index(drop=True))
+        identical = True
+    except AssertionError as e:
+        print(f"Vectorized output differs from the loop: {e}")
+        identical = False
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'rows': args.rows,
+                'repeat': args.repeat,
+                'vectorized_seconds': vectorized_seconds,
+                'loop_seconds': loop_seconds,
+                'identical': identical
+            }, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if identical else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Peak memory of parsing growing Excel files whole versus streaming them
+
+    python -m benchmarks.ingest_memory --rows 10000,40000,160000
+    python -m benchmarks.ingest_memory --chunk-size 2000
+
+Each file is parsed in a fresh process, once with pd.read_excel (the
+default load path) and once through DataProcessor.iter_excel_chunks (the
+--stream path), which reports its peak RSS above the RSS it had after
+importing. The streamed peak should stay flat as files grow.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ['read_excel', 'stream']
+
+PROBE = """
+import json, resource, sys, time
+from src.data_processor import DataProcessor
+from src.utils.instrumentation import current_rss_bytes
+# Imported up front so neither mode counts loading openpyxl as parsing memory
+import openpyxl
+
+def peak_rss_bytes():
+    # ru_maxrss survives fork and exec, so it can report the parent's peak; VmHWM cannot
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        pass
+
+mode, path, chunk_size = sys.argv[1], sys.argv[2], int(sys.argv[3])
+reset_peak_rss()
+start_rss = current_rss_bytes()
+start = time.perf_counter()
+if mode == 'read_excel':
+    frame = DataProcessor.parse_excel_file(path)
+    records = 0 if frame is None else len(frame)
+    total = 0 if frame is None else int(frame['registrations_count'].sum())
+else:
+    records = total = 0
+    for chunk in DataProcessor.iter_excel_chunks(path, chunk_size):
+        records += len(chunk)
+        total += int(chunk['registrations_count'].sum())
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'records': records,
+    'total': total,
+    'peak_rss_delta_bytes': peak_rss_bytes() - start_rss
+}))
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare peak memory of whole-file and streamed Excel parsing")
+    parser.add_argument(
+        "--rows", default="10000,40000,160000",
+        help="Comma-separated sheet row counts, one synthetic file each (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=5000,
+        help="Sheet rows per streamed chunk (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Write the measurements to this JSON file"
+    )
+    return parser.parse_args(argv)
+
+def write_file(workdir, rows, seed):
+    """Path of a synthetic Vahan workbook with rows data rows"""
+    from . import synthetic
+    
+    path = os.path.join(workdir, f"2024_2W_{rows}.xlsx")
+    synthetic.write_vahan_workbook(path, rows, seed=seed)
+    return path
+
+def run_probe(path, mode, chunk_size):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE, mode, path, str(chunk_size)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def measure(row_counts, chunk_size, seed=0, modes=MODES):
+    """{rows: {mode: probe result}} for one synthetic file per row count"""
+    workdir = tempfile.mkdtemp(prefix='vehicle_dashboard_ingest_memory_')
+    try:
+        results = {}
+        for rows in row_counts:
+            path = write_file(workdir, rows, seed)
+            results[rows] = {mode: run_probe(path, mode, chunk_size) for mode in modes}
+            os.remove(path)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    row_counts = [int(rows) for rows in args.rows.split(',')]
+    results = measure(row_counts, args.chunk_size, args.seed)
+    
+    for rows, modes in results.items():
+        for mode, result in modes.items():
+            print(
+                f"{rows:>10,} rows  {mode:<12} {result['seconds']:>8.2f}s  "
+                f"peak +{result['peak_rss_delta_bytes'] / 1024 / 1024:>8.1f} MB"
+            )
+    
+    consistent = all(
+        modes['stream']['records'] == modes['read_excel']['records'] and modes['stream']['total'] == modes['read_excel']['total']
+        for modes in results.values()
+    )
+    if not consistent:
+        print("Streamed records differ from read_excel")
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'chunk_size': args.chunk_size, 'files': results}, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if consistent else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression checks against a seeded PostgreSQL database
+
+    python -m benchmarks.plans
+    python -m benchmarks.plans --rows 500000 --budget-scale 1.5
+
+Every statement the dashboard and DataProcessor issue is run under
+EXPLAIN (ANALYZE, BUFFERS) inside a transaction that is rolled back, so
+checks of DELETE and INSERT statements leave the data untouched. A check
+fails when its plan sequentially scans a relation it must reach through an
+index, scans more partitions than the predicate allows, or touches more
+shared buffers (hit + read) than its budget. Budgets are stated per 1,000
+rows in vehicle_registrations so they hold at any seeded scale.
+
+An empty vehicle_registrations table is seeded with synthetic rows through
+the loader's own upsert path; a populated one is checked as it is.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import date, datetime, timezone
+from sqlalchemy import bindparam, text
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(os.path.dirname(BENCHMARK_DIR), 'database', 'schema.sql')
+STAGING_TABLE = 'vehicle_registrations_staging'
+PARTITION_PREFIXES = ('vehicle_registrations_y', 'vehicle_registrations_default')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN (ANALYZE, BUFFERS) every dashboard and loader query and flag plan regressions")
+    parser.add_argument(
+        "--rows", type=int, default=200000,
+        help="Synthetic rows seeded into an empty database (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--checks", default=None,
+        help="Comma-separated check names (default: all)"
+    )
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0,
+        help="Multiplier applied to every buffer budget (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Write the plan summaries as JSON to this path"
+    )
+    return parser.parse_args(argv)
+
+class PlanCheck:
+    """One statement and the plan properties it must keep
+    
+    no_seq_scan holds relation-name prefixes that must not be read by a
+    sequential scan; a prefix also matches the partitions of a table.
+    setup(conn, sample) runs first in the same rolled-back transaction.
+    """
+    
+    def __init__(self, name, sql, params=None, no_seq_scan=(), max_partitions=None,
+                 base_blocks=0, blocks_per_1k_rows=0, setup=None):
+        self.name = name
+        self.sql = sql
+        self.params = params or {}
+        self.no_seq_scan = no_seq_scan
+        self.max_partitions = max_partitions
+        self.base_blocks = base_blocks
+        self.blocks_per_1k_rows = blocks_per_1k_rows
+        self.setup = setup
+    
+    def budget(self, table_rows, scale=1.0):
+        """Shared buffers the statement may touch at this table size"""
+        return int((self.base_blocks + self.blocks_per_1k_rows * table_rows / 1000) * scale)
+
+def plan_nodes(plan):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+def summarize_plan(explain_output):
+    """Relations scanned, partition count and buffer totals of one EXPLAIN ANALYZE result
+    
+    Nodes that never ran (pruned at execution time) are ignored. The root
+    node's buffer counts already include its children.
+    """
+    root = explain_output[0]['Plan']
+    executed = [node for node in plan_nodes(root) if node.get('Actual Loops', 1) > 0]
+    relations = sorted({node['Relation Name'] for node in executed if 'Relation Name' in node})
+    
+    return {
+        'node_types': sorted({node['Node Type'] for node in executed}),
+        'relations': relations,
+        'seq_scans': sorted({node['Relation Name'] for node in executed if node['Node Type'] == 'Seq Scan'}),
+        'partitions': [relation for relation in relations if relation.startswith(PARTITION_PREFIXES)],
+        'shared_hit_blocks': root.get('Shared Hit Blocks', 0),
+        'shared_read_blocks': root.get('Shared Read Blocks', 0),
+        'shared_blocks': root.get('Shared Hit Blocks', 0) + root.get('Shared Read Blocks', 0),
+        'execution_ms': explain_output[0].get('Execution Time')
+    }
+
+def evaluate(check, summary, table_rows, scale=1.0):
+    """Failure messages for a plan summary; empty when the plan is acceptable"""
+    failures = []
+    
+    for relation in summary['seq_scans']:
+        if any(relation.startswith(prefix) for prefix in check.no_seq_scan):
+            failures.append(f"sequential scan on {relation}")
+    
+    if check.max_partitions is not None and len(summary['partitions']) > check.max_partitions:
+        failures.append(
+            f"scanned {len(summary['partitions'])} partitions ({', '.join(summary['partitions'])}), "
+            f"expected at most {check.max_partitions}"
+        )
+    
+    budget = check.budget(table_rows, scale)
+    if summary['shared_blocks'] > budget:
+        failures.append(f"touched {summary['shared_blocks']} shared buffers, budget {budget}")
+    
+    return failures
+
+def explain(conn, sql, params):
+    """Run EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) on sql; list params expand like IN lists"""
+    expanding = [name for name, value in params.items() if isinstance(value, (list, tuple))]
+    statement = text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+    statement = statement.bindparams(*[bindparam(name, expanding=True) for name in expanding])
+    output = conn.execute(statement, params).scalar()
+    return json.loads(output) if isinstance(output, str) else output
+
+def stage_source_file(conn, sample):
+    """Stage one loaded file's rows again, as a reload of an unchanged file would"""
+    from src.queries import NATURAL_KEY
+    conn.execute(text(
+        f"CREATE TEMPORARY TABLE {STAGING_TABLE} AS "
+        f"SELECT {', '.join(NATURAL_KEY)}, registrations_count FROM vehicle_registrations "
+        f"WHERE source_file = :source_file"
+    ), {'source_file': sample['source_file']})
+    conn.execute(text(f"ANALYZE {STAGING_TABLE}"))
+
+def rollup_definition(conn, view_name):
+    """SELECT behind a materialized view, which REFRESH re-runs in full"""
+    return conn.execute(text("SELECT pg_get_viewdef(CAST(:view AS regclass))"), {'view': view_name}).scalar().rstrip().rstrip(';')
+
+def sample_values(conn):
+    """Representative filter values drawn from the seeded data"""
+    latest_year = conn.execute(text("SELECT MAX(year) FROM mv_yearly_category")).scalar()
+    manufacturers = conn.execute(text(
+        "SELECT manufacturer FROM mv_yearly_manufacturer GROUP BY manufacturer "
+        "ORDER BY SUM(total_registrations) DESC"
+    )).scalars().all()
+    source_file = conn.execute(text(
+        "SELECT source_file FROM vehicle_registrations "
+        "WHERE registration_date >= :start AND registration_date < :end LIMIT 1"
+    ), {'start': date(latest_year, 1, 1), 'end': date(latest_year + 1, 1, 1)}).scalar()
+    
+    return {
+        'latest_year': latest_year,
+        'top_manufacturers': manufacturers[:15],
+        # A drill-down: a few mid-ranked manufacturers in one year
+        'drilldown_manufacturers': manufacturers[len(manufacturers) // 10:len(manufacturers) // 10 + 3],
+        'categories': conn.execute(text(
+            "SELECT DISTINCT vehicle_category FROM mv_yearly_category ORDER BY 1"
+        )).scalars().all(),
+        'years': conn.execute(text("SELECT DISTINCT year FROM mv_yearly_category ORDER BY 1")).scalars().all(),
+        'source_file': source_file
+    }
+
+def build_checks(conn, sample, date_part):
+    """Every statement the dashboard and DataProcessor issue, with its plan expectations"""
+    from src.queries import (
+        DASHBOARD_DATA_QUERY, FILTER_YEARS_QUERY, FILTER_CATEGORIES_QUERY, FILTER_MANUFACTURERS_QUERY,
+        MANIFEST_QUERY, FORGET_SOURCE_FILES_QUERY, ROLLUP_VIEWS,
+        RegistrationQueryBuilder, GrowthQueryBuilder, UpsertQueryBuilder
+    )
+    
+    def registrations_query(years, categories, manufacturers):
+        statement, params = RegistrationQueryBuilder.build(years, categories, manufacturers)
+        return statement.text, params
+    
+    default_sql, default_params = registrations_query(sample['years'], sample['categories'], sample['top_manufacturers'])
+    drilldown_sql, drilldown_params = registrations_query(
+        [sample['latest_year']], sample['categories'], sample['drilldown_manufacturers']
+    )
+    latest_year_range = {'start': date(sample['latest_year'], 1, 1), 'end': date(sample['latest_year'] + 1, 1, 1)}
+    
+    checks = [
+        # Dashboard reads
+        PlanCheck('data_version', "SELECT version FROM data_version WHERE id = 1", base_blocks=10),
+        PlanCheck('dashboard_data', DASHBOARD_DATA_QUERY, base_blocks=50, blocks_per_1k_rows=30),
+        PlanCheck('filter_years', FILTER_YEARS_QUERY, base_blocks=20),
+        PlanCheck('filter_categories', FILTER_CATEGORIES_QUERY, base_blocks=20),
+        PlanCheck('filter_manufacturers', FILTER_MANUFACTURERS_QUERY, base_blocks=100, blocks_per_1k_rows=1),
+        PlanCheck('dashboard_filter_default', default_sql, default_params, base_blocks=50, blocks_per_1k_rows=30),
+        PlanCheck(
+            'dashboard_filter_drilldown', drilldown_sql, drilldown_params,
+            no_seq_scan=('mv_registrations_daily',), base_blocks=50, blocks_per_1k_rows=2
+        ),
+        
+        # DataProcessor: manifest, per-file upsert and year drops
+        PlanCheck('manifest_load', MANIFEST_QUERY, base_blocks=20),
+        PlanCheck(
+            'upsert_delete_stale', UpsertQueryBuilder.delete_stale(STAGING_TABLE), {'source_file': sample['source_file']},
+            base_blocks=100, blocks_per_1k_rows=20, setup=stage_source_file
+        ),
+        PlanCheck(
+            'upsert_insert', UpsertQueryBuilder.insert(STAGING_TABLE), {'source_file': sample['source_file']},
+            no_seq_scan=PARTITION_PREFIXES,
+            base_blocks=100, blocks_per_1k_rows=80, setup=stage_source_file
+        ),
+        PlanCheck(
+            'forget_source_files', FORGET_SOURCE_FILES_QUERY, latest_year_range,
+            max_partitions=1, base_blocks=50, blocks_per_1k_rows=25
+        )
+    ]
+    
+    # Growth reports and the rollup refreshes
+    for grain, dimension in [('year', 'category'), ('quarter', 'category'), ('year', 'manufacturer'), ('month', 'state')]:
+        on_rollup = (grain, dimension) in GrowthQueryBuilder.ROLLUP_SOURCES
+        checks.append(PlanCheck(
+            f"growth_{grain}_{dimension}", GrowthQueryBuilder.build(grain, dimension, date_part),
+            base_blocks=100, blocks_per_1k_rows=1 if on_rollup else 30
+        ))
+    
+    for view_name in ROLLUP_VIEWS:
+        checks.append(PlanCheck(
+            f"refresh_{view_name}", rollup_definition(conn, view_name),
+            base_blocks=100, blocks_per_1k_rows=40
+        ))
+    
+    return checks
+
+def seed_database(db_manager, rows, seed):
+    """Load synthetic rows file by file through DataProcessor, then publish and analyze"""
+    from src.data_processor import DataProcessor
+    from .synthetic import generate_registrations
+    
+    registrations = generate_registrations(rows, seed=seed)
+    registrations['registration_date'] = registrations['registration_date'].dt.date
+    processor = DataProcessor(db_manager)
+    
+    # One source file per year and category, like YYYY_XW.xlsx exports
+    years = registrations['registration_date'].map(lambda value: value.year)
+    for (year, category), frame in registrations.groupby([years, 'vehicle_category'], observed=True):
+        processor.load_file(frame, {
+            'file_name': f"{year}_{category}.xlsx",
+            'content_hash': '0' * 64,
+            'file_size': 0,
+            'file_mtime': 0.0
+        })
+    processor.publish_changes()
+    
+    with db_manager.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    from src.database import DatabaseManager
+    
+    db_manager = DatabaseManager()
+    if not db_manager.is_postgres:
+        print("Plan checks need a PostgreSQL DATABASE_URL (EXPLAIN ANALYZE with BUFFERS)")
+        return 2
+    db_manager.execute_schema(SCHEMA_PATH)
+    
+    table_rows = db_manager.fetch_data("SELECT COUNT(*) AS n FROM vehicle_registrations")['n'].iloc[0]
+    if table_rows == 0:
+        print(f"Seeding {args.rows:,} synthetic rows")
+        seed_database(db_manager, args.rows, args.seed)
+        table_rows = db_manager.fetch_data("SELECT COUNT(*) AS n FROM vehicle_registrations")['n'].iloc[0]
+    else:
+        print(f"Checking the existing {table_rows:,} rows")
+    
+    with db_manager.engine.connect() as conn:
+        sample = sample_values(conn)
+        checks = build_checks(conn, sample, db_manager.backend.date_part)
+    
+    if args.checks:
+        names = args.checks.split(',')
+        unknown = [name for name in names if name not in {check.name for check in checks}]
+        if unknown:
+            print(f"Unknown checks: {', '.join(unknown)}. Available: {', '.join(check.name for check in checks)}")
+            return 2
+        checks = [check for check in checks if check.name in names]
+    
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'table_rows': int(table_rows),
+        'budget_scale': args.budget_scale,
+        'checks': {}
+    }
+    failed = 0
+    
+    for check in checks:
+        with db_manager.engine.connect() as conn:
+            transaction = conn.begin()
+            try:
+                if check.setup is not None:
+                    check.setup(conn, sample)
+                summary = summarize_plan(explain(conn, check.sql, check.params))
+            finally:
+                transaction.rollback()
+        
+        failures = evaluate(check, summary, table_rows, args.budget_scale)
+        summary['budget'] = check.budget(table_rows, args.budget_scale)
+        summary['failures'] = failures
+        results['checks'][check.name] = summary
+        
+        status = 'FAIL' if failures else 'ok'
+        print(f"{check.name:<36} {status:<4} {summary['shared_blocks']:>9,} / {summary['budget']:>9,} buffers  {summary['execution_ms']:>9.1f} ms")
+        for failure in failures:
+            print(f"    {failure}")
+        failed += bool(failures)
+    
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Plan summaries written to {args.output}")
+    
+    print(f"{len(checks) - failed} of {len(checks)} plan checks passed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
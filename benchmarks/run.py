@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark scenarios and compare them with a stored baseline
+
+    python -m benchmarks.run --rows 100000
+    python -m benchmarks.run --rows 100000 --save-baseline
+    python -m benchmarks.run --backend duckdb --rows 1000000
+    python -m benchmarks.run --backend postgres --rows 1000000 --repeat 5
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ingest, query and render paths on synthetic data")
+    parser.add_argument(
+        "--backend", choices=['sqlite', 'duckdb', 'postgres'], default='sqlite',
+        help="sqlite and duckdb run against an embedded stand-in; postgres uses DATABASE_URL/DB_* (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000,
+        help="Synthetic vehicle_registrations rows, 10k to 10M (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--excel-rows", type=int, default=None,
+        help="Rows spread across the synthetic Excel files (default: rows / 10)"
+    )
+    parser.add_argument(
+        "--scenarios", default=None,
+        help="Comma-separated scenario names (default: all)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Timed runs per scenario (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Results JSON path (default: benchmarks/results/<timestamp>.json)"
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE,
+        help="Baseline JSON to compare against (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="Store these results as the new baseline"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed slowdown over the baseline median before flagging a regression (default: %(default)s)"
+    )
+    return parser.parse_args(argv)
+
+def time_scenario(name, setup, ctx, repeat):
+    """Run setup once, then time run() repeat times"""
+    run, reset = setup(ctx)
+    
+    seconds = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = int(run())
+        seconds.append(time.perf_counter() - start)
+        if reset is not None:
+            reset()
+    
+    median = statistics.median(seconds)
+    return {
+        'seconds_median': median,
+        'seconds_min': min(seconds),
+        'runs': seconds,
+        'rows': rows,
+        'rows_per_second': rows / median if median else None
+    }
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return (regressions, notes) for scenarios slower than baseline * (1 + tolerance)"""
+    regressions = []
+    notes = []
+    
+    if baseline.get('backend') != results['backend'] or baseline.get('rows') != results['rows']:
+        notes.append(
+            f"Baseline was recorded with backend={baseline.get('backend')} rows={baseline.get('rows')}; "
+            f"this run used backend={results['backend']} rows={results['rows']}, so timings are not compared"
+        )
+        return regressions, notes
+    
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            notes.append(f"{name}: no baseline entry")
+            continue
+        
+        ratio = current['seconds_median'] / previous['seconds_median'] if previous['seconds_median'] else float('inf')
+        if ratio > 1 + tolerance:
+            regressions.append({
+                'scenario': name,
+                'baseline_seconds': previous['seconds_median'],
+                'seconds': current['seconds_median'],
+                'ratio': ratio
+            })
+    
+    return regressions, notes
+
+def environment_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__
+    }
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    workdir = tempfile.mkdtemp(prefix='vehicle_dashboard_bench_')
+    try:
+        return run_benchmarks(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def run_benchmarks(args, workdir):
+    # Point the app at the stand-in before any DatabaseManager is created
+    from src.config import Config
+    if args.backend != 'postgres':
+        from .standin import create_standin_database
+        Config.DATABASE_URL = create_standin_database(workdir, args.backend)
+    
+    from src.database import DatabaseManager
+    from .scenarios import SCENARIOS, BenchmarkContext
+    
+    db_manager = DatabaseManager()
+    if args.backend == 'postgres' and not db_manager.is_postgres:
+        print("--backend postgres needs a PostgreSQL DATABASE_URL")
+        return 2
+    if args.backend == 'postgres':
+        db_manager.execute_schema()
+    
+    names = args.scenarios.split(',') if args.scenarios else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+        return 2
+    
+    ctx = BenchmarkContext(db_manager, workdir, args.rows, args.excel_rows or max(1, args.rows // 10), seed=args.seed)
+    
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'backend': args.backend,
+        'rows': args.rows,
+        'excel_rows': ctx.excel_rows,
+        'repeat': args.repeat,
+        'environment': environment_info(),
+        'scenarios': {},
+        'skipped': {}
+    }
+    
+    for name in names:
+        definition = SCENARIOS[name]
+        if definition['backends'] and db_manager.backend.name not in definition['backends']:
+            reason = f"not supported on {db_manager.backend.name}"
+            results['skipped'][name] = reason
+            print(f"{name:<28} skipped ({reason})")
+            continue
+        
+        result = time_scenario(name, definition['setup'], ctx, args.repeat)
+        results['scenarios'][name] = result
+        print(f"{name:<28} {result['seconds_median']:>9.3f}s median  {result['rows']:>10,} rows")
+    
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (use --save-baseline to record one)")
+        return 0
+    
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    
+    regressions, notes = compare_to_baseline(results, baseline, args.tolerance)
+    for note in notes:
+        print(note)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['scenario']}: {regression['seconds']:.3f}s vs "
+            f"{regression['baseline_seconds']:.3f}s baseline ({regression['ratio']:.2f}x)"
+        )
+    
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
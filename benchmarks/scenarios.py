@@ -0,0 +1,238 @@
+"""
+Timed benchmark scenarios
+
+Each scenario does its setup and returns (run, reset): run() performs the
+timed work and returns the number of rows it processed, reset() (or None)
+restores state between repeats outside the timed region.
+"""
+import os
+import subprocess
+import sys
+from functools import cached_property
+import pandas as pd
+from sqlalchemy import text
+from src.config import Config
+from src.data_processor import DataProcessor
+from src.queries import (
+    DASHBOARD_DATA_QUERY,
+    FILTER_YEARS_QUERY,
+    FILTER_CATEGORIES_QUERY,
+    FILTER_MANUFACTURERS_QUERY,
+    GrowthQueryBuilder,
+    RegistrationQueryBuilder
+)
+from src.utils.frame_types import compact_registrations_frame
+from . import reference, synthetic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {}
+
+def scenario(name, backends=None):
+    """Register a scenario setup function under name, limited to some backends if given"""
+    def register(setup):
+        SCENARIOS[name] = {'setup': setup, 'backends': backends}
+        return setup
+    return register
+
+class BenchmarkContext:
+    """Shared inputs for one benchmark run, built lazily and reused across scenarios"""
+    
+    def __init__(self, db_manager, workdir, rows, excel_rows, seed=0):
+        self.db_manager = db_manager
+        self.workdir = workdir
+        self.rows = rows
+        self.excel_rows = excel_rows
+        self.seed = seed
+    
+    @cached_property
+    def registrations(self):
+        return synthetic.generate_registrations(self.rows, seed=self.seed)
+    
+    @cached_property
+    def frame(self):
+        """Compact dashboard working set over the synthetic registrations"""
+        return compact_registrations_frame(synthetic.dashboard_frame(self.registrations))
+    
+    @cached_property
+    def raw_folder(self):
+        folder = os.path.join(self.workdir, 'data', 'raw')
+        synthetic.write_vahan_files(folder, self.excel_rows, seed=self.seed)
+        return folder
+    
+    @cached_property
+    def wide_sheet(self):
+        """read_excel-shaped wide state-level sheet with excel_rows data rows"""
+        return reference.wide_vahan_sheet(self.excel_rows, seed=self.seed)
+    
+    @cached_property
+    def filter_selection(self):
+        """Two years, every category and the 15 largest manufacturers, like the default view"""
+        years = sorted(self.frame['registration_date'].dt.year.unique())[-2:]
+        categories = list(self.frame['vehicle_category'].cat.categories)
+        manufacturers = self.frame.groupby('manufacturer', observed=True)['total_registrations'].sum().nlargest(15).index.tolist()
+        return years, categories, manufacturers
+    
+    def clear_registrations(self):
+        with self.db_manager.engine.begin() as conn:
+            conn.execute(text("DELETE FROM vehicle_registrations"))
+            conn.execute(text("DELETE FROM ingest_manifest"))
+    
+    def ensure_registrations_loaded(self):
+        """Load the synthetic rows once so read scenarios have data to query"""
+        count = self.db_manager.fetch_data("SELECT COUNT(*) AS n FROM vehicle_registrations")['n'].iloc[0]
+        if count != len(self.registrations):
+            self.clear_registrations()
+            self.db_manager.insert_dataframe(self.registrations, 'vehicle_registrations')
+        self.db_manager.refresh_rollups()
+
+@scenario('process_excel_files')
+def bench_process_excel_files(ctx):
+    folder = ctx.raw_folder
+    processor = DataProcessor(ctx.db_manager)
+    
+    def run():
+        result = processor.process_excel_files(folder, force=True)
+        return 0 if result is None else len(result)
+    
+    return run, ctx.clear_registrations
+
+@scenario('clean_and_transform_data')
+def bench_clean_and_transform_data(ctx):
+    sheet = ctx.wide_sheet
+    
+    def run():
+        DataProcessor.clean_and_transform_data(sheet, '2W', '2024', 'benchmark.xlsx')
+        return len(sheet)
+    
+    return run, None
+
+# The row loop clean_and_transform_data replaced, for the speedup
+@scenario('clean_and_transform_rows')
+def bench_clean_and_transform_rows(ctx):
+    sheet = ctx.wide_sheet
+    
+    def run():
+        reference.clean_and_transform_rows(sheet, '2W', '2024')
+        return len(sheet)
+    
+    return run, None
+
+@scenario('insert_dataframe')
+def bench_insert_dataframe(ctx):
+    registrations = ctx.registrations
+    
+    def run():
+        ctx.db_manager.insert_dataframe(registrations, 'vehicle_registrations')
+        return len(registrations)
+    
+    ctx.clear_registrations()
+    return run, ctx.clear_registrations
+
+# DuckDB allows one writing process, and the benchmark process holds the file open
+@scenario('load_data', backends=('postgresql', 'sqlite'))
+def bench_load_data(ctx):
+    # load_data.py reads data/raw relative to its working directory
+    folder = ctx.raw_folder
+    env = dict(os.environ, DATABASE_URL=Config.get_database_url(), PYTHONPATH=REPO_ROOT)
+    excel_files = [name for name in os.listdir(folder) if name.endswith('.xlsx')]
+    
+    def run():
+        subprocess.run(
+            [sys.executable, os.path.join(REPO_ROOT, 'load_data.py'), '--force'],
+            cwd=ctx.workdir, env=env, check=True, capture_output=True
+        )
+        return ctx.db_manager.fetch_data("SELECT COUNT(*) AS n FROM vehicle_registrations")['n'].iloc[0] if excel_files else 0
+    
+    return run, ctx.clear_registrations
+
+@scenario('dashboard_filter_memory')
+def bench_dashboard_filter_memory(ctx):
+    from src.dashboard import VehicleDashboard
+    frame = ctx.frame
+    years, categories, manufacturers = ctx.filter_selection
+    
+    def run():
+        VehicleDashboard.filter_data(frame, years, categories, manufacturers)
+        return len(frame)
+    
+    return run, None
+
+@scenario('dashboard_filter_pushdown')
+def bench_dashboard_filter_pushdown(ctx):
+    ctx.ensure_registrations_loaded()
+    years, categories, manufacturers = ctx.filter_selection
+    statement, params = RegistrationQueryBuilder.build(years, categories, manufacturers)
+    
+    def run():
+        return len(ctx.db_manager.fetch_data(statement, params=params))
+    
+    return run, None
+
+# Every query one dashboard session issues against the database
+def dashboard_queries(db_manager, filter_selection):
+    years, categories, manufacturers = filter_selection
+    statement, params = RegistrationQueryBuilder.build(years, categories, manufacturers)
+    queries = {
+        'dashboard_data': (DASHBOARD_DATA_QUERY, None),
+        'filter_years': (FILTER_YEARS_QUERY, None),
+        'filter_categories': (FILTER_CATEGORIES_QUERY, None),
+        'filter_manufacturers': (FILTER_MANUFACTURERS_QUERY, None),
+        'filtered_registrations': (statement, params)
+    }
+    for grain in GrowthQueryBuilder.PERIOD_COLUMNS:
+        for dimension in ('category', 'manufacturer'):
+            queries[f"growth_{grain}_{dimension}"] = (
+                GrowthQueryBuilder.build(grain, dimension, db_manager.backend.date_part), None
+            )
+    return queries
+
+@scenario('dashboard_queries')
+def bench_dashboard_queries(ctx):
+    ctx.ensure_registrations_loaded()
+    queries = dashboard_queries(ctx.db_manager, ctx.filter_selection)
+    
+    def run():
+        return sum(len(ctx.db_manager.fetch_data(query, params=params)) for query, params in queries.values())
+    
+    return run, None
+
+@scenario('growth_calculator')
+def bench_growth_calculator(ctx):
+    from src.utils.growth_calculator import GrowthCalculator
+    frame = ctx.frame
+    
+    def run():
+        GrowthCalculator.calculate_enhanced_growth_metrics(frame)
+        return len(frame)
+    
+    return run, None
+
+@scenario('create_enhanced_chart')
+def bench_create_enhanced_chart(ctx):
+    from src.components import charts
+    from src.components.charts import ChartComponent
+    frame = ctx.frame
+    yearly = frame.groupby([frame['registration_date'].dt.year, 'vehicle_category'], observed=True)['total_registrations'].sum().reset_index()
+    yearly.columns = ['Year', 'Category', 'Registrations']
+    shares = frame.groupby('vehicle_category', observed=True)['total_registrations'].sum()
+    top_types = frame.groupby('manufacturer', observed=True)['total_registrations'].sum().nlargest(15)
+    # One point per day and category, the largest series the dashboard could plot
+    daily = frame.groupby(['registration_date', 'vehicle_category'], observed=True)['total_registrations'].sum().reset_index()
+    
+    def run():
+        ChartComponent.create_enhanced_chart(yearly, 'line', x='Year', y='Registrations', color='Category')
+        ChartComponent.create_enhanced_chart(
+            pd.DataFrame({'Category': shares.index, 'Share': shares.values}), 'pie',
+            values='Share', names='Category'
+        )
+        ChartComponent.create_enhanced_chart(
+            pd.DataFrame({'Vehicle Type': top_types.index, 'Registrations': top_types.values}), 'horizontal_bar',
+            x='Registrations', y='Vehicle Type', color='Registrations'
+        )
+        ChartComponent.create_enhanced_chart(daily, 'line', x='registration_date', y='total_registrations', color='vehicle_category')
+        return len(yearly) + len(shares) + len(top_types) + len(daily)
+    
+    # Every run builds its figures; a warm figure cache would only time the lookups
+    charts._figure_cache.clear()
+    return run, charts._figure_cache.clear
@@ -0,0 +1,30 @@
+"""
+Embedded stand-ins for the PostgreSQL database
+
+SQLite and DuckDB run the same read paths against database/schema_sqlite.sql
+and database/schema_duckdb.sql, where plain views take the place of the
+materialized rollups.
+"""
+import os
+from src.backends import backend_class
+
+STANDIN_FILES = {
+    'sqlite': 'standin.db',
+    'duckdb': 'standin.duckdb'
+}
+
+def create_standin_database(workdir, backend='sqlite'):
+    """Create a fresh embedded database in workdir and return its SQLAlchemy URL"""
+    path = os.path.abspath(os.path.join(workdir, STANDIN_FILES[backend]))
+    if os.path.exists(path):
+        os.remove(path)
+    
+    url = f"{backend}:///{path}"
+    engine_backend = backend_class(url)
+    engine = engine_backend.create_engine(url)
+    try:
+        engine_backend(engine).execute_schema()
+    finally:
+        engine.dispose()
+    
+    return url
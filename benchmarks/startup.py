@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Measure dashboard startup: module imports and the first render in a fresh process
+
+    python -m benchmarks.startup --rows 100000
+    python -m benchmarks.startup --backend duckdb --repeat 5
+
+Each repeat starts a new interpreter that renders src/dashboard.py with
+Streamlit's AppTest, then renders it for a second session in the same
+process. Imports are timed with -X importtime.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules only the loaders need; the dashboard should never import them
+ETL_MODULES = ['src.data_processor', 'src.manifest', 'openpyxl']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_seconds = time.perf_counter() - start
+app = AppTest.from_file('src/dashboard.py', default_timeout=300)
+start = time.perf_counter()
+app.run()
+first_render_seconds = time.perf_counter() - start
+second = AppTest.from_file('src/dashboard.py', default_timeout=300)
+start = time.perf_counter()
+second.run()
+second_session_seconds = time.perf_counter() - start
+import src.database
+print(json.dumps({
+    'streamlit_import_seconds': streamlit_seconds,
+    'first_render_seconds': first_render_seconds,
+    'second_session_seconds': second_session_seconds,
+    'engines': len(src.database._engines),
+    'etl_modules_loaded': [name for name in %r if name in sys.modules],
+    'exceptions': [str(e.value) for e in [*app.exception, *second.exception]]
+}))
+""" % (ETL_MODULES,)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time dashboard imports and first render in fresh processes")
+    parser.add_argument(
+        "--backend", choices=['sqlite', 'duckdb'], default='sqlite',
+        help="Embedded stand-in the dashboard reads (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=100000,
+        help="Synthetic vehicle_registrations rows (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3,
+        help="Fresh processes to start (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Write the timings to this JSON file"
+    )
+    return parser.parse_args(argv)
+
+def prepare_database(workdir, backend, rows, seed):
+    """Stand-in database with synthetic rows and a current snapshot, as after load_data.py"""
+    from src.config import Config
+    from src.database import DatabaseManager
+    from src.snapshot import SnapshotStore
+    from . import synthetic
+    from .standin import create_standin_database
+    
+    database_url = Config.DATABASE_URL = create_standin_database(workdir, backend)
+    snapshot_path = os.path.join(workdir, 'dashboard_snapshot.arrow')
+    
+    db_manager = DatabaseManager()
+    db_manager.insert_dataframe(synthetic.generate_registrations(rows, seed=seed), 'vehicle_registrations')
+    with db_manager.engine.begin() as conn:
+        db_manager.bump_data_version(conn)
+    SnapshotStore(snapshot_path).refresh(db_manager)
+    db_manager.engine.dispose()
+    return database_url, snapshot_path
+
+def app_import_seconds(importtime_output):
+    """Cumulative import time of the src modules the dashboard script imports directly"""
+    total = 0
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level entries are the script's own imports; nested ones are indented
+        if name.startswith(' src') and not name.startswith('  '):
+            total += int(cumulative)
+    return total / 1e6
+
+def run_probe(database_url, snapshot_path):
+    env = dict(os.environ, DATABASE_URL=database_url, SNAPSHOT_PATH=snapshot_path, PYTHONPATH=REPO_ROOT)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['app_import_seconds'] = app_import_seconds(completed.stderr)
+    return result
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    workdir = tempfile.mkdtemp(prefix='vehicle_dashboard_startup_')
+    try:
+        database_url, snapshot_path = prepare_database(workdir, args.backend, args.rows, args.seed)
+        runs = [run_probe(database_url, snapshot_path) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    timings = ['streamlit_import_seconds', 'app_import_seconds', 'first_render_seconds', 'second_session_seconds']
+    summary = {name: statistics.median(run[name] for run in runs) for name in timings}
+    for name in timings:
+        print(f"{name:<28} {summary[name]:>8.3f}s median")
+    print(f"{'engines':<28} {runs[-1]['engines']:>8}")
+    print(f"{'etl_modules_loaded':<28} {', '.join(runs[-1]['etl_modules_loaded']) or 'none':>8}")
+    
+    exceptions = [error for run in runs for error in run['exceptions']]
+    for error in exceptions:
+        print(f"Dashboard raised: {error}")
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'backend': args.backend, 'rows': args.rows, 'summary': summary, 'runs': runs}, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 1 if exceptions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Peak memory of reading a large query whole versus streaming it in chunks
+
+    python -m benchmarks.streaming --rows 2000000
+    python -m benchmarks.streaming --backend sqlite --chunk-size 20000
+
+Each mode runs in a fresh process that sums registrations per category over
+every row of vehicle_registrations, then reports its peak RSS above the
+RSS it had after connecting.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ['fetch_data', 'stream_data', 'stream_batches']
+
+QUERY = "SELECT * FROM vehicle_registrations"
+
+PROBE = """
+import json, resource, sys, time
+from src.database import DatabaseManager
+from src.utils.instrumentation import current_rss_bytes
+
+def peak_rss_bytes():
+    # ru_maxrss survives fork and exec, so it can report the parent's peak; VmHWM cannot
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        pass
+
+mode, query, chunk_size = sys.argv[1], sys.argv[2], int(sys.argv[3])
+db_manager = DatabaseManager()
+db_manager.fetch_data("SELECT 1 AS warm")
+reset_peak_rss()
+start_rss = current_rss_bytes()
+start = time.perf_counter()
+totals = {}
+rows = 0
+if mode == 'fetch_data':
+    frame = db_manager.fetch_data(query)
+    rows = len(frame)
+    totals = frame.groupby('vehicle_category')['registrations_count'].sum().to_dict()
+elif mode == 'stream_data':
+    for chunk in db_manager.stream_data(query, chunk_size=chunk_size):
+        rows += len(chunk)
+        for category, total in chunk.groupby('vehicle_category')['registrations_count'].sum().items():
+            totals[category] = totals.get(category, 0) + int(total)
+else:
+    for batch in db_manager.stream_batches(query, chunk_size=chunk_size):
+        rows += batch.num_rows
+        grouped = batch.to_pandas().groupby('vehicle_category')['registrations_count'].sum()
+        for category, total in grouped.items():
+            totals[category] = totals.get(category, 0) + int(total)
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'rows': rows,
+    'peak_rss_delta_bytes': peak_rss_bytes() - start_rss,
+    'totals': {category: int(total) for category, total in totals.items()}
+}))
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare peak memory of fetch_data and the streaming readers")
+    parser.add_argument(
+        "--backend", choices=['sqlite', 'duckdb', 'postgres'], default='duckdb',
+        help="sqlite and duckdb use an embedded stand-in; postgres uses DATABASE_URL/DB_* (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=2000000,
+        help="Synthetic vehicle_registrations rows (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=50000,
+        help="Rows per streamed chunk (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed for the synthetic data (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", default=None,
+        help="Write the measurements to this JSON file"
+    )
+    return parser.parse_args(argv)
+
+def prepare_database(workdir, backend, rows, seed):
+    """Database URL holding rows synthetic registrations"""
+    from src.config import Config
+    from src.database import DatabaseManager
+    from . import synthetic
+    from .standin import create_standin_database
+    
+    if backend != 'postgres':
+        Config.DATABASE_URL = create_standin_database(workdir, backend)
+    db_manager = DatabaseManager()
+    if backend == 'postgres':
+        if not db_manager.is_postgres:
+            raise SystemExit("--backend postgres needs a PostgreSQL DATABASE_URL")
+        db_manager.execute_schema()
+        with db_manager.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM vehicle_registrations")
+    
+    db_manager.insert_dataframe(synthetic.generate_registrations(rows, seed=seed), 'vehicle_registrations')
+    db_manager.engine.dispose()
+    return Config.get_database_url()
+
+def run_probe(database_url, mode, chunk_size):
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=REPO_ROOT)
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE, mode, QUERY, str(chunk_size)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    
+    workdir = tempfile.mkdtemp(prefix='vehicle_dashboard_streaming_')
+    try:
+        database_url = prepare_database(workdir, args.backend, args.rows, args.seed)
+        results = {mode: run_probe(database_url, mode, args.chunk_size) for mode in MODES}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    for mode, result in results.items():
+        print(
+            f"{mode:<16} {result['seconds']:>8.2f}s  {result['rows']:>12,} rows  "
+            f"peak +{result['peak_rss_delta_bytes'] / 1024 / 1024:>8.1f} MB"
+        )
+    
+    consistent = all(result['totals'] == results['fetch_data']['totals'] for result in results.values())
+    if not consistent:
+        print("Streamed totals differ from fetch_data")
+    
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'backend': args.backend, 'rows': args.rows, 'chunk_size': args.chunk_size, 'modes': results}, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if consistent else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
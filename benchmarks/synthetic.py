@@ -0,0 +1,117 @@
+"""
+Synthetic Vahan-style data at configurable scale
+"""
+import os
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from src.data_processor import DataProcessor, RECORD_COLUMNS
+from src.utils.frame_types import VEHICLE_CATEGORIES
+
+STATES = [
+    'ANDAMAN & NICOBAR', 'ANDHRA PRADESH', 'ARUNACHAL PRADESH', 'ASSAM', 'BIHAR',
+    'CHANDIGARH', 'CHHATTISGARH', 'DADRA & NAGAR HAVELI', 'DELHI', 'GOA',
+    'GUJARAT', 'HARYANA', 'HIMACHAL PRADESH', 'JAMMU & KASHMIR', 'JHARKHAND',
+    'KARNATAKA', 'KERALA', 'LADAKH', 'LAKSHADWEEP', 'MADHYA PRADESH',
+    'MAHARASHTRA', 'MANIPUR', 'MEGHALAYA', 'MIZORAM', 'NAGALAND',
+    'ODISHA', 'PUDUCHERRY', 'PUNJAB', 'RAJASTHAN', 'SIKKIM',
+    'TAMIL NADU', 'TELANGANA', 'TRIPURA', 'UTTAR PRADESH', 'UTTARAKHAND',
+    'WEST BENGAL'
+]
+
+DISTRICTS_PER_STATE = 20
+
+MAKERS = [
+    'Hero', 'Honda', 'Tvs', 'Bajaj', 'Royal Enfield', 'Suzuki', 'Yamaha', 'Ather',
+    'Ola Electric', 'Maruti', 'Hyundai', 'Tata', 'Mahindra', 'Kia', 'Toyota',
+    'Mg', 'Renault', 'Skoda', 'Volkswagen', 'Piaggio', 'Atul', 'Ashok Leyland',
+    'Eicher', 'Force', 'Yc Electric', 'Saera', 'Mahindra Electric', 'Kinetic'
+]
+
+MODELS_PER_MAKER = 50
+
+def vehicle_types():
+    """Realistic-cardinality vehicle type names (~1,400)"""
+    return [f"{maker} Model {i:02d}" for maker in MAKERS for i in range(1, MODELS_PER_MAKER + 1)]
+
+def _zipf_weights(count, exponent=1.1):
+    """Popularity skew so a few vehicle types dominate, like the real market"""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+def generate_registrations(rows, seed=0, start_year=2023, years=3):
+    """vehicle_registrations rows (RECORD_COLUMNS) with unique natural keys
+    
+    Dimension columns are categoricals so millions of rows stay cheap to build.
+    Keys are over-drawn and collisions dropped, so exactly rows come back unless
+    the key space is nearly exhausted.
+    """
+    rng = np.random.default_rng(seed)
+    draws = int(rows * 1.15) + 16
+    types = vehicle_types()
+    districts = [f"{state.title()} District {i:02d}" for state in STATES for i in range(1, DISTRICTS_PER_STATE + 1)]
+    
+    days = rng.integers(0, 365 * years, draws)
+    category_codes = rng.integers(0, len(VEHICLE_CATEGORIES), draws)
+    type_codes = rng.choice(len(types), draws, p=_zipf_weights(len(types)))
+    district_codes = rng.integers(0, len(districts), draws)
+    
+    # State and RTO follow from the district, so these codes identify the natural key
+    key = (days * len(VEHICLE_CATEGORIES) + category_codes) * len(types) + type_codes
+    key = key * len(districts) + district_codes
+    _, first = np.unique(key, return_index=True)
+    keep = np.sort(first)[:rows]
+    
+    days, category_codes, type_codes, district_codes = days[keep], category_codes[keep], type_codes[keep], district_codes[keep]
+    count = len(keep)
+    
+    return pd.DataFrame({
+        'registration_date': (np.datetime64(f"{start_year}-01-01") + days.astype('timedelta64[D]')).astype('datetime64[ns]'),
+        'vehicle_category': pd.Categorical.from_codes(category_codes, VEHICLE_CATEGORIES),
+        'manufacturer': pd.Categorical.from_codes(type_codes, types),
+        'state': pd.Categorical.from_codes(district_codes // DISTRICTS_PER_STATE, STATES),
+        'district': pd.Categorical.from_codes(district_codes, districts),
+        'rto_code': pd.Categorical.from_codes(district_codes, [f"RTO{i:04d}" for i in range(len(districts))]),
+        'registrations_count': rng.lognormal(4, 1.5, count).astype('int64') + 1
+    }, columns=RECORD_COLUMNS)
+
+def dashboard_frame(registrations):
+    """The dashboard's working-set shape for a registrations frame"""
+    return registrations.drop(columns='rto_code').rename(columns={'registrations_count': 'total_registrations'})
+
+def write_vahan_workbook(path, rows, seed=0):
+    """Write one sheet laid out like a Vahan export: header block, then S No, type, months, total"""
+    rng = np.random.default_rng(seed)
+    types = vehicle_types()
+    months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    
+    # The first row becomes the read_excel header; DATA_START_ROW more header rows follow
+    sheet.append(['Vehicle Class Wise Registration'] + [None] * (len(months) + 1))
+    for _ in range(DataProcessor.DATA_START_ROW - 1):
+        sheet.append([None] * (len(months) + 2))
+    sheet.append(['S No', 'Vehicle Class'] + months + ['TOTAL'])
+    
+    monthly = rng.integers(0, 5000, size=(rows, len(months)))
+    for i in range(rows):
+        # Unique names per sheet once the realistic set is exhausted
+        vehicle_type = types[i] if i < len(types) else f"{types[i % len(types)]} Variant {i // len(types)}"
+        counts = monthly[i].tolist()
+        sheet.append([i + 1, vehicle_type] + counts + [f"{sum(counts) + 1:,}"])
+    
+    workbook.save(path)
+
+def write_vahan_files(folder, total_rows, years=(2023, 2024, 2025), categories=('2W', '3W', '4W'), seed=0):
+    """Write YYYY_<cat>.xlsx files sharing total_rows between them; returns the paths"""
+    os.makedirs(folder, exist_ok=True)
+    file_count = len(years) * len(categories)
+    rows_per_file = max(1, total_rows // file_count)
+    
+    paths = []
+    for i, (year, category) in enumerate((year, category) for year in years for category in categories):
+        path = os.path.join(folder, f"{year}_{category}.xlsx")
+        write_vahan_workbook(path, rows_per_file, seed=seed + i)
+        paths.append(path)
+    return paths
@@ -3,8 +3,30 @@
 
 -- Connect to vehicle_dashboard database and run below:
 
+-- Upgrade a pre-partitioning table: set it aside (its copy happens below, once
+-- the partitions exist) and free the index and sequence names it holds
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_class
+        WHERE oid = to_regclass('vehicle_registrations') AND relkind = 'r'
+    ) THEN
+        DROP MATERIALIZED VIEW IF EXISTS mv_registrations_daily, mv_yearly_category,
+            mv_quarterly_category, mv_yearly_manufacturer;
+        ALTER TABLE vehicle_registrations ADD COLUMN IF NOT EXISTS source_file VARCHAR(255);
+        DROP INDEX IF EXISTS idx_vehicle_reg_date, idx_vehicle_category, idx_vehicle_manufacturer,
+            idx_vehicle_state, idx_vehicle_source_file, uq_vehicle_registrations_natural_key;
+        ALTER TABLE vehicle_registrations DROP CONSTRAINT IF EXISTS vehicle_registrations_pkey;
+        ALTER SEQUENCE IF EXISTS vehicle_registrations_id_seq RENAME TO vehicle_registrations_unpartitioned_id_seq;
+        ALTER TABLE vehicle_registrations RENAME TO vehicle_registrations_unpartitioned;
+    END IF;
+END $$;
+
+-- Range-partitioned by year of registration_date (PostgreSQL 13+). Year filters
+-- written as date ranges prune to the matching partitions, and dropping or
+-- reloading a year is a partition operation instead of a bulk DELETE.
 CREATE TABLE IF NOT EXISTS vehicle_registrations (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     registration_date DATE NOT NULL,
     vehicle_category VARCHAR(10) NOT NULL CHECK (vehicle_category IN ('2W', '3W', '4W')),
     manufacturer VARCHAR(100) NOT NULL,
@@ -12,15 +34,201 @@ CREATE TABLE IF NOT EXISTS vehicle_registrations (
     district VARCHAR(100),
     rto_code VARCHAR(20),
     registrations_count INTEGER NOT NULL DEFAULT 0,
+    source_file VARCHAR(255),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, registration_date)
+) PARTITION BY RANGE (registration_date);
+
+-- Catches rows for years without a partition yet
+CREATE TABLE IF NOT EXISTS vehicle_registrations_default
+    PARTITION OF vehicle_registrations DEFAULT;
+
+-- Create the partition for one calendar year if it is missing; the loader calls
+-- this for every year it is about to write. Rows already sitting in the default
+-- partition for that year are moved into the new partition. Concurrent loads of
+-- the same new year take turns on a per-year advisory lock, held until the
+-- caller's transaction ends, so only the first one creates the partition.
+-- Call it in a short transaction of its own that has not read vehicle_registrations:
+-- the DDL needs ACCESS EXCLUSIVE on the parent, and a caller already holding a
+-- lock on it would deadlock with another load waiting on the advisory lock.
+CREATE OR REPLACE FUNCTION ensure_registration_partition(partition_year INTEGER)
+RETURNS TEXT AS $$
+DECLARE
+    partition_name TEXT := format('vehicle_registrations_y%s', partition_year);
+    range_start DATE := make_date(partition_year, 1, 1);
+    range_end DATE := make_date(partition_year + 1, 1, 1);
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_registration_partition'), partition_year);
+    -- Created by a load that held the lock before us
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    
+    IF EXISTS (
+        SELECT 1 FROM vehicle_registrations_default
+        WHERE registration_date >= range_start AND registration_date < range_end
+    ) THEN
+        EXECUTE format('CREATE TABLE %I (LIKE vehicle_registrations INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM vehicle_registrations_default '
+            'WHERE registration_date >= $1 AND registration_date < $2 RETURNING *) '
+            'INSERT INTO %I SELECT * FROM moved', partition_name
+        ) USING range_start, range_end;
+        EXECUTE format(
+            'ALTER TABLE vehicle_registrations ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, range_start, range_end
+        );
+    ELSE
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF vehicle_registrations FOR VALUES FROM (%L) TO (%L)',
+            partition_name, range_start, range_end
+        );
+    END IF;
+    
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Copy a set-aside pre-partitioning table into its yearly partitions
+DO $$
+DECLARE
+    legacy_year INTEGER;
+BEGIN
+    IF to_regclass('vehicle_registrations_unpartitioned') IS NOT NULL THEN
+        FOR legacy_year IN
+            SELECT DISTINCT EXTRACT(YEAR FROM registration_date)::INTEGER FROM vehicle_registrations_unpartitioned
+        LOOP
+            PERFORM ensure_registration_partition(legacy_year);
+        END LOOP;
+        
+        -- Loads before the natural key existed appended every re-run, so collapse
+        -- duplicates into one row per key or the unique index below cannot be built
+        INSERT INTO vehicle_registrations (
+            id, registration_date, vehicle_category, manufacturer, state, district,
+            rto_code, registrations_count, source_file, created_at, updated_at
+        )
+        SELECT
+            MIN(id), registration_date, vehicle_category, manufacturer, state, district,
+            rto_code, SUM(registrations_count), MAX(source_file), MIN(created_at), MAX(updated_at)
+        FROM vehicle_registrations_unpartitioned
+        GROUP BY registration_date, vehicle_category, manufacturer, state, district, rto_code;
+        
+        PERFORM setval(
+            pg_get_serial_sequence('vehicle_registrations', 'id'),
+            COALESCE((SELECT MAX(id) FROM vehicle_registrations), 0) + 1,
+            false
+        );
+        DROP TABLE vehicle_registrations_unpartitioned;
+    END IF;
+END $$;
+
+-- Indexes are declared on the parent and created on every partition. They
+-- follow the statements actually run against the base table: the natural-key
+-- upsert, the per-file replace and the rollup refreshes. No reader filters the
+-- base table by category, manufacturer or state (the dashboard reads the
+-- rollups), so the old single-column indexes only slowed loads down.
+DROP INDEX IF EXISTS idx_vehicle_reg_date, idx_vehicle_category, idx_vehicle_manufacturer, idx_vehicle_state;
+
+-- Rows arrive roughly in date order within each yearly partition, so a BRIN
+-- index serves date-range predicates at a tiny fraction of a B-tree's size
+CREATE INDEX IF NOT EXISTS brin_vehicle_reg_date
+    ON vehicle_registrations USING brin (registration_date) WITH (pages_per_range = 32);
+
+-- Loads replace a file's earlier rows by source_file
+CREATE INDEX IF NOT EXISTS idx_vehicle_source_file ON vehicle_registrations(source_file);
+
+-- Natural key the loader upserts on, so re-loading a file never duplicates rows.
+-- It includes registration_date, as unique indexes on a partitioned table must.
+-- Its leading five columns are mv_registrations_daily's GROUP BY, and carrying
+-- registrations_count lets the refresh aggregate from an index-only scan in
+-- group order instead of sorting the heap.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_vehicle_registrations_natural_key_covering
+    ON vehicle_registrations(registration_date, vehicle_category, manufacturer, state, district, rto_code)
+    INCLUDE (registrations_count);
+DROP INDEX IF EXISTS uq_vehicle_registrations_natural_key;
+
+-- One row per loaded source file; unchanged files are skipped on the next run
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    file_name VARCHAR(255) PRIMARY KEY,
+    content_hash CHAR(64) NOT NULL,
+    file_size BIGINT NOT NULL,
+    file_mtime DOUBLE PRECISION NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Single-row counter bumped after every load is published; caches compare against it
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+-- Rollups the dashboard and growth queries read instead of the raw table.
+-- The loader refreshes them concurrently after each ingest, which needs a
+-- unique index on every view.
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_registrations_daily AS
+SELECT
+    registration_date,
+    vehicle_category,
+    manufacturer,
+    state,
+    district,
+    SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY registration_date, vehicle_category, manufacturer, state, district;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_registrations_daily
+    ON mv_registrations_daily(registration_date, vehicle_category, manufacturer, state, district);
+
+-- Dashboard filters: years arrive as registration_date ranges, served by the
+-- unique index above. Manufacturer selections are the selective part, so they
+-- lead a covering index that answers filtered reads with index-only scans.
+-- Category has three values and never narrows a read enough to use an index.
+DROP INDEX IF EXISTS idx_mv_daily_category, idx_mv_daily_manufacturer;
+CREATE INDEX IF NOT EXISTS idx_mv_daily_manufacturer_date
+    ON mv_registrations_daily(manufacturer, registration_date)
+    INCLUDE (vehicle_category, state, district, total_registrations);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_yearly_category AS
+SELECT
+    EXTRACT(YEAR FROM registration_date)::INTEGER AS year,
+    vehicle_category,
+    SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_yearly_category
+    ON mv_yearly_category(year, vehicle_category);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_quarterly_category AS
+SELECT
+    EXTRACT(YEAR FROM registration_date)::INTEGER AS year,
+    EXTRACT(QUARTER FROM registration_date)::INTEGER AS quarter,
+    vehicle_category,
+    SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2, 3;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_quarterly_category
+    ON mv_quarterly_category(year, quarter, vehicle_category);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_yearly_manufacturer AS
+SELECT
+    EXTRACT(YEAR FROM registration_date)::INTEGER AS year,
+    manufacturer,
+    SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2;
 
--- Create indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_vehicle_reg_date ON vehicle_registrations(registration_date);
-CREATE INDEX IF NOT EXISTS idx_vehicle_category ON vehicle_registrations(vehicle_category);
-CREATE INDEX IF NOT EXISTS idx_vehicle_manufacturer ON vehicle_registrations(manufacturer);
-CREATE INDEX IF NOT EXISTS idx_vehicle_state ON vehicle_registrations(state);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_yearly_manufacturer
+    ON mv_yearly_manufacturer(year, manufacturer);
 
 -- Create a function to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -32,6 +240,7 @@ END;
 $$ language 'plpgsql';
 
 -- Create trigger to automatically update updated_at
+DROP TRIGGER IF EXISTS update_vehicle_registrations_updated_at ON vehicle_registrations;
 CREATE TRIGGER update_vehicle_registrations_updated_at
     BEFORE UPDATE ON vehicle_registrations
     FOR EACH ROW
@@ -0,0 +1,69 @@
+-- DuckDB schema: embedded columnar storage for single-node analytics
+-- (DATABASE_URL=duckdb:///path/to/file.duckdb)
+--
+-- Mirrors database/schema.sql without partitions or materialized views.
+-- DuckDB scans and aggregates columns fast enough that plain views serve
+-- the rollups directly and never need a refresh. Safe to run repeatedly.
+
+CREATE SEQUENCE IF NOT EXISTS vehicle_registrations_id_seq;
+
+CREATE TABLE IF NOT EXISTS vehicle_registrations (
+    id BIGINT DEFAULT nextval('vehicle_registrations_id_seq'),
+    registration_date DATE NOT NULL,
+    vehicle_category VARCHAR NOT NULL CHECK (vehicle_category IN ('2W', '3W', '4W')),
+    manufacturer VARCHAR NOT NULL,
+    state VARCHAR,
+    district VARCHAR,
+    rto_code VARCHAR,
+    registrations_count INTEGER NOT NULL DEFAULT 0,
+    source_file VARCHAR,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Natural key the loader upserts on (ON CONFLICT needs a unique index)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_vehicle_registrations_natural_key
+    ON vehicle_registrations(registration_date, vehicle_category, manufacturer, state, district, rto_code);
+
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    file_name VARCHAR PRIMARY KEY,
+    content_hash VARCHAR NOT NULL,
+    file_size BIGINT NOT NULL,
+    file_mtime DOUBLE NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO data_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+-- Rollups as plain views
+CREATE VIEW IF NOT EXISTS mv_registrations_daily AS
+SELECT registration_date, vehicle_category, manufacturer, state, district,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY ALL;
+
+CREATE VIEW IF NOT EXISTS mv_yearly_category AS
+SELECT CAST(EXTRACT(YEAR FROM registration_date) AS INTEGER) AS year, vehicle_category,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY ALL;
+
+CREATE VIEW IF NOT EXISTS mv_quarterly_category AS
+SELECT CAST(EXTRACT(YEAR FROM registration_date) AS INTEGER) AS year,
+       CAST(EXTRACT(QUARTER FROM registration_date) AS INTEGER) AS quarter,
+       vehicle_category,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY ALL;
+
+CREATE VIEW IF NOT EXISTS mv_yearly_manufacturer AS
+SELECT CAST(EXTRACT(YEAR FROM registration_date) AS INTEGER) AS year, manufacturer,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY ALL;
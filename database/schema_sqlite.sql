@@ -0,0 +1,75 @@
+-- SQLite schema for offline use and tests (DATABASE_URL=sqlite:///path/to/file.db)
+--
+-- Mirrors database/schema.sql without the PostgreSQL-only parts: there are
+-- no partitions or materialized views, so plain views stand in for the
+-- rollups and are always current. Safe to run repeatedly.
+
+CREATE TABLE IF NOT EXISTS vehicle_registrations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    registration_date DATE NOT NULL,
+    vehicle_category VARCHAR(10) NOT NULL CHECK (vehicle_category IN ('2W', '3W', '4W')),
+    manufacturer VARCHAR(100) NOT NULL,
+    state VARCHAR(100),
+    district VARCHAR(100),
+    rto_code VARCHAR(20),
+    registrations_count INTEGER NOT NULL DEFAULT 0,
+    source_file VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Natural key the loader upserts on
+CREATE UNIQUE INDEX IF NOT EXISTS uq_vehicle_registrations_natural_key
+    ON vehicle_registrations(registration_date, vehicle_category, manufacturer, state, district, rto_code);
+CREATE INDEX IF NOT EXISTS idx_vehicle_source_file ON vehicle_registrations(source_file);
+
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    file_name VARCHAR(255) PRIMARY KEY,
+    content_hash CHAR(64) NOT NULL,
+    file_size BIGINT NOT NULL,
+    file_mtime DOUBLE PRECISION NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+
+-- Rollups as plain views
+CREATE VIEW IF NOT EXISTS mv_registrations_daily AS
+SELECT registration_date, vehicle_category, manufacturer, state, district,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2, 3, 4, 5;
+
+CREATE VIEW IF NOT EXISTS mv_yearly_category AS
+SELECT CAST(strftime('%Y', registration_date) AS INTEGER) AS year, vehicle_category,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2;
+
+CREATE VIEW IF NOT EXISTS mv_quarterly_category AS
+SELECT CAST(strftime('%Y', registration_date) AS INTEGER) AS year,
+       (CAST(strftime('%m', registration_date) AS INTEGER) + 2) / 3 AS quarter,
+       vehicle_category,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2, 3;
+
+CREATE VIEW IF NOT EXISTS mv_yearly_manufacturer AS
+SELECT CAST(strftime('%Y', registration_date) AS INTEGER) AS year, manufacturer,
+       SUM(registrations_count) AS total_registrations
+FROM vehicle_registrations
+GROUP BY 1, 2;
+
+CREATE TRIGGER IF NOT EXISTS update_vehicle_registrations_updated_at
+    AFTER UPDATE ON vehicle_registrations
+    FOR EACH ROW
+    WHEN NEW.updated_at = OLD.updated_at
+BEGIN
+    UPDATE vehicle_registrations SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+import signal
+from src.config import Config
+from src.ingest_service import IngestService
+from src.services import get_services
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Watch a folder and load new or changed Vahan Excel exports as they arrive")
+    parser.add_argument(
+        "--folder", default="data/raw",
+        help="Folder to watch for .xlsx files (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=Config.INGEST_DAEMON_WORKERS,
+        help="Files loaded at once (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=Config.INGEST_QUEUE_SIZE,
+        help="Settled files waiting to be loaded before the watcher pauses (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--poll-seconds", type=float, default=Config.INGEST_POLL_SECONDS,
+        help="How often to scan the folder (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--settle-seconds", type=float, default=Config.INGEST_SETTLE_SECONDS,
+        help="How long a file must stay unchanged before it is loaded (default: %(default)s)"
+    )
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    
+    services = get_services()
+    
+    # Setup database schema
+    try:
+        services.db_manager.execute_schema()
+        print("Database schema created successfully")
+    except Exception as e:
+        print(f"Schema creation error (might already exist): {e}")
+    
+    service = IngestService(
+        services, args.folder,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        poll_seconds=args.poll_seconds,
+        settle_seconds=args.settle_seconds
+    )
+    
+    # Finish the files being loaded, then exit
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: service.request_stop())
+    
+    service.run_forever()
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,57 @@
 #!/usr/bin/env python3
+import argparse
+import logging
 import os
 import sys
-from src.data_processor import DataProcessor
-from src.database import DatabaseManager
+from src.config import Config
+from src.services import get_services
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load Vahan Excel exports into the database")
+    parser.add_argument(
+        "--workers", type=int, default=Config.INGEST_WORKERS,
+        help="Number of processes used to parse Excel files (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Reload every file, ignoring the ingest manifest"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Stream very large sheets in fixed-size chunks instead of loading them whole"
+    )
+    parser.add_argument(
+        "--drop-year", type=int, action="append", default=[], metavar="YEAR",
+        help="Drop a year's partition before loading; its files still in the data folder load again (repeatable)"
+    )
+    return parser.parse_args()
 
 def main():
-    # Initialize components
-    data_processor = DataProcessor()
-    db_manager = DatabaseManager()
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    
+    # Initialize components around one shared engine
+    services = get_services()
+    db_manager = services.db_manager
+    data_processor = services.data_processor
     
     # Setup database schema
     try:
-        db_manager.execute_schema('database/schema.sql')
+        db_manager.execute_schema()
         print("Database schema created successfully")
     except Exception as e:
         print(f"Schema creation error (might already exist): {e}")
     
+    # Drop whole years before loading, so their files are picked up again below
+    dropped = []
+    for year in args.drop_year:
+        try:
+            db_manager.drop_year(year)
+            dropped.append(year)
+            print(f"Dropped registrations for {year}")
+        except Exception as e:
+            print(f"Error dropping {year}: {e}")
+    
     # Process Excel files
     data_folder = "data/raw"
     
@@ -24,12 +60,37 @@ def main():
         return
     
     print("Starting data processing...")
-    result = data_processor.process_excel_files(data_folder)
-    
-    if result is not None:
-        print(f"Successfully processed and loaded {len(result)} records")
+    if args.stream:
+        loaded = data_processor.stream_excel_files(data_folder, force=args.force)
+        if loaded is not None:
+            print(f"Successfully streamed and loaded {loaded} records")
+        else:
+            print("Data processing failed")
     else:
-        print("Data processing failed")
+        result = data_processor.process_excel_files(data_folder, workers=args.workers, force=args.force)
+        loaded = len(result) if result is not None else None
+        
+        if result is not None and result.empty:
+            print("No new or changed files to load")
+        elif result is not None:
+            print(f"Successfully processed and loaded {len(result)} records")
+        else:
+            print("Data processing failed")
+    
+    # Refresh rollups and publish a new data version once rows have changed
+    if loaded or dropped:
+        try:
+            data_processor.publish_changes(years=dropped)
+            print("Rollup views refreshed")
+        except Exception as e:
+            print(f"Rollup refresh error: {e}")
+    
+    # Refresh the dashboard snapshot if the data version moved
+    try:
+        if services.snapshot_store.refresh(db_manager):
+            print("Dashboard snapshot refreshed")
+    except Exception as e:
+        print(f"Snapshot refresh error (dashboard will query the database): {e}")
 
 if __name__ == "__main__":
     main()
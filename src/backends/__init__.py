@@ -0,0 +1,32 @@
+"""
+SQL engines DatabaseManager can run on, chosen by the database URL scheme
+"""
+from .base import Backend
+from .postgres import PostgresBackend, MonitoredQueuePool
+from .sqlite import SQLiteBackend
+from .duckdb import DuckDBBackend
+
+BACKENDS = {
+    'postgresql': PostgresBackend,
+    'sqlite': SQLiteBackend,
+    'duckdb': DuckDBBackend
+}
+
+def backend_class(database_url):
+    """Backend class for a SQLAlchemy URL such as postgresql+psycopg2://, sqlite:/// or duckdb:///"""
+    scheme = database_url.split(':', 1)[0].split('+', 1)[0]
+    if scheme == 'postgres':
+        scheme = 'postgresql'
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unsupported database backend: {scheme}")
+    return BACKENDS[scheme]
+
+__all__ = [
+    'Backend',
+    'PostgresBackend',
+    'SQLiteBackend',
+    'DuckDBBackend',
+    'MonitoredQueuePool',
+    'BACKENDS',
+    'backend_class'
+]
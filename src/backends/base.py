@@ -0,0 +1,92 @@
+"""
+Common behaviour of the SQL engines behind DatabaseManager
+"""
+import os
+import logging
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import create_engine, text
+from src.queries import standard_date_part
+from src.utils.frame_types import typed_frame
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'database')
+
+class Backend:
+    """How one engine connects, loads dataframes and spells dialect-specific SQL
+    
+    Subclasses override only what differs; everything here is plain
+    SQLAlchemy and pandas, which every supported engine understands.
+    """
+    
+    name = None
+    schema_file = None
+    # Whether queries cross the network, so shipping raw rows to Python costs more than aggregating in SQL
+    remote = False
+    
+    def __init__(self, engine):
+        self.engine = engine
+    
+    @classmethod
+    def create_engine(cls, database_url):
+        """Engine for a URL; called once per URL by database.get_engine"""
+        return create_engine(database_url)
+    
+    @property
+    def schema_path(self):
+        return os.path.join(SCHEMA_DIR, self.schema_file)
+    
+    def execute_schema(self, schema_file_path=None):
+        """Run a schema script (this backend's own by default) in one go"""
+        with open(schema_file_path or self.schema_path, 'r') as file:
+            schema_sql = file.read()
+        
+        conn = self.engine.raw_connection()
+        try:
+            self._execute_script(conn, schema_sql)
+            conn.commit()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _execute_script(conn, script):
+        cursor = conn.cursor()
+        cursor.execute(script)
+        cursor.close()
+    
+    def fetch_data(self, query, params=None):
+        return pd.read_sql_query(query, self.engine, params=params)
+    
+    def stream_frames(self, query, params, chunk_size):
+        """Yield the result of query as dataframes of at most chunk_size rows
+        
+        yield_per turns on stream_results, which psycopg2 serves from a named
+        server-side cursor, so only one chunk of rows is held at a time.
+        """
+        statement = text(query) if isinstance(query, str) else query
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(statement, params or {})
+            columns = list(result.keys())
+            for rows in result.partitions(chunk_size):
+                yield pd.DataFrame.from_records(rows, columns=columns)
+    
+    def stream_batches(self, query, params, chunk_size):
+        """Yield the result of query as Arrow record batches of at most chunk_size rows"""
+        for frame in self.stream_frames(query, params, chunk_size):
+            yield pa.RecordBatch.from_pandas(typed_frame(frame), preserve_index=False)
+    
+    def insert_dataframe(self, df, table_name, if_exists='append', batch_size=None):
+        df.to_sql(table_name, self.engine, if_exists=if_exists, index=False)
+    
+    def stage_frame(self, conn, frame, table_name):
+        """Append frame to an existing table inside the caller's transaction"""
+        frame.to_sql(table_name, conn, if_exists='append', index=False)
+    
+    def date_part(self, part, column):
+        """Integer SQL expression for a YEAR, QUARTER or MONTH of a date column"""
+        return standard_date_part(part, column)
+    
+    def refresh_rollups(self):
+        """Bring the rollup relations up to date; plain views need nothing"""
+        logger.info(f"Skipping rollup refresh: {self.name} reads the rollups through plain views")
@@ -0,0 +1,59 @@
+"""
+DuckDB: an embedded columnar engine for fast single-node analytical scans
+"""
+import logging
+from sqlalchemy import text
+from .base import Backend
+
+logger = logging.getLogger(__name__)
+
+class DuckDBBackend(Backend):
+    """Columnar storage in one local file, read through plain rollup views
+    
+    Dataframes move in and out through DuckDB's native pandas integration
+    instead of row-by-row DBAPI inserts and fetches. The database file
+    allows one writing process at a time, so run load_data.py while no
+    dashboard holds it open.
+    """
+    
+    name = 'duckdb'
+    schema_file = 'schema_duckdb.sql'
+    
+    # Name a dataframe is registered under while it is copied into a table
+    INCOMING_FRAME = 'incoming_frame'
+    
+    def fetch_data(self, query, params=None):
+        statement = text(query) if isinstance(query, str) else query
+        with self.engine.connect() as conn:
+            result = conn.execute(statement, params or {})
+            return result.cursor.fetchdf()
+    
+    def stream_batches(self, query, params, chunk_size):
+        """Arrow batches straight from DuckDB's result, without a pandas round trip"""
+        statement = text(query) if isinstance(query, str) else query
+        with self.engine.connect() as conn:
+            result = conn.execute(statement, params or {})
+            yield from result.cursor.to_arrow_reader(chunk_size)
+    
+    def stream_frames(self, query, params, chunk_size):
+        for batch in self.stream_batches(query, params, chunk_size):
+            yield batch.to_pandas()
+    
+    def insert_dataframe(self, df, table_name, if_exists='append', batch_size=None):
+        if if_exists != 'append':
+            super().insert_dataframe(df, table_name, if_exists=if_exists)
+            return
+        
+        with self.engine.begin() as conn:
+            self.stage_frame(conn, df, table_name)
+        logger.info(f"Inserted {len(df)} rows into {table_name}")
+    
+    def stage_frame(self, conn, frame, table_name):
+        """Copy a registered dataframe into table_name in one columnar INSERT"""
+        columns = ', '.join(frame.columns)
+        duckdb_conn = conn.connection.driver_connection
+        duckdb_conn.register(self.INCOMING_FRAME, frame)
+        try:
+            conn.exec_driver_sql(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {self.INCOMING_FRAME}")
+        finally:
+            duckdb_conn.unregister(self.INCOMING_FRAME)
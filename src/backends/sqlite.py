@@ -0,0 +1,24 @@
+"""
+SQLite: a file-backed stand-in for offline use and tests
+"""
+from .base import Backend
+
+class SQLiteBackend(Backend):
+    """Plain views replace the materialized rollups; dates are ISO text"""
+    
+    name = 'sqlite'
+    schema_file = 'schema_sqlite.sql'
+    
+    # Integer expressions over ISO-8601 date text
+    DATE_PARTS = {
+        'year': "CAST(strftime('%Y', {column}) AS INTEGER)",
+        'quarter': "(CAST(strftime('%m', {column}) AS INTEGER) + 2) / 3",
+        'month': "CAST(strftime('%m', {column}) AS INTEGER)"
+    }
+    
+    @staticmethod
+    def _execute_script(conn, script):
+        conn.driver_connection.executescript(script)
+    
+    def date_part(self, part, column):
+        return self.DATE_PARTS[part.lower()].format(column=column)
@@ -0,0 +1,172 @@
+"""
+Process-wide query result caching keyed on the data version
+"""
+import json
+import sys
+import threading
+import time
+import logging
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+class QueryCache:
+    """Thread-safe LRU cache bounded by entry count, total bytes and entry age"""
+    
+    def __init__(self, max_bytes=None, max_entries=None, ttl_seconds=None):
+        self.max_bytes = max_bytes or Config.QUERY_CACHE_MAX_BYTES
+        self.max_entries = max_entries or Config.QUERY_CACHE_MAX_ENTRIES
+        self.ttl_seconds = Config.QUERY_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def estimate_bytes(value):
+        """Approximate in-memory size of a cached value"""
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            # nbytes only counts the pointers to the objects
+            return int(value.nbytes) + sum(sys.getsizeof(item) for item in value.ravel())
+        if hasattr(value, 'nbytes'):
+            return int(value.nbytes)
+        if hasattr(value, 'to_plotly_json'):
+            # A plotly figure is a small wrapper around its trace arrays and layout
+            return QueryCache.estimate_bytes(value.to_plotly_json())
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(
+                QueryCache.estimate_bytes(key) + QueryCache.estimate_bytes(item) for key, item in value.items()
+            )
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(QueryCache.estimate_bytes(item) for item in value)
+        return sys.getsizeof(value)
+    
+    def get(self, key):
+        """Return (hit, value) and mark the entry as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            
+            value, size, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.misses += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+    
+    def put(self, key, value):
+        """Store a value, evicting least recently used entries to stay in bounds"""
+        size = self.estimate_bytes(value)
+        if size > self.max_bytes:
+            logger.info(f"Not caching {size:,} byte result larger than the {self.max_bytes:,} byte budget")
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self.total_bytes += size
+            
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+    
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        hit, value = self.get(key)
+        if not hit:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+    
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+
+class CachedQueryRunner:
+    """Memoizes query results per data version, so reruns skip the database until new data lands"""
+    
+    def __init__(self, db_manager, cache=None, version_poll_seconds=None):
+        self.db_manager = db_manager
+        self.cache = cache or QueryCache()
+        self.version_poll_seconds = version_poll_seconds if version_poll_seconds is not None else Config.DATA_VERSION_POLL_SECONDS
+        self._version = None
+        self._version_checked_at = None
+        self._version_lock = threading.Lock()
+    
+    def data_version(self):
+        """Current data version, re-read from the database at most once per poll interval"""
+        with self._version_lock:
+            now = time.monotonic()
+            if self._version_checked_at is None or now - self._version_checked_at >= self.version_poll_seconds:
+                version = self.db_manager.get_data_version()
+                if version != self._version and self._version_checked_at is not None:
+                    # Results for older versions can never be hit again
+                    logger.info(f"Data version changed from {self._version} to {version}, clearing query cache")
+                    self.cache.clear()
+                self._version = version
+                self._version_checked_at = now
+            return self._version
+    
+    def invalidate(self):
+        """Forget the known data version and every cached result"""
+        with self._version_lock:
+            self._version_checked_at = None
+        self.cache.clear()
+    
+    @staticmethod
+    def make_key(name, params, data_version):
+        """Cache key from a query (or computation name), its parameters and the data version
+        
+        SQLAlchemy statements hash by identity and query builders return a new
+        one per call, so they are keyed on their SQL text instead.
+        """
+        if not isinstance(name, str):
+            name = str(name)
+        return (name, json.dumps(params, sort_keys=True, default=str), data_version)
+    
+    def memoize(self, name, compute, params=None):
+        """Cache compute(data_version) under name/params for the current data version
+        
+        Dataframes are handed out as copies so callers can modify them freely.
+        """
+        data_version = self.data_version()
+        key = self.make_key(name, params, data_version)
+        value = self.cache.get_or_compute(key, lambda: compute(data_version))
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+    
+    def fetch_data(self, query, params=None):
+        """Cached equivalent of DatabaseManager.fetch_data"""
+        return self.memoize(query, lambda _: self.db_manager.fetch_data(query, params=params), params)
@@ -6,11 +6,13 @@ from .metrics import MetricsComponent
 from .filters import FilterComponent
 from .charts import ChartComponent
 from .insights import InsightsComponent
+from .performance import PerformanceComponent
 
 __all__ = [
     'get_dashboard_styles',
     'MetricsComponent', 
     'FilterComponent',
     'ChartComponent',
-    'InsightsComponent'
+    'InsightsComponent',
+    'PerformanceComponent'
 ]
@@ -1,21 +1,86 @@
 """
 Chart components for the dashboard
 """
+import hashlib
+import json
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import logging
+from src.cache import QueryCache
+from src.config import Config
+from src.utils.aggregations import AggregationCube
+from src.utils.downsampling import downsample_frame
 
 logger = logging.getLogger(__name__)
 
+# Built figures keyed by a hash of their data and parameters, shared by every session
+_figure_cache = QueryCache(max_entries=Config.FIGURE_CACHE_MAX_ENTRIES)
+
 class ChartComponent:
     
+    MIN_POINTS_PER_SERIES = 100
+    
     @staticmethod
     def create_enhanced_chart(data, chart_type, **kwargs):
-        """Create enhanced charts with updated color scheme"""
+        """Create enhanced charts with updated color scheme
+        
+        Identical charts are served from a figure cache; callers get their own
+        copy, so they can add lines or change the layout freely.
+        """
         if data.empty:
             return None
-            
+        
+        key = ChartComponent.figure_key(data, chart_type, kwargs)
+        fig = _figure_cache.get_or_compute(key, lambda: ChartComponent._build_chart(data, chart_type, **kwargs))
+        return go.Figure(fig)
+    
+    @staticmethod
+    def figure_key(data, chart_type, kwargs):
+        """Hash of the chart's input rows, columns and parameters"""
+        digest = hashlib.sha1()
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        digest.update(json.dumps(list(map(str, data.columns))).encode())
+        digest.update(chart_type.encode())
+        
+        for name in sorted(kwargs):
+            value = kwargs[name]
+            digest.update(name.encode())
+            if isinstance(value, (pd.Series, pd.Index, np.ndarray)):
+                # Array arguments are hashed by content, not by their truncated repr
+                digest.update(pd.util.hash_array(np.asarray(value, dtype=object)).tobytes())
+            else:
+                digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+        
+        return ('figure', digest.hexdigest())
+    
+    @staticmethod
+    def _large_data_options(data, chart_type, kwargs):
+        """Switch big line/scatter charts to WebGL and downsample line series with LTTB"""
+        if chart_type not in ('line', 'scatter') or len(data) <= Config.CHART_WEBGL_THRESHOLD:
+            return data, kwargs
+        
+        kwargs = dict(kwargs, render_mode='webgl')
+        x, y, color = kwargs.get('x'), kwargs.get('y'), kwargs.get('color')
+        
+        if chart_type == 'line' and isinstance(x, str) and isinstance(y, str):
+            group = color if isinstance(color, str) else None
+            series_count = data[group].nunique() if group else 1
+            # Share the point budget between series, keeping enough points for each one's shape
+            per_series = max(Config.CHART_MAX_POINTS // max(series_count, 1), ChartComponent.MIN_POINTS_PER_SERIES)
+            points = len(data)
+            data = downsample_frame(data, x, y, per_series, group=group)
+            logger.info(f"Large-data chart mode: {points:,} points downsampled to {len(data):,}, WebGL traces")
+        
+        return data, kwargs
+    
+    @staticmethod
+    def _build_chart(data, chart_type, **kwargs):
+        """Build and style a Plotly Express figure"""
+        data, kwargs = ChartComponent._large_data_options(data, chart_type, kwargs)
+        
         if chart_type == 'line':
             fig = px.line(data, **kwargs)
             fig.update_traces(line=dict(width=4))
@@ -64,63 +129,85 @@ class ChartComponent:
         return fig
     
     @staticmethod
-    def display_market_trends_section(df_filtered):
+    def market_trends_payload(df_filtered, cube=None):
+        """Trend and share figures, None where there is nothing to plot; safe off the main thread"""
+        cube = cube or AggregationCube(df_filtered)
+        
+        yearly_data = cube.by_year_category()
+        yearly_data.columns = ['Year', 'Category', 'Registrations']
+        fig_trend = ChartComponent.create_enhanced_chart(
+            yearly_data, 'line',
+            x='Year', y='Registrations', color='Category',
+            title="📈 Registration Volume Trends by Category",
+            color_discrete_sequence=['#0f766e', '#155e75', '#0891b2', '#0369a1', '#1e40af']
+        )
+        
+        category_share = cube.by_category()
+        fig_pie = None
+        if not category_share.empty:
+            fig_pie = ChartComponent.create_enhanced_chart(
+                pd.DataFrame({'Category': category_share.index, 'Share': category_share.values}),
+                'pie',
+                values='Share', names='Category',
+                title="🥧 Market Share Distribution",
+                color_discrete_sequence=['#0f766e', '#155e75', '#0891b2', '#0369a1', '#1e40af']
+            )
+        
+        return {'trend': fig_trend, 'share': fig_pie}
+    
+    @staticmethod
+    def display_market_trends_section(df_filtered, cube=None, payload=None):
         """Display market trends analysis section"""
+        payload = payload or ChartComponent.market_trends_payload(df_filtered, cube)
+        
         st.markdown('<h2 class="section-header">📈 Market Trends Analysis</h2>', unsafe_allow_html=True)
         
         # Two column layout
         chart_col1, chart_col2 = st.columns(2)
         
         with chart_col1:
-            yearly_data = df_filtered.groupby([df_filtered['registration_date'].dt.year, 'vehicle_category'])['total_registrations'].sum().reset_index()
-            yearly_data.columns = ['Year', 'Category', 'Registrations']
-            
-            if not yearly_data.empty:
-                fig_trend = ChartComponent.create_enhanced_chart(
-                    yearly_data, 'line',
-                    x='Year', y='Registrations', color='Category',
-                    title="📈 Registration Volume Trends by Category",
-                    color_discrete_sequence=['#0f766e', '#155e75', '#0891b2', '#0369a1', '#1e40af']
-                )
-                if fig_trend:
-                    st.plotly_chart(fig_trend, use_container_width=True)
+            if payload['trend'] is not None:
+                st.plotly_chart(payload['trend'], use_container_width=True)
             else:
                 st.info("📊 No trend data available for selected filters")
         
         with chart_col2:
-            category_share = df_filtered.groupby('vehicle_category')['total_registrations'].sum()
-            
-            if not category_share.empty:
-                fig_pie = ChartComponent.create_enhanced_chart(
-                    pd.DataFrame({'Category': category_share.index, 'Share': category_share.values}),
-                    'pie',
-                    values='Share', names='Category',
-                    title="🥧 Market Share Distribution",
-                    color_discrete_sequence=['#0f766e', '#155e75', '#0891b2', '#0369a1', '#1e40af']
-                )
-                if fig_pie:
-                    st.plotly_chart(fig_pie, use_container_width=True)
+            if payload['share'] is not None:
+                st.plotly_chart(payload['share'], use_container_width=True)
             else:
                 st.info("📊 No market share data available")
     
     @staticmethod
-    def display_vehicle_performance_section(df_filtered):
-        """Display vehicle type performance section"""
-        st.markdown('<h2 class="section-header">🏭 Vehicle Type Performance</h2>', unsafe_allow_html=True)
+    def vehicle_performance_payload(df_filtered, cube=None):
+        """Top vehicle types figure, or None; safe off the main thread"""
+        cube = cube or AggregationCube(df_filtered)
         
-        top_15_types = df_filtered.groupby('manufacturer')['total_registrations'].sum().sort_values(ascending=False).head(15)
+        top_15_types = cube.top_manufacturers(15)
+        if top_15_types.empty:
+            return None
         
-        if not top_15_types.empty:
-            fig_top_types = ChartComponent.create_enhanced_chart(
-                pd.DataFrame({'Vehicle Type': top_15_types.index, 'Registrations': top_15_types.values}),
-                'horizontal_bar',
-                x='Registrations', y='Vehicle Type',
-                title="🚀 Top 15 Vehicle Types by Registration Volume",
-                color='Registrations',
-                color_continuous_scale=['#a7f3d0', '#67e8f9', '#0891b2', '#155e75', '#0f766e']
-            )
-            if fig_top_types:
-                fig_top_types.update_layout(height=520)
-                st.plotly_chart(fig_top_types, use_container_width=True)
+        fig_top_types = ChartComponent.create_enhanced_chart(
+            pd.DataFrame({'Vehicle Type': top_15_types.index, 'Registrations': top_15_types.values}),
+            'horizontal_bar',
+            x='Registrations', y='Vehicle Type',
+            title="🚀 Top 15 Vehicle Types by Registration Volume",
+            color='Registrations',
+            color_continuous_scale=['#a7f3d0', '#67e8f9', '#0891b2', '#155e75', '#0f766e']
+        )
+        fig_top_types.update_layout(height=520)
+        return fig_top_types
+    
+    @staticmethod
+    def display_vehicle_performance_section(df_filtered, cube=None, payload=None):
+        """Display vehicle type performance section
+        
+        payload is the figure from vehicle_performance_payload when already built.
+        """
+        fig_top_types = payload if payload is not None else ChartComponent.vehicle_performance_payload(df_filtered, cube)
+        
+        st.markdown('<h2 class="section-header">🏭 Vehicle Type Performance</h2>', unsafe_allow_html=True)
+        
+        if fig_top_types is not None:
+            st.plotly_chart(fig_top_types, use_container_width=True)
         else:
             st.info("📊 No vehicle type data available for selected filters")
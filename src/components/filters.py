@@ -2,12 +2,26 @@
 Filter components for the dashboard
 """
 import streamlit as st
+from src.utils.aggregations import AggregationCube
 
 class FilterComponent:
     
     @staticmethod
-    def create_custom_filter_section(df):
-        """Create enhanced filter section with card-based design"""
+    def create_custom_filter_section(df, cube=None):
+        """Create enhanced filter section with card-based design from an in-memory dataframe"""
+        cube = cube or AggregationCube(df)
+        available_years = sorted(cube.by_year().index)
+        category_options = df['vehicle_category'].unique().tolist()
+        manufacturer_options = sorted(cube.by_manufacturer().index)
+        top_manufacturers = cube.top_manufacturers(15).index.tolist()
+        
+        return FilterComponent.create_filter_section(
+            available_years, category_options, manufacturer_options, top_manufacturers
+        )
+    
+    @staticmethod
+    def create_filter_section(available_years, category_options, manufacturer_options, default_manufacturers):
+        """Create enhanced filter section with card-based design from precomputed options"""
         st.markdown("""
         <div class="filter-section">
             <h3 class="filter-title">🎛️ Advanced Analytics Filters</h3>
@@ -24,7 +38,6 @@ class FilterComponent:
             </div>
             """, unsafe_allow_html=True)
             
-            available_years = sorted(df['registration_date'].dt.year.unique())
             selected_years = st.multiselect(
                 "Select Years",
                 options=available_years,
@@ -43,8 +56,8 @@ class FilterComponent:
             
             categories = st.multiselect(
                 "Select Vehicle Categories",
-                options=df['vehicle_category'].unique(),
-                default=df['vehicle_category'].unique(),
+                options=category_options,
+                default=category_options,
                 help="Choose vehicle category segments",
                 key="category_filter",
                 label_visibility="collapsed"
@@ -57,11 +70,10 @@ class FilterComponent:
             </div>
             """, unsafe_allow_html=True)
             
-            top_manufacturers = df.groupby('manufacturer')['total_registrations'].sum().sort_values(ascending=False).head(15).index.tolist()
             manufacturers = st.multiselect(
                 "Select Vehicle Types",
-                options=sorted(df['manufacturer'].unique()),
-                default=top_manufacturers,
+                options=manufacturer_options,
+                default=default_manufacturers,
                 help="Select specific vehicle classifications",
                 key="manufacturer_filter",
                 label_visibility="collapsed"
@@ -3,6 +3,7 @@ Insights components for the dashboard
 """
 import streamlit as st
 import pandas as pd
+from src.utils.aggregations import AggregationCube
 
 class InsightsComponent:
     
@@ -17,44 +18,47 @@ class InsightsComponent:
         """, unsafe_allow_html=True)
     
     @staticmethod
-    def generate_enhanced_insights(df, selected_years):
+    def generate_enhanced_insights(df, selected_years, cube=None):
         """Generate enhanced investment insights"""
         insights = []
         
         try:
             if df.empty:
                 return ["📊 **No insights available** - Please adjust your filters"]
+            
+            cube = cube or AggregationCube(df)
+            total_registrations = cube.total
                 
             # Market dominance analysis
-            manufacturer_totals = df.groupby('manufacturer')['total_registrations'].sum()
+            manufacturer_totals = cube.by_manufacturer()
             if not manufacturer_totals.empty:
                 top_type = manufacturer_totals.idxmax()
                 top_registrations = manufacturer_totals.max()
-                market_share = (top_registrations / df['total_registrations'].sum()) * 100
+                market_share = (top_registrations / total_registrations) * 100
                 insights.append(f"🏆 **Market Leader**: {top_type} commands {market_share:.1f}% market share with {top_registrations:,.0f} registrations")
             
             # Category performance
-            category_totals = df.groupby('vehicle_category')['total_registrations'].sum()
+            category_totals = cube.by_category()
             if not category_totals.empty:
                 category_leader = category_totals.idxmax()
-                category_dominance = (category_totals.max() / df['total_registrations'].sum()) * 100
+                category_dominance = (category_totals.max() / total_registrations) * 100
                 insights.append(f"🎯 **Segment Dominance**: {category_leader} vehicles control {category_dominance:.1f}% of the total market")
             
             # Electric mobility trend
             ev_keywords = ['E-RICKSHAW', 'ELECTRIC', 'EV']
-            ev_data = df[df['manufacturer'].str.contains('|'.join(ev_keywords), case=False, na=False)]
-            if not ev_data.empty:
-                ev_share = (ev_data['total_registrations'].sum() / df['total_registrations'].sum()) * 100
+            ev_totals = manufacturer_totals[manufacturer_totals.index.str.contains('|'.join(ev_keywords), case=False, na=False)]
+            if not ev_totals.empty:
+                ev_share = (ev_totals.sum() / total_registrations) * 100
                 insights.append(f"⚡ **EV Revolution**: Electric vehicles represent {ev_share:.1f}% of registrations, indicating strong sustainability adoption")
             
             # Market concentration
             if len(manufacturer_totals) >= 3:
-                top_3_share = (manufacturer_totals.sort_values(ascending=False).head(3).sum() / df['total_registrations'].sum()) * 100
+                top_3_share = (manufacturer_totals.sort_values(ascending=False).head(3).sum() / total_registrations) * 100
                 insights.append(f"🎪 **Market Concentration**: Top 3 vehicle types account for {top_3_share:.1f}% of total registrations")
             
             # Investment recommendation
             if len(selected_years) > 1:
-                yearly_totals = df.groupby(df['registration_date'].dt.year)['total_registrations'].sum()
+                yearly_totals = cube.by_year()
                 if len(yearly_totals) > 1:
                     latest_growth = ((yearly_totals.iloc[-1] - yearly_totals.iloc[-2]) / yearly_totals.iloc[-2]) * 100
                     trend_emoji = "📈" if latest_growth > 0 else "📉"
@@ -66,10 +70,13 @@ class InsightsComponent:
         return insights if insights else ["📊 **Processing**: Advanced insights will be available with expanded data"]
     
     @staticmethod
-    def display_insights_section(df_filtered, selected_years):
-        """Display the investment insights section"""
+    def display_insights_section(df_filtered, selected_years, cube=None, payload=None):
+        """Display the investment insights section
+        
+        payload is the list from generate_enhanced_insights when already computed.
+        """
         st.markdown('<h2 class="section-header">💡 Investment Intelligence</h2>', unsafe_allow_html=True)
         
-        insights = InsightsComponent.generate_enhanced_insights(df_filtered, selected_years)
+        insights = payload if payload is not None else InsightsComponent.generate_enhanced_insights(df_filtered, selected_years, cube)
         for insight in insights:
             st.markdown(f'<div class="insight-card">{insight}</div>', unsafe_allow_html=True)
@@ -2,6 +2,7 @@
 Metric card components for the dashboard
 """
 import streamlit as st
+from src.utils.aggregations import AggregationCube
 
 class MetricsComponent:
     
@@ -17,18 +18,23 @@ class MetricsComponent:
             """, unsafe_allow_html=True)
     
     @staticmethod
-    def display_kpi_section(df_filtered):
-        """Display the KPI metrics section"""
-        st.markdown('<h2 class="section-header">📊 Key Performance Indicators</h2>', unsafe_allow_html=True)
+    def kpi_payload(df_filtered, cube=None):
+        """(value, label) pairs for the KPI cards; safe to compute off the main thread"""
+        cube = cube or AggregationCube(df_filtered)
         
-        col1, col2, col3, col4 = st.columns(4)
+        return [
+            (f"{cube.total:,.0f}", "Total Registrations"),
+            (f"{cube.manufacturer_count}", "Vehicle Types"),
+            (f"{cube.category_count}", "Categories"),
+            (f"{cube.mean:,.0f}", "Avg per Type")
+        ]
+    
+    @staticmethod
+    def display_kpi_section(df_filtered, cube=None, payload=None):
+        """Display the KPI metrics section"""
+        payload = payload or MetricsComponent.kpi_payload(df_filtered, cube)
         
-        total_registrations = df_filtered['total_registrations'].sum()
-        total_vehicle_types = df_filtered['manufacturer'].nunique()
-        total_categories = df_filtered['vehicle_category'].nunique()
-        avg_registrations = df_filtered['total_registrations'].mean()
+        st.markdown('<h2 class="section-header">📊 Key Performance Indicators</h2>', unsafe_allow_html=True)
         
-        MetricsComponent.create_metric_card(f"{total_registrations:,.0f}", "Total Registrations", col1)
-        MetricsComponent.create_metric_card(f"{total_vehicle_types}", "Vehicle Types", col2)
-        MetricsComponent.create_metric_card(f"{total_categories}", "Categories", col3)
-        MetricsComponent.create_metric_card(f"{avg_registrations:,.0f}", "Avg per Type", col4)
+        for (value, label), col in zip(payload, st.columns(4)):
+            MetricsComponent.create_metric_card(value, label, col)
@@ -0,0 +1,32 @@
+"""
+Hidden performance panel for the dashboard
+"""
+import streamlit as st
+from src.config import Config
+
+class PerformanceComponent:
+    
+    @staticmethod
+    def is_enabled():
+        """Shown when PERF_PANEL is set or the page is opened with ?perf=1"""
+        return Config.PERF_PANEL or st.experimental_get_query_params().get('perf', [''])[0] in ('1', 'true')
+    
+    @staticmethod
+    def display_performance_panel(recorder):
+        """Display the span breakdown of the current rerun
+        
+        Spans nest and run concurrently, so each one's share is of the rerun's
+        wall-clock time; shares are not meant to add up to 100%.
+        """
+        spans = recorder.to_frame()
+        if spans.empty:
+            return
+        
+        with st.expander(f"⏱️ Performance - {recorder.wall_seconds:.2f}s this rerun", expanded=False):
+            spans['share'] = spans['seconds'] / recorder.wall_seconds * 100 if recorder.wall_seconds else 0.0
+            spans['memory_delta_mb'] = spans['memory_delta_bytes'] / (1024 * 1024)
+            st.dataframe(
+                spans.drop(columns='memory_delta_bytes').round({'seconds': 4, 'share': 1, 'memory_delta_mb': 2}),
+                use_container_width=True,
+                hide_index=True
+            )
@@ -11,6 +11,72 @@ class Config:
     DB_USER = os.getenv('DB_USER')
     DB_PASSWORD = os.getenv('DB_PASSWORD')
     
+    # Connection pool shared by every DatabaseManager in the process
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Bulk loading
+    COPY_BATCH_SIZE = int(os.getenv('COPY_BATCH_SIZE', '50000'))
+    
+    # Excel parsing processes used by load_data.py
+    INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', '1'))
+    
+    # Ingestion daemon: folder polling interval, how long a file must stay unchanged
+    # before it is loaded, files waiting in the queue, and files loaded at once
+    INGEST_POLL_SECONDS = float(os.getenv('INGEST_POLL_SECONDS', '1'))
+    INGEST_SETTLE_SECONDS = float(os.getenv('INGEST_SETTLE_SECONDS', '2'))
+    INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', '16'))
+    INGEST_DAEMON_WORKERS = int(os.getenv('INGEST_DAEMON_WORKERS', '2'))
+    # A file that fails to load is retried after INGEST_RETRY_SECONDS, doubling each time,
+    # at most INGEST_MAX_RETRIES times before waiting for the file to change
+    INGEST_RETRY_SECONDS = float(os.getenv('INGEST_RETRY_SECONDS', '5'))
+    INGEST_MAX_RETRIES = int(os.getenv('INGEST_MAX_RETRIES', '5'))
+    
+    # Sheet rows held in memory per chunk by the streaming loader
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', '10000'))
+    
+    # Rows per chunk when streaming query results through a server-side cursor
+    FETCH_CHUNK_SIZE = int(os.getenv('FETCH_CHUNK_SIZE', '50000'))
+    
+    # Columnar snapshot the dashboard reads instead of querying when current
+    SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', 'data/processed/dashboard_snapshot.arrow')
+    
+    # Dashboard query result cache
+    QUERY_CACHE_MAX_BYTES = int(os.getenv('QUERY_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '64'))
+    QUERY_CACHE_TTL_SECONDS = int(os.getenv('QUERY_CACHE_TTL_SECONDS', '3600'))
+    DATA_VERSION_POLL_SECONDS = float(os.getenv('DATA_VERSION_POLL_SECONDS', '10'))
+    
+    # Rerun an idle dashboard page when the data version moves, checking this often (0 disables)
+    LIVE_REFRESH_SECONDS = float(os.getenv('LIVE_REFRESH_SECONDS', '0'))
+    
+    # Apply dashboard filters in SQL instead of on the full in-memory dataset
+    FILTER_PUSHDOWN = os.getenv('FILTER_PUSHDOWN', 'true').lower() in ('1', 'true', 'yes')
+    
+    # Threads one rerun uses for independent queries and section payloads at once (1 runs them
+    # in sequence), drawn from a pool of CONCURRENT_POOL_SIZE threads shared by every session
+    CONCURRENT_WORKERS = int(os.getenv('CONCURRENT_WORKERS', '4'))
+    CONCURRENT_POOL_SIZE = int(os.getenv('CONCURRENT_POOL_SIZE', '16'))
+    
+    # Large-data chart mode: WebGL traces and LTTB-downsampled lines above these point counts
+    CHART_WEBGL_THRESHOLD = int(os.getenv('CHART_WEBGL_THRESHOLD', '5000'))
+    CHART_MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', '5000'))
+    FIGURE_CACHE_MAX_ENTRIES = int(os.getenv('FIGURE_CACHE_MAX_ENTRIES', '128'))
+    
+    # Per-section timing: optional Prometheus textfile and the hidden performance panel (?perf=1)
+    PERF_METRICS_FILE = os.getenv('PERF_METRICS_FILE')
+    PERF_PANEL = os.getenv('PERF_PANEL', 'false').lower() in ('1', 'true', 'yes')
+    
+    # Registration rows above which GrowthEngine pushes growth down to a remote database
+    # instead of aggregating a frame the caller already holds
+    GROWTH_PUSHDOWN_ROWS = int(os.getenv('GROWTH_PUSHDOWN_ROWS', '1000000'))
+    
+    # Share of a year's registrations in Q1..Q4 (relative to an even split) for synthetic quarters
+    QUARTERLY_SEASONAL_FACTORS = [float(factor) for factor in os.getenv('QUARTERLY_SEASONAL_FACTORS', '0.9,1.1,1.0,1.0').split(',')]
+    
     @classmethod
     def get_database_url(cls):
         if cls.DATABASE_URL:
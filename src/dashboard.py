@@ -3,22 +3,38 @@ Main dashboard application - now much cleaner and modular!
 """
 import streamlit as st
 import pandas as pd
+import logging
 import sys
 import os
+import time
 
 # Add the project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.database import DatabaseManager
-from src.data_processor import DataProcessor
+from src.config import Config
+from src.queries import (
+    DASHBOARD_DATA_QUERY,
+    FILTER_YEARS_QUERY,
+    FILTER_CATEGORIES_QUERY,
+    FILTER_MANUFACTURERS_QUERY,
+    RegistrationQueryBuilder
+)
+from src.services import get_services
 from src.components.styles import get_dashboard_styles
 from src.components.metrics import MetricsComponent
 from src.components.filters import FilterComponent
 from src.components.charts import ChartComponent
 from src.components.insights import InsightsComponent
+from src.components.performance import PerformanceComponent
 from src.utils.growth_calculator import GrowthCalculator
+from src.utils.aggregations import AggregationCube
+from src.utils.frame_types import compact_registrations_frame, log_footprint_report
+from src.utils.instrumentation import SpanRecorder, span
+from src.utils.concurrency import run_concurrently
+
+logger = logging.getLogger(__name__)
 
 # Configure page
 st.set_page_config(
@@ -33,30 +49,32 @@ st.markdown(get_dashboard_styles(), unsafe_allow_html=True)
 
 class VehicleDashboard:
     def __init__(self):
-        self.db_manager = DatabaseManager()
-        self.data_processor = DataProcessor()
+        # Created once per server process and shared by every session
+        services = get_services()
+        self.db_manager = services.db_manager
+        self.query_runner = services.query_runner
+        self.snapshot_store = services.snapshot_store
         self.growth_calculator = GrowthCalculator()
     
     def load_data(self):
-        """Load data from database"""
+        """Load data through the shared cache, which only misses when the data version moves"""
         try:
-            query = """
-            SELECT 
-                registration_date,
-                vehicle_category,
-                manufacturer,
-                state,
-                district,
-                SUM(registrations_count) as total_registrations
-            FROM vehicle_registrations 
-            GROUP BY registration_date, vehicle_category, manufacturer, state, district
-            ORDER BY registration_date DESC
-            """
-            return self.db_manager.fetch_data(query)
+            return self.query_runner.memoize('dashboard_data', self._load_working_set)
         except Exception as e:
             st.error(f"Error loading data: {e}")
             return pd.DataFrame()
     
+    def _load_working_set(self, data_version):
+        """Read the columnar snapshot when current, otherwise query the database"""
+        snapshot_df = self.snapshot_store.read(data_version)
+        if snapshot_df is not None:
+            return compact_registrations_frame(snapshot_df)
+        
+        df = self.db_manager.fetch_data(DASHBOARD_DATA_QUERY)
+        compact_df = compact_registrations_frame(df)
+        log_footprint_report(df, compact_df)
+        return compact_df
+    
     def display_header(self):
         """Display dashboard header"""
         st.markdown("""
@@ -66,30 +84,160 @@ class VehicleDashboard:
         </div>
         """, unsafe_allow_html=True)
     
-    def display_growth_analysis(self, df_filtered, selected_years):
-        """Display comprehensive growth analysis section"""
+    GROWTH_VIEWS = {
+        'yoy': "📈 Year-over-Year (YoY)",
+        'qoq': "📊 Quarter-over-Quarter (QoQ)",
+        'manufacturer': "🏭 Manufacturer Growth"
+    }
+    
+    def display_growth_analysis(self, df_filtered, selected_years, cube=None, filters=None, payload=None):
+        """Display comprehensive growth analysis section
+        
+        Only the selected view is computed and drawn; each view's result is
+        kept in session state for the current filters, so switching back is instant.
+        payload is a growth_payload built ahead of rendering, used when it
+        matches the view selected now.
+        """
         if len(selected_years) <= 1:
             st.info("💡 **Select multiple years** in the filter above to unlock comprehensive growth analysis including YoY and QoQ metrics")
             return
         
         st.markdown('<h2 class="section-header">📊 Comprehensive Growth Intelligence</h2>', unsafe_allow_html=True)
         
-        # Calculate enhanced growth metrics
-        yearly_growth, quarterly_growth, manufacturer_growth = self.growth_calculator.calculate_enhanced_growth_metrics(df_filtered)
+        # Growth view selector - changing it reruns only what the chosen view needs
+        view = st.radio(
+            "Growth view",
+            list(self.GROWTH_VIEWS),
+            format_func=self.GROWTH_VIEWS.get,
+            horizontal=True,
+            key='growth_view',
+            label_visibility='collapsed'
+        )
+        
+        if payload is None or payload['view'] != view:
+            payload = self.growth_payload(view, df_filtered, cube, self.cached_growth_view(view, filters))
+        self.remember_growth_view(view, filters, payload['growth'])
+        
+        if view == 'yoy':
+            self._display_yoy_analysis(payload['rows'], payload['figure'])
+        elif view == 'qoq':
+            self._display_qoq_analysis(payload['rows'], payload['figure'])
+        else:
+            self._display_manufacturer_growth_analysis(payload['rows'], payload['figure'])
+    
+    def selected_growth_view(self):
+        """The growth view the radio will return on this rerun"""
+        return st.session_state.get('growth_view', next(iter(self.GROWTH_VIEWS)))
+    
+    def _growth_memo(self, filters):
+        """Session-state memo of growth views for the current filters and data version"""
+        state_key = self.query_runner.make_key('growth_views', filters, self.query_runner.data_version())
+        memo = st.session_state.get('growth_views')
+        if memo is None or memo['key'] != state_key:
+            # New filters or data - earlier views can never be shown again
+            memo = {'key': state_key, 'views': {}}
+            st.session_state['growth_views'] = memo
+        return memo
+    
+    def cached_growth_view(self, view, filters):
+        """Copy of a memoized growth view, or None when it has not been computed"""
+        growth = self._growth_memo(filters)['views'].get(view)
+        return None if growth is None else growth.copy()
+    
+    def remember_growth_view(self, view, filters, growth):
+        memo = self._growth_memo(filters)
+        if view not in memo['views']:
+            memo['views'][view] = growth
+    
+    def growth_payload(self, view, df_filtered, cube=None, growth=None):
+        """Growth rows and chart for one view; safe to build off the main thread
         
-        # Growth Analysis Tabs
-        tab1, tab2, tab3 = st.tabs(["📈 Year-over-Year (YoY)", "📊 Quarter-over-Quarter (QoQ)", "🏭 Manufacturer Growth"])
+        growth is the memoized view when available, otherwise it is computed here.
+        """
+        cube = cube or AggregationCube(df_filtered)
+        if growth is None:
+            with span('growth_view', rows=len(df_filtered), view=view):
+                growth = self.growth_calculator.calculate_view(view, df_filtered, cube)
         
-        with tab1:
-            self._display_yoy_analysis(yearly_growth)
+        builders = {
+            'yoy': self._yoy_chart,
+            'qoq': self._qoq_chart,
+            'manufacturer': self._manufacturer_growth_chart
+        }
+        rows, figure = builders[view](growth.copy(), cube)
+        return {'view': view, 'growth': growth, 'rows': rows, 'figure': figure}
+    
+    @staticmethod
+    def _yoy_chart(yearly_growth, cube=None):
+        """(rows with a YoY rate, chart), or (None, None) when there is no growth data"""
+        if yearly_growth.empty or yearly_growth['yoy_growth'].isna().all():
+            return None, None
         
-        with tab2:
-            self._display_qoq_analysis(quarterly_growth)
+        yoy_clean = yearly_growth.dropna(subset=['yoy_growth'])
+        fig_yoy = ChartComponent.create_enhanced_chart(
+            yoy_clean, 'bar',
+            x='year', y='yoy_growth', color='vehicle_category',
+            title="📈 Year-over-Year Growth Rates by Category",
+            color_discrete_sequence=['#0f766e', '#155e75', '#0891b2'],
+            labels={'yoy_growth': 'YoY Growth (%)', 'year': 'Year'}
+        )
+        if fig_yoy:
+            fig_yoy.add_hline(y=0, line_dash="dash", line_color="red", 
+                            annotation_text="Break-even Point", annotation_position="top left")
+        return yoy_clean, fig_yoy
+    
+    @staticmethod
+    def _qoq_chart(quarterly_growth, cube=None):
+        """(rows with a QoQ rate, chart), or (None, None) when there is no growth data"""
+        if quarterly_growth.empty or quarterly_growth['qoq_growth'].isna().all():
+            return None, None
         
-        with tab3:
-            self._display_manufacturer_growth_analysis(manufacturer_growth, df_filtered)
+        qoq_clean = quarterly_growth.dropna(subset=['qoq_growth'])
+        fig_qoq = ChartComponent.create_enhanced_chart(
+            qoq_clean, 'line',
+            x='year_quarter', y='qoq_growth', color='vehicle_category',
+            title="📊 Quarter-over-Quarter Growth Trends",
+            color_discrete_sequence=['#0f766e', '#155e75', '#0891b2'],
+            labels={'qoq_growth': 'QoQ Growth (%)', 'year_quarter': 'Quarter'}
+        )
+        if fig_qoq:
+            fig_qoq.add_hline(y=0, line_dash="dash", line_color="red",
+                            annotation_text="No Growth Line", annotation_position="top left")
+            fig_qoq.update_xaxes(tickangle=45)
+        return qoq_clean, fig_qoq
     
-    def _display_yoy_analysis(self, yearly_growth):
+    @staticmethod
+    def _manufacturer_growth_chart(manufacturer_growth, cube):
+        """(latest-year growth of the top 10 vehicle types, chart), or (None, None)"""
+        if manufacturer_growth.empty:
+            return None, None
+        
+        top_manufacturers = cube.top_manufacturers(10).index
+        mfg_clean = manufacturer_growth[
+            (manufacturer_growth['manufacturer'].isin(top_manufacturers)) &
+            (manufacturer_growth['yoy_growth'].notna())
+        ]
+        if mfg_clean.empty:
+            return None, None
+        
+        latest_year = mfg_clean['year'].max()
+        latest_growth = mfg_clean[mfg_clean['year'] == latest_year].sort_values('yoy_growth', ascending=True)
+        
+        fig_mfg = ChartComponent.create_enhanced_chart(
+            latest_growth, 'horizontal_bar',
+            x='yoy_growth', y='manufacturer',
+            title=f"🏭 Top Vehicle Types YoY Growth ({latest_year})",
+            color='yoy_growth',
+            color_continuous_scale=['#dc2626', '#f59e0b', '#10b981'],
+            labels={'yoy_growth': 'YoY Growth (%)', 'manufacturer': 'Vehicle Type'}
+        )
+        if fig_mfg:
+            fig_mfg.add_vline(x=0, line_dash="dash", line_color="black",
+                            annotation_text="Break-even", annotation_position="top")
+            fig_mfg.update_layout(height=500)
+        return latest_growth, fig_mfg
+    
+    def _display_yoy_analysis(self, yoy_clean, fig_yoy):
         """Display YoY growth analysis"""
         st.markdown("### Year-over-Year Growth Analysis")
         
@@ -98,19 +246,9 @@ class VehicleDashboard:
             "Year-over-Year growth compares the same period in consecutive years. Positive values indicate growth, negative values indicate decline. This metric helps identify long-term trends and business cycles."
         )
         
-        if not yearly_growth.empty and not yearly_growth['yoy_growth'].isna().all():
-            yoy_clean = yearly_growth.dropna(subset=['yoy_growth'])
+        if yoy_clean is not None:
             if not yoy_clean.empty:
-                fig_yoy = ChartComponent.create_enhanced_chart(
-                    yoy_clean, 'bar',
-                    x='year', y='yoy_growth', color='vehicle_category',
-                    title="📈 Year-over-Year Growth Rates by Category",
-                    color_discrete_sequence=['#0f766e', '#155e75', '#0891b2'],
-                    labels={'yoy_growth': 'YoY Growth (%)', 'year': 'Year'}
-                )
                 if fig_yoy:
-                    fig_yoy.add_hline(y=0, line_dash="dash", line_color="red", 
-                                    annotation_text="Break-even Point", annotation_position="top left")
                     st.plotly_chart(fig_yoy, use_container_width=True)
                 
                 # YoY Summary
@@ -122,7 +260,7 @@ class VehicleDashboard:
         else:
             st.info("📊 Insufficient data for YoY growth analysis. Need at least 2 years of data.")
     
-    def _display_qoq_analysis(self, quarterly_growth):
+    def _display_qoq_analysis(self, qoq_clean, fig_qoq):
         """Display QoQ growth analysis"""
         st.markdown("### Quarter-over-Quarter Growth Analysis")
         
@@ -131,20 +269,9 @@ class VehicleDashboard:
             "Quarter-over-Quarter growth compares consecutive 3-month periods. This metric reveals short-term trends, seasonal patterns, and immediate market responses. It's more sensitive to recent changes than YoY metrics."
         )
         
-        if not quarterly_growth.empty and not quarterly_growth['qoq_growth'].isna().all():
-            qoq_clean = quarterly_growth.dropna(subset=['qoq_growth'])
+        if qoq_clean is not None:
             if not qoq_clean.empty:
-                fig_qoq = ChartComponent.create_enhanced_chart(
-                    qoq_clean, 'line',
-                    x='year_quarter', y='qoq_growth', color='vehicle_category',
-                    title="📊 Quarter-over-Quarter Growth Trends",
-                    color_discrete_sequence=['#0f766e', '#155e75', '#0891b2'],
-                    labels={'qoq_growth': 'QoQ Growth (%)', 'year_quarter': 'Quarter'}
-                )
                 if fig_qoq:
-                    fig_qoq.add_hline(y=0, line_dash="dash", line_color="red",
-                                    annotation_text="No Growth Line", annotation_position="top left")
-                    fig_qoq.update_xaxes(tickangle=45)
                     st.plotly_chart(fig_qoq, use_container_width=True)
                 
                 # QoQ Insights
@@ -160,7 +287,7 @@ class VehicleDashboard:
         else:
             st.info("📊 QoQ analysis based on distributed annual data. For precise quarterly analysis, quarterly registration data would be needed.")
     
-    def _display_manufacturer_growth_analysis(self, manufacturer_growth, df_filtered):
+    def _display_manufacturer_growth_analysis(self, latest_growth, fig_mfg):
         """Display manufacturer growth analysis"""
         st.markdown("### Top Manufacturer/Vehicle Type Growth")
         
@@ -169,109 +296,254 @@ class VehicleDashboard:
             "This section shows year-over-year growth for individual vehicle types/manufacturers. It helps identify market winners and losers, emerging trends, and investment opportunities."
         )
         
-        if not manufacturer_growth.empty:
-            top_manufacturers = df_filtered.groupby('manufacturer')['total_registrations'].sum().sort_values(ascending=False).head(10).index
-            mfg_clean = manufacturer_growth[
-                (manufacturer_growth['manufacturer'].isin(top_manufacturers)) &
-                (manufacturer_growth['yoy_growth'].notna())
-            ]
+        if latest_growth is not None and not latest_growth.empty:
+            if fig_mfg:
+                st.plotly_chart(fig_mfg, use_container_width=True)
             
-            if not mfg_clean.empty:
-                latest_year = mfg_clean['year'].max()
-                latest_growth = mfg_clean[mfg_clean['year'] == latest_year].sort_values('yoy_growth', ascending=True)
-                
-                if not latest_growth.empty:
-                    fig_mfg = ChartComponent.create_enhanced_chart(
-                        latest_growth, 'horizontal_bar',
-                        x='yoy_growth', y='manufacturer',
-                        title=f"🏭 Top Vehicle Types YoY Growth ({latest_year})",
-                        color='yoy_growth',
-                        color_continuous_scale=['#dc2626', '#f59e0b', '#10b981'],
-                        labels={'yoy_growth': 'YoY Growth (%)', 'manufacturer': 'Vehicle Type'}
-                    )
-                    if fig_mfg:
-                        fig_mfg.add_vline(x=0, line_dash="dash", line_color="black",
-                                        annotation_text="Break-even", annotation_position="top")
-                        fig_mfg.update_layout(height=500)
-                        st.plotly_chart(fig_mfg, use_container_width=True)
-                    
-                    # Growth winners and losers
-                    if len(latest_growth) > 0:
-                        winner = latest_growth.iloc[-1]
-                        loser = latest_growth.iloc[0]
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.success(f"🏆 **Growth Winner**: {winner['manufacturer']} (+{winner['yoy_growth']:.1f}%)")
-                        with col2:
-                            st.error(f"📉 **Needs Attention**: {loser['manufacturer']} ({loser['yoy_growth']:.1f}%)")
+            # Growth winners and losers
+            winner = latest_growth.iloc[-1]
+            loser = latest_growth.iloc[0]
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.success(f"🏆 **Growth Winner**: {winner['manufacturer']} (+{winner['yoy_growth']:.1f}%)")
+            with col2:
+                st.error(f"📉 **Needs Attention**: {loser['manufacturer']} ({loser['yoy_growth']:.1f}%)")
+    
+    @staticmethod
+    def data_explorer_payload(df_filtered, cube=None):
+        """Summary statistics and the display-ready table; safe off the main thread"""
+        if df_filtered.empty:
+            return None
+        
+        cube = cube or AggregationCube(df_filtered)
+        display_df = df_filtered.copy()
+        display_df['registration_date'] = display_df['registration_date'].dt.strftime('%Y-%m-%d')
+        return {
+            'summary': cube.category_summary().round(2),
+            'rows': display_df.sort_values('total_registrations', ascending=False)
+        }
     
-    def display_data_explorer(self, df_filtered):
+    def display_data_explorer(self, df_filtered, cube=None, payload=None):
         """Display data explorer section"""
         with st.expander("🔍 Data Explorer - Detailed View", expanded=False):
             if not df_filtered.empty:
+                payload = payload or self.data_explorer_payload(df_filtered, cube)
+                
                 st.markdown("### Summary Statistics")
-                summary_stats = df_filtered.groupby('vehicle_category')['total_registrations'].agg([
-                    'sum', 'mean', 'std', 'min', 'max', 'count'
-                ]).round(2)
-                st.dataframe(summary_stats, use_container_width=True)
+                st.dataframe(payload['summary'], use_container_width=True)
                 
                 st.markdown("### Complete Dataset")
-                display_df = df_filtered.copy()
-                display_df['registration_date'] = display_df['registration_date'].dt.strftime('%Y-%m-%d')
-                st.dataframe(
-                    display_df.sort_values('total_registrations', ascending=False),
-                    use_container_width=True
-                )
+                st.dataframe(payload['rows'], use_container_width=True)
             else:
                 st.info("No data available for selected filters")
     
+    def load_filter_options(self):
+        """Load filter options from the rollups, or None to fall back to in-memory filtering"""
+        try:
+            # Three independent rollup queries, run at once
+            options = run_concurrently({
+                'years': lambda: self.query_runner.fetch_data(FILTER_YEARS_QUERY),
+                'categories': lambda: self.query_runner.fetch_data(FILTER_CATEGORIES_QUERY),
+                'manufacturers': lambda: self.query_runner.fetch_data(FILTER_MANUFACTURERS_QUERY)
+            })
+            years, categories, manufacturer_totals = options['years'], options['categories'], options['manufacturers']
+        except Exception as e:
+            logger.warning(f"Filter push-down unavailable, filtering in memory: {e}")
+            return None
+        
+        if years.empty:
+            return None
+        
+        return (
+            years['year'].astype(int).tolist(),
+            categories['vehicle_category'].tolist(),
+            sorted(manufacturer_totals['manufacturer']),
+            manufacturer_totals['manufacturer'].head(15).tolist()
+        )
+    
+    def load_filtered_data(self, selected_years, categories, manufacturers):
+        """Fetch only the rows matching the filters, or None to fall back to in-memory filtering"""
+        try:
+            statement, params = RegistrationQueryBuilder.build(selected_years, categories, manufacturers)
+            df_filtered = self.query_runner.fetch_data(statement, params=params)
+        except Exception as e:
+            logger.warning(f"Filtered query failed, filtering in memory: {e}")
+            return None
+        
+        # The selections give every slice of one filter state the same categories
+        return compact_registrations_frame(df_filtered, categories={
+            'vehicle_category': categories,
+            'manufacturer': manufacturers
+        })
+    
+    @staticmethod
+    def filter_data(df, selected_years, categories, manufacturers):
+        """Filter the full working set in memory"""
+        if selected_years:
+            return df[
+                (df['registration_date'].dt.year.isin(selected_years)) &
+                (df['vehicle_category'].isin(categories)) &
+                (df['manufacturer'].isin(manufacturers))
+            ]
+        return df[
+            (df['vehicle_category'].isin(categories)) &
+            (df['manufacturer'].isin(manufacturers))
+        ]
+    
+    @staticmethod
+    def filter_state(selected_years, categories, manufacturers):
+        """Canonical form of the filter selections, used as a cache key"""
+        return {
+            'years': sorted(int(year) for year in selected_years),
+            'categories': sorted(categories),
+            'manufacturers': sorted(manufacturers)
+        }
+    
+    def load_aggregation_cube(self, df_filtered, filters):
+        """Aggregate the filtered rows once for every section, cached per filter state"""
+        return self.query_runner.memoize(
+            'aggregation_cube',
+            lambda _: AggregationCube(df_filtered),
+            params=filters
+        )
+    
     def run_dashboard(self):
         """Main dashboard function - now much cleaner!"""
         
-        # Display header
-        self.display_header()
+        rendered_version = self.query_runner.data_version()
+        
+        # Time every section of this rerun
+        recorder = SpanRecorder()
+        with recorder.activate():
+            self._render_sections()
+        
+        recorder.export(Config.PERF_METRICS_FILE)
+        if PerformanceComponent.is_enabled():
+            PerformanceComponent.display_performance_panel(recorder)
         
-        # Load data
-        with st.spinner("🔄 Loading market data..."):
-            df = self.load_data()
+        self.wait_for_new_data(rendered_version)
+    
+    def wait_for_new_data(self, rendered_version):
+        """Check an idle page once for a data version bump, then rerun it
         
-        if df.empty:
-            st.error("📊 No data available. Please check your database connection.")
+        Only with LIVE_REFRESH_SECONDS set. The wait is bounded to one interval,
+        so no session holds its script thread indefinitely; the rerun schedules
+        the next check and, once the version has moved, renders the new data.
+        Touching the placeholder is where Streamlit stops the wait when the user
+        interacts or the session ends.
+        """
+        if Config.LIVE_REFRESH_SECONDS <= 0 or rendered_version is None:
             return
         
-        # Ensure registration_date is datetime
-        df['registration_date'] = pd.to_datetime(df['registration_date'])
+        placeholder = st.empty()
+        time.sleep(Config.LIVE_REFRESH_SECONDS)
+        placeholder.empty()
+        if self.query_runner.data_version() != rendered_version:
+            logger.info(f"Data version moved past {rendered_version}, rerunning")
+        st.rerun()
+    
+    def _render_sections(self):
+        """Render the dashboard body, one span per step"""
         
-        # Display filters and get selections
-        selected_years, categories, manufacturers = FilterComponent.create_custom_filter_section(df)
+        # Display header
+        self.display_header()
         
-        # Filter data
-        if selected_years:
-            df_filtered = df[
-                (df['registration_date'].dt.year.isin(selected_years)) &
-                (df['vehicle_category'].isin(categories)) &
-                (df['manufacturer'].isin(manufacturers))
-            ]
+        # Filter options come from cheap rollup queries when push-down is enabled
+        filter_options = self.load_filter_options() if Config.FILTER_PUSHDOWN else None
+        df = None
+        
+        if filter_options is None:
+            # Load data
+            with st.spinner("🔄 Loading market data..."), span('load_data') as load_span:
+                df = self.load_data()
+                load_span.rows = len(df)
+            
+            if df.empty:
+                st.error("📊 No data available. Please check your database connection.")
+                return
+            
+            # Ensure registration_date is datetime
+            df['registration_date'] = pd.to_datetime(df['registration_date'])
+            
+            # Display filters and get selections
+            selected_years, categories, manufacturers = FilterComponent.create_custom_filter_section(df)
         else:
-            df_filtered = df[
-                (df['vehicle_category'].isin(categories)) &
-                (df['manufacturer'].isin(manufacturers))
-            ]
+            selected_years, categories, manufacturers = FilterComponent.create_filter_section(*filter_options)
+        
+        # Filter data, in the database when possible
+        df_filtered = None
+        if df is None:
+            with st.spinner("🔄 Loading market data..."), span('filter', mode='pushdown') as filter_span:
+                df_filtered = self.load_filtered_data(selected_years, categories, manufacturers)
+                filter_span.rows = None if df_filtered is None else len(df_filtered)
+        
+        if df_filtered is None:
+            if df is None:
+                with span('load_data') as load_span:
+                    df = self.load_data()
+                    load_span.rows = len(df)
+                if df.empty:
+                    st.error("📊 No data available. Please check your database connection.")
+                    return
+                df['registration_date'] = pd.to_datetime(df['registration_date'])
+            with span('filter', rows=len(df), mode='memory'):
+                df_filtered = self.filter_data(df, selected_years, categories, manufacturers)
         
         if df_filtered.empty:
             st.warning("🔍 No data matches your filters. Try adjusting your selection.")
             return
         
-        # Display all sections using modular components
-        MetricsComponent.display_kpi_section(df_filtered)
-        ChartComponent.display_market_trends_section(df_filtered)
-        ChartComponent.display_vehicle_performance_section(df_filtered)
-        self.display_growth_analysis(df_filtered, selected_years)
-        InsightsComponent.display_insights_section(df_filtered, selected_years)
-        self.display_data_explorer(df_filtered)
+        rows = len(df_filtered)
+        filters = self.filter_state(selected_years, categories, manufacturers)
+        
+        # Every section reads its totals from one shared aggregation pass
+        with span('aggregation_cube', rows=rows):
+            cube = self.load_aggregation_cube(df_filtered, filters)
+        
+        # Section payloads only read df_filtered and the cube, so they are built
+        # concurrently; rendering stays on this thread, in page order
+        growth_view = self.selected_growth_view()
+        cached_growth = self.cached_growth_view(growth_view, filters)
+        
+        def timed(name, build):
+            def task():
+                with span(name, rows=rows, phase='compute'):
+                    return build()
+            return task
+        
+        tasks = {
+            'kpi': timed('kpi', lambda: MetricsComponent.kpi_payload(df_filtered, cube)),
+            'market_trends': timed('market_trends', lambda: ChartComponent.market_trends_payload(df_filtered, cube)),
+            'vehicle_performance': timed('vehicle_performance', lambda: ChartComponent.vehicle_performance_payload(df_filtered, cube)),
+            'insights': timed('insights', lambda: InsightsComponent.generate_enhanced_insights(df_filtered, selected_years, cube)),
+            'data_explorer': timed('data_explorer', lambda: self.data_explorer_payload(df_filtered, cube))
+        }
+        if len(selected_years) > 1:
+            tasks['growth_analysis'] = timed(
+                'growth_analysis', lambda: self.growth_payload(growth_view, df_filtered, cube, cached_growth)
+            )
+        
+        with span('section_payloads', rows=rows, workers=Config.CONCURRENT_WORKERS):
+            payloads = run_concurrently(tasks)
+        
+        # Display all sections using modular components, timing each one's
+        # Streamlit/Plotly serialization separately from its payload
+        with span('kpi', rows=rows, phase='render'):
+            MetricsComponent.display_kpi_section(df_filtered, cube, payloads['kpi'])
+        with span('market_trends', rows=rows, phase='render'):
+            ChartComponent.display_market_trends_section(df_filtered, cube, payloads['market_trends'])
+        with span('vehicle_performance', rows=rows, phase='render'):
+            ChartComponent.display_vehicle_performance_section(df_filtered, cube, payloads['vehicle_performance'])
+        with span('growth_analysis', rows=rows, phase='render'):
+            self.display_growth_analysis(df_filtered, selected_years, cube, filters, payloads.get('growth_analysis'))
+        with span('insights', rows=rows, phase='render'):
+            InsightsComponent.display_insights_section(df_filtered, selected_years, cube, payloads['insights'])
+        with span('data_explorer', rows=rows, phase='render'):
+            self.display_data_explorer(df_filtered, cube, payloads['data_explorer'])
 
 # Initialize and run dashboard
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     dashboard = VehicleDashboard()
     dashboard.run_dashboard()
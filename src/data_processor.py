@@ -1,60 +1,72 @@
 import pandas as pd
+import numpy as np
 import os
 import glob
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
 import logging
+from src.config import Config
 from src.database import DatabaseManager
+from src.manifest import FileManifest
+from src.utils.growth_engine import GrowthEngine
+from src.utils.concurrency import run_concurrently
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RECORD_COLUMNS = [
+    'registration_date',
+    'vehicle_category',
+    'manufacturer',
+    'state',
+    'district',
+    'rto_code',
+    'registrations_count'
+]
+
 class DataProcessor:
-    def __init__(self):
-        self.db_manager = DatabaseManager()
+    # Vahan exports carry a block of header rows before the data starts
+    DATA_START_ROW = 4
+    
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager or DatabaseManager()
+        self.growth_engine = GrowthEngine(self.db_manager)
+        # Years loaded since the last publish; loads may run on several threads
+        self._changed_years = set()
+        self._changed_years_lock = threading.Lock()
         
-    def process_excel_files(self, data_folder_path):
-        """Process all Excel files in the data folder"""
-        excel_files = glob.glob(os.path.join(data_folder_path, "*.xlsx"))
+    def process_excel_files(self, data_folder_path, workers=None, force=False):
+        """Process new or changed Excel files in the data folder
         
-        if not excel_files:
-            logger.error("No Excel files found in the specified folder")
+        Files whose manifest entry is unchanged are skipped without being parsed;
+        force=True reloads every file.
+        """
+        pending = self.find_pending_files(data_folder_path, force)
+        
+        if pending is None:
             return
         
+        if not pending:
+            return pd.DataFrame(columns=RECORD_COLUMNS)
+        
+        parsed_frames = self.parse_excel_files([file_path for file_path, _ in pending], workers)
+        
         all_data = []
         
-        for file_path in excel_files:
-            try:
-                # Extract vehicle category and year from filename
-                filename = os.path.basename(file_path)
-                parts = filename.replace('.xlsx', '').split('_')
-                
-                if len(parts) >= 2:
-                    year = parts[0]  # e.g., "2023"
-                    vehicle_category = parts[1].upper()  # e.g., "2W"
-                else:
-                    logger.warning(f"Unexpected filename format: {filename}")
+        for (file_path, entry), processed_df in zip(pending, parsed_frames):
+            if processed_df is not None and not processed_df.empty:
+                try:
+                    self.load_file(processed_df, entry)
+                except Exception as e:
+                    logger.error(f"Error loading {file_path}: {e}")
                     continue
-                
-                # Read Excel file
-                df = pd.read_excel(file_path)
-                
-                # Process the dataframe
-                processed_df = self.clean_and_transform_data(df, vehicle_category, year, filename)
-                
-                if processed_df is not None and not processed_df.empty:
-                    all_data.append(processed_df)
-                    logger.info(f"Processed {filename}: {len(processed_df)} records")
-                
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                continue
+                all_data.append(processed_df)
+                logger.info(f"Processed {entry['file_name']}: {len(processed_df)} records")
         
         if all_data:
             # Combine all data
             combined_df = pd.concat(all_data, ignore_index=True)
-            
-            # Insert into database
-            self.db_manager.insert_dataframe(combined_df, 'vehicle_registrations', if_exists='append')
             logger.info(f"Successfully loaded {len(combined_df)} total records into database")
             
             return combined_df
@@ -62,15 +74,208 @@ class DataProcessor:
             logger.error("No data was successfully processed")
             return None
     
-    def clean_and_transform_data(self, df, vehicle_category, year, filename):
+    def stream_excel_files(self, data_folder_path, force=False, chunk_size=None):
+        """Load new or changed Excel files chunk by chunk with bounded memory
+        
+        Returns the number of records loaded, or None when nothing could be loaded.
+        """
+        pending = self.find_pending_files(data_folder_path, force)
+        
+        if pending is None:
+            return None
+        
+        total_records = 0
+        loaded_files = 0
+        
+        for file_path, entry in pending:
+            try:
+                row_count = self.load_file(self.iter_excel_chunks(file_path, chunk_size), entry)
+            except Exception as e:
+                logger.error(f"Error processing {file_path}: {e}")
+                continue
+            total_records += row_count
+            loaded_files += 1
+            logger.info(f"Streamed {entry['file_name']}: {row_count} records")
+        
+        if pending and not loaded_files:
+            logger.error("No data was successfully processed")
+            return None
+        
+        logger.info(f"Successfully loaded {total_records} total records into database")
+        return total_records
+    
+    def find_pending_files(self, data_folder_path, force=False):
+        """List (file_path, manifest_entry) for files that need loading
+        
+        Returns None when the folder holds no Excel files at all.
+        """
+        # Sorted so results merge in the same order on every run
+        excel_files = sorted(glob.glob(os.path.join(data_folder_path, "*.xlsx")))
+        
+        if not excel_files:
+            logger.error("No Excel files found in the specified folder")
+            return None
+        
+        manifest = FileManifest(self.db_manager)
+        if not force:
+            manifest.load()
+        
+        pending = []
+        for file_path in excel_files:
+            entry = manifest.check(file_path)
+            if entry is None:
+                logger.info(f"Skipping unchanged file {os.path.basename(file_path)}")
+                continue
+            pending.append((file_path, entry))
+        
+        if not pending:
+            logger.info("All files are unchanged since the last load")
+        
+        return pending
+    
+    def load_file(self, frames, manifest_entry):
+        """Replace a file's rows and record it in the manifest in one transaction"""
+        with self.db_manager.engine.begin() as conn:
+            row_count = self.db_manager.upsert_registrations(conn, frames, manifest_entry['file_name'])
+            if row_count == 0:
+                # Rolls back, so a file that parses to nothing never wipes its old rows
+                raise ValueError(f"No valid records extracted from {manifest_entry['file_name']}")
+            manifest_entry['row_count'] = row_count
+            FileManifest.record(conn, manifest_entry)
+        
+        file_info = self.parse_filename(manifest_entry['file_name'])
+        if file_info is not None:
+            with self._changed_years_lock:
+                self._changed_years.add(int(file_info[0]))
+        return row_count
+    
+    def publish_changes(self, years=None):
+        """Refresh the rollups, then bump the data version so caches pick up the new data
+        
+        Growth read through growth_engine is then updated for the years
+        loaded since the last publish, plus any other changed years given
+        (such as dropped ones).
+        """
+        with self._changed_years_lock:
+            changed_years, self._changed_years = self._changed_years | set(years or []), set()
+        
+        try:
+            self.db_manager.refresh_rollups()
+            with self.db_manager.engine.begin() as conn:
+                version = self.db_manager.bump_data_version(conn)
+        except Exception:
+            # Still unpublished; the next publish covers them
+            with self._changed_years_lock:
+                self._changed_years |= changed_years
+            raise
+        logger.info(f"Published data version {version}")
+        
+        self.growth_engine.apply_changes(changed_years, version)
+        return version
+    
+    @classmethod
+    def parse_excel_files(cls, file_paths, workers=None):
+        """Parse and clean Excel files, in a process pool when workers > 1
+        
+        Returns one processed dataframe (or None) per input path, in input order.
+        """
+        workers = workers or Config.INGEST_WORKERS
+        
+        if workers <= 1 or len(file_paths) <= 1:
+            return [cls.parse_excel_file(file_path) for file_path in file_paths]
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            futures = [executor.submit(cls.parse_excel_file, file_path) for file_path in file_paths]
+            for file_path, future in zip(file_paths, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Error processing {file_path}: {e}")
+                    results.append(None)
+        
+        return results
+    
+    @classmethod
+    def parse_excel_file(cls, file_path):
+        """Read and clean a single Excel file, returning None on failure"""
+        try:
+            file_info = cls.parse_filename(file_path)
+            if file_info is None:
+                return None
+            
+            year, vehicle_category = file_info
+            
+            # Read Excel file
+            df = pd.read_excel(file_path)
+            
+            # Process the dataframe
+            return cls.clean_and_transform_data(df, vehicle_category, year, os.path.basename(file_path))
+            
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            return None
+    
+    @classmethod
+    def iter_excel_chunks(cls, file_path, chunk_size=None):
+        """Yield processed record chunks from the first sheet via openpyxl's read-only iterator
+        
+        Only chunk_size sheet rows are held in memory at a time.
+        """
+        chunk_size = chunk_size or Config.STREAM_CHUNK_SIZE
+        file_info = cls.parse_filename(file_path)
+        if file_info is None:
+            return
+        
+        year, vehicle_category = file_info
+        # Imported here, like pandas does for read_excel, so importing this module stays cheap
+        from openpyxl import load_workbook
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            
+            # pd.read_excel uses the first sheet row as the header, so data begins
+            # DATA_START_ROW rows after it (openpyxl rows are 1-based)
+            rows = sheet.iter_rows(min_row=cls.DATA_START_ROW + 2, values_only=True)
+            
+            while True:
+                raw_rows = list(islice(rows, chunk_size))
+                if not raw_rows:
+                    break
+                
+                # Object dtype keeps cells exactly as read, like a full read_excel column
+                df_chunk = pd.DataFrame(raw_rows, dtype=object).dropna(how='all')
+                if df_chunk.empty:
+                    continue
+                
+                records = cls.extract_records(df_chunk, vehicle_category, year)
+                if not records.empty:
+                    yield records
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def parse_filename(file_path):
+        """Extract (year, vehicle_category) from a YYYY_XW.xlsx filename"""
+        filename = os.path.basename(file_path)
+        parts = filename.replace('.xlsx', '').split('_')
+        
+        if len(parts) >= 2:
+            year = parts[0]  # e.g., "2023"
+            vehicle_category = parts[1].upper()  # e.g., "2W"
+            return year, vehicle_category
+        
+        logger.warning(f"Unexpected filename format: {filename}")
+        return None
+    
+    @classmethod
+    def clean_and_transform_data(cls, df, vehicle_category, year, filename):
         """Clean and transform the Excel data based on actual structure"""
         try:
             logger.info(f"Processing {filename} - Shape: {df.shape}")
             
             # Skip header rows and find the data start
-            # The actual data starts after the header rows
-            data_start_row = 4  # Based on your log output, data starts at row 4
-            df_clean = df.iloc[data_start_row:].reset_index(drop=True)
+            df_clean = df.iloc[cls.DATA_START_ROW:].reset_index(drop=True)
             
             # Remove rows that are completely empty
             df_clean = df_clean.dropna(how='all')
@@ -82,75 +287,12 @@ class DataProcessor:
             logger.info(f"Data shape after cleaning: {df_clean.shape}")
             logger.info(f"Sample cleaned data:\n{df_clean.head()}")
             
-            processed_records = []
+            processed_df = cls.extract_records(df_clean, vehicle_category, year)
             
-            # Process each row
-            for idx, row in df_clean.iterrows():
-                try:
-                    # Skip rows with no meaningful data
-                    if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == '':
-                        continue
-                    
-                    # Get the serial number (first column)
-                    serial_no = str(row.iloc[0]).strip()
-                    
-                    # Skip if it's not a valid serial number
-                    if not serial_no.isdigit():
-                        continue
-                    
-                    # Get vehicle type name (second column)
-                    if len(row) > 1 and pd.notna(row.iloc[1]):
-                        vehicle_type = str(row.iloc[1]).strip()
-                    else:
-                        continue
-                    
-                    # Get the total registrations (last column with data)
-                    total_registrations = 0
-                    
-                    # Look for the TOTAL column or the last numeric column
-                    for col_idx in range(len(row)-1, -1, -1):
-                        val = row.iloc[col_idx]
-                        if pd.notna(val):
-                            # Handle comma-separated numbers
-                            val_str = str(val).replace(',', '').strip()
-                            if val_str.isdigit():
-                                total_registrations = int(val_str)
-                                break
-                    
-                    # Skip if no valid registration count found
-                    if total_registrations <= 0:
-                        continue
-                    
-                    # Create registration date (middle of the year for analytics)
-                    registration_date = f"{year}-06-15"
-                    
-                    # Use vehicle type as manufacturer for this data structure
-                    # This makes sense because your data is grouped by vehicle types, not manufacturers
-                    manufacturer = vehicle_type.title()
-                    
-                    # Create record
-                    record = {
-                        'registration_date': registration_date,
-                        'vehicle_category': vehicle_category,
-                        'manufacturer': manufacturer,  # Using vehicle type as manufacturer
-                        'state': 'ALL INDIA',  # Since this appears to be aggregate data
-                        'district': 'ALL DISTRICTS',
-                        'rto_code': 'ALL_RTO',
-                        'registrations_count': total_registrations
-                    }
-                    
-                    processed_records.append(record)
-                    logger.debug(f"Added record: {vehicle_type} -> {total_registrations}")
-                    
-                except Exception as e:
-                    logger.debug(f"Error processing row {idx}: {e}")
-                    continue
-            
-            if not processed_records:
+            if processed_df.empty:
                 logger.warning(f"No valid records extracted from {filename}")
                 return None
             
-            processed_df = pd.DataFrame(processed_records)
             logger.info(f"Successfully extracted {len(processed_df)} records from {filename}")
             
             return processed_df
@@ -159,72 +301,92 @@ class DataProcessor:
             logger.error(f"Error in clean_and_transform_data for {filename}: {e}")
             return None
     
+    @staticmethod
+    def extract_records(df_clean, vehicle_category, year):
+        """Build registration records from cleaned sheet rows using column-wise operations"""
+        if df_clean.shape[1] < 2:
+            return pd.DataFrame(columns=RECORD_COLUMNS)
+        
+        # Rows need a numeric serial number in the first column
+        serial = df_clean.iloc[:, 0]
+        valid = serial.notna() & serial.astype(str).str.strip().str.isdigit()
+        
+        # ...and a vehicle type name in the second column
+        vehicle_type = df_clean.iloc[:, 1]
+        valid &= vehicle_type.notna()
+        
+        # Total registrations is the last numeric cell in the row
+        totals = DataProcessor._last_numeric_cell(df_clean)
+        valid &= totals > 0
+        
+        # Use vehicle type as manufacturer for this data structure
+        # This makes sense because the data is grouped by vehicle types, not manufacturers
+        manufacturer = vehicle_type[valid].astype(str).str.strip().str.title()
+        
+        return pd.DataFrame({
+            # Registration date is the middle of the year for analytics
+            'registration_date': f"{year}-06-15",
+            'vehicle_category': vehicle_category,
+            'manufacturer': manufacturer.to_numpy(),
+            # Since this appears to be aggregate data
+            'state': 'ALL INDIA',
+            'district': 'ALL DISTRICTS',
+            'rto_code': 'ALL_RTO',
+            'registrations_count': totals[valid].astype('int64').to_numpy()
+        }, columns=RECORD_COLUMNS)
+    
+    @staticmethod
+    def _last_numeric_cell(df_clean):
+        """Find the right-most cell per row holding a (comma-separated) whole number"""
+        totals = pd.Series(np.nan, index=df_clean.index)
+        found = np.zeros(len(df_clean), dtype=bool)
+        
+        for col_idx in range(df_clean.shape[1] - 1, -1, -1):
+            if found.all():
+                break
+            
+            is_number, numbers = DataProcessor._numeric_cells(df_clean.iloc[:, col_idx])
+            hit = ~found & is_number.to_numpy(dtype=bool, na_value=False)
+            totals[hit] = numbers[hit]
+            found |= hit
+        
+        return totals
+    
+    @staticmethod
+    def _numeric_cells(column):
+        """Return (is_number mask, parsed values) for a single sheet column"""
+        if pd.api.types.is_bool_dtype(column) or pd.api.types.is_float_dtype(column):
+            # str() of a bool or float (e.g. "12.0") is never a plain digit string
+            return pd.Series(False, index=column.index), pd.Series(np.nan, index=column.index)
+        
+        if pd.api.types.is_integer_dtype(column):
+            return column >= 0, column.astype('float64')
+        
+        text = column.astype(str).str.replace(',', '', regex=False).str.strip()
+        is_number = column.notna() & text.str.isdigit()
+        return is_number, pd.to_numeric(text.where(is_number), errors='coerce')
+    
     def calculate_growth_metrics(self):
-        """Calculate YoY and QoQ growth metrics"""
+        """Calculate YoY and QoQ growth metrics from the materialized rollups, kept current across publishes"""
         try:
-            # YoY Growth by Category
-            yoy_query = """
-            WITH yearly_data AS (
-                SELECT 
-                    EXTRACT(YEAR FROM registration_date) as year,
-                    vehicle_category,
-                    SUM(registrations_count) as total_registrations
-                FROM vehicle_registrations 
-                GROUP BY EXTRACT(YEAR FROM registration_date), vehicle_category
-            ),
-            yoy_growth AS (
-                SELECT 
-                    year,
-                    vehicle_category,
-                    total_registrations,
-                    LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year) as prev_year_registrations,
-                    CASE 
-                        WHEN LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year) IS NOT NULL 
-                        THEN ROUND(((total_registrations - LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year)) * 100.0 / 
-                                   LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year)), 2)
-                        ELSE NULL 
-                    END as yoy_growth_percent
-                FROM yearly_data
-            )
-            SELECT * FROM yoy_growth WHERE yoy_growth_percent IS NOT NULL
-            ORDER BY vehicle_category, year;
-            """
-            
-            # QoQ Growth by Category
-            qoq_query = """
-            WITH quarterly_data AS (
-                SELECT 
-                    EXTRACT(YEAR FROM registration_date) as year,
-                    EXTRACT(QUARTER FROM registration_date) as quarter,
-                    vehicle_category,
-                    SUM(registrations_count) as total_registrations
-                FROM vehicle_registrations 
-                GROUP BY EXTRACT(YEAR FROM registration_date), EXTRACT(QUARTER FROM registration_date), vehicle_category
-            ),
-            qoq_growth AS (
-                SELECT 
-                    year,
-                    quarter,
-                    vehicle_category,
-                    total_registrations,
-                    LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year, quarter) as prev_quarter_registrations,
-                    CASE 
-                        WHEN LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year, quarter) IS NOT NULL 
-                        THEN ROUND(((total_registrations - LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year, quarter)) * 100.0 / 
-                                   LAG(total_registrations) OVER (PARTITION BY vehicle_category ORDER BY year, quarter)), 2)
-                        ELSE NULL 
-                    END as qoq_growth_percent
-                FROM quarterly_data
-            )
-            SELECT * FROM qoq_growth WHERE qoq_growth_percent IS NOT NULL
-            ORDER BY vehicle_category, year, quarter;
-            """
-            
-            yoy_data = self.db_manager.fetch_data(yoy_query)
-            qoq_data = self.db_manager.fetch_data(qoq_query)
+            # Independent queries, run at once on separate pooled connections
+            growth = run_concurrently({
+                'yoy': lambda: self.growth_engine.compute('year', 'category'),
+                'qoq': lambda: self.growth_engine.compute('quarter', 'category')
+            })
+            yoy_data = self._growth_report(growth['yoy'], 'prev_year_registrations', 'yoy_growth_percent')
+            qoq_data = self._growth_report(growth['qoq'], 'prev_quarter_registrations', 'qoq_growth_percent')
             
             return yoy_data, qoq_data
             
         except Exception as e:
             logger.error(f"Error calculating growth metrics: {e}")
             return None, None
+    
+    @staticmethod
+    def _growth_report(growth, prev_column, growth_column):
+        """Rows with a defined growth rate, rounded and named as in the growth reports"""
+        growth = growth.rename(columns={'prev_registrations': prev_column, 'growth_percent': growth_column})
+        growth = growth[growth[growth_column].notna()].reset_index(drop=True)
+        growth[growth_column] = growth[growth_column].astype('float64').round(2)
+        return growth
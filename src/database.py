@@ -1,62 +1,238 @@
-import psycopg2
+import threading
+from datetime import date
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
 from src.config import Config
+from src.queries import NATURAL_KEY, FORGET_SOURCE_FILES_QUERY, UpsertQueryBuilder
+from src.backends import MonitoredQueuePool, backend_class
+from src.utils.frame_types import typed_frame, typed_batch
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_engine(database_url=None):
+    """Return the process-wide engine for a database URL, creating its pool on first use"""
+    database_url = database_url or Config.get_database_url()
+    
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = backend_class(database_url).create_engine(database_url)
+            _engines[database_url] = engine
+        return engine
+
 class DatabaseManager:
-    def __init__(self):
+    """Registration storage on whichever backend the database URL names
+    
+    Dialect-specific loading, rollup maintenance and SQL spelling live in
+    the backend (see src/backends); this class keeps the shared logic.
+    """
+    
+    def __init__(self, database_url=None):
         self.config = Config()
-        self.engine = create_engine(self.config.get_database_url())
-        
+        database_url = database_url or self.config.get_database_url()
+        self.engine = get_engine(database_url)
+        self.backend = backend_class(database_url)(self.engine)
+    
+    @property
+    def is_postgres(self):
+        """Whether the configured database supports PostgreSQL-only features like partitions"""
+        return self.backend.name == 'postgresql'
+    
     def get_connection(self):
-        """Get database connection"""
+        """Get a raw DBAPI connection from the shared pool; close() returns it"""
         try:
-            conn = psycopg2.connect(
-                host=self.config.DB_HOST,
-                port=self.config.DB_PORT,
-                database=self.config.DB_NAME,
-                user=self.config.DB_USER,
-                password=self.config.DB_PASSWORD
-            )
-            return conn
+            return self.engine.raw_connection()
         except Exception as e:
             logger.error(f"Database connection error: {e}")
             raise
     
-    def execute_schema(self, schema_file_path):
-        """Execute schema SQL file"""
+    def pool_stats(self):
+        """Connection pool statistics for monitoring"""
+        pool = self.engine.pool
+        stats = {'pool': type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow()
+            })
+        if isinstance(pool, MonitoredQueuePool):
+            stats.update({
+                'waits': pool.waits,
+                'timeouts': pool.timeouts,
+                'wait_seconds': round(pool.wait_seconds, 3)
+            })
+        return stats
+    
+    def execute_schema(self, schema_file_path=None):
+        """Execute a schema SQL file, by default the one for the configured backend"""
         try:
-            with open(schema_file_path, 'r') as file:
-                schema_sql = file.read()
-            
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(schema_sql)
-            conn.commit()
-            cursor.close()
-            conn.close()
+            self.backend.execute_schema(schema_file_path)
             logger.info("Schema executed successfully")
         except Exception as e:
             logger.error(f"Error executing schema: {e}")
             raise
     
-    def insert_dataframe(self, df, table_name, if_exists='append'):
-        """Insert pandas dataframe to database"""
+    def insert_dataframe(self, df, table_name, if_exists='append', batch_size=None):
+        """Insert pandas dataframe to database
+        
+        Each backend uses its fastest bulk path for appends (COPY on PostgreSQL).
+        """
         try:
-            df.to_sql(table_name, self.engine, if_exists=if_exists, index=False)
+            self.backend.insert_dataframe(df, table_name, if_exists=if_exists, batch_size=batch_size)
             logger.info(f"Data inserted successfully into {table_name}")
         except Exception as e:
             logger.error(f"Error inserting data: {e}")
             raise
     
+    def upsert_registrations(self, conn, frames, source_file):
+        """Upsert registration rows on their natural key inside the caller's transaction
+        
+        Rows previously loaded from source_file that are missing from frames are
+        deleted, so a changed file fully replaces its earlier rows. frames may be a
+        dataframe or an iterable of dataframes. Returns the number of rows staged.
+        
+        The caller's transaction must not have touched vehicle_registrations yet:
+        partitions for the staged years are created in their own transactions
+        while the rows are staged.
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        
+        staging_table = 'vehicle_registrations_staging'
+        
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging_table}"))
+        conn.execute(text(UpsertQueryBuilder.create_staging(staging_table)))
+        
+        staged_rows = 0
+        staged_years = set()
+        for frame in frames:
+            if frame.empty:
+                continue
+            frame = frame[NATURAL_KEY + ['registrations_count']]
+            years = set(pd.to_datetime(frame['registration_date']).dt.year.unique().tolist())
+            self.ensure_partitions(years - staged_years)
+            staged_years |= years
+            self.backend.stage_frame(conn, frame, staging_table)
+            staged_rows += len(frame)
+        
+        conn.execute(text(UpsertQueryBuilder.delete_stale(staging_table)), {'source_file': source_file})
+        conn.execute(text(UpsertQueryBuilder.insert(staging_table)), {'source_file': source_file})
+        
+        conn.execute(text(f"DROP TABLE IF EXISTS {staging_table}"))
+        logger.info(f"Upserted {staged_rows} rows from {source_file}")
+        return staged_rows
+    
+    @staticmethod
+    def partition_name(year):
+        """Name of the vehicle_registrations partition holding one calendar year"""
+        return f"vehicle_registrations_y{int(year)}"
+    
+    def ensure_partitions(self, years):
+        """Create the yearly partitions rows of these years will be routed to
+        
+        Commits in its own short transaction, so the ACCESS EXCLUSIVE lock
+        creating a partition takes on vehicle_registrations is never requested
+        by a transaction that already holds a lock on it; a no-op outside
+        PostgreSQL. Returns the partition names covering the years.
+        """
+        if not self.is_postgres or not years:
+            return []
+        
+        with self.engine.begin() as conn:
+            return [
+                conn.execute(text("SELECT ensure_registration_partition(:year)"), {'year': int(year)}).scalar()
+                for year in sorted(years)
+            ]
+    
+    def drop_year(self, year):
+        """Remove every registration in a calendar year and forget the files that loaded it
+        
+        On PostgreSQL the year's partition is dropped instead of deleting rows one
+        by one. Manifest entries for the affected files are removed in the same
+        transaction, so files still in the data folder load again on the next run.
+        Returns the number of source files forgotten.
+        """
+        year = int(year)
+        date_range = {'start': date(year, 1, 1), 'end': date(year + 1, 1, 1)}
+        partition = self.partition_name(year)
+        
+        with self.engine.begin() as conn:
+            # RETURNING rather than rowcount, which DuckDB does not report
+            forgotten = len(conn.execute(text(FORGET_SOURCE_FILES_QUERY), date_range).fetchall())
+            
+            if self.is_postgres and conn.execute(text("SELECT to_regclass(:name)"), {'name': partition}).scalar():
+                conn.execute(text(f"DROP TABLE {partition}"))
+                logger.info(f"Dropped partition {partition}")
+            else:
+                conn.execute(text(
+                    "DELETE FROM vehicle_registrations WHERE registration_date >= :start AND registration_date < :end"
+                ), date_range)
+                logger.info(f"Deleted rows registered in {year}")
+        
+        logger.info(f"Forgot {forgotten} source files for {year}")
+        return forgotten
+    
+    def refresh_rollups(self):
+        """Refresh the rollups the dashboard reads; a no-op where they are plain views"""
+        self.backend.refresh_rollups()
+    
+    def get_data_version(self):
+        """Current data version, or None if it cannot be read"""
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(text("SELECT version FROM data_version WHERE id = 1")).scalar()
+        except Exception as e:
+            logger.warning(f"Could not read data version: {e}")
+            return None
+    
+    @staticmethod
+    def bump_data_version(conn):
+        """Increment the data version inside the caller's transaction"""
+        return conn.execute(text(
+            "UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP "
+            "WHERE id = 1 RETURNING version"
+        )).scalar()
+    
     def fetch_data(self, query, params=None):
         """Fetch data using SQL query"""
         try:
-            return pd.read_sql_query(query, self.engine, params=params)
+            return self.backend.fetch_data(query, params=params)
         except Exception as e:
             logger.error(f"Error fetching data: {e}")
             raise
+    
+    def stream_data(self, query, params=None, chunk_size=None, dtypes=None):
+        """Yield the result of query in dataframes of at most chunk_size rows
+        
+        Only one chunk is held in memory at a time. Every chunk is cast to
+        dtypes (STREAM_DTYPES for the registration columns by default), so
+        chunks can be concatenated, aggregated or exported without drift.
+        """
+        chunk_size = chunk_size or Config.FETCH_CHUNK_SIZE
+        try:
+            for chunk in self.backend.stream_frames(query, params, chunk_size):
+                yield typed_frame(chunk, dtypes)
+        except Exception as e:
+            logger.error(f"Error streaming data: {e}")
+            raise
+    
+    def stream_batches(self, query, params=None, chunk_size=None, schema=None):
+        """Yield the result of query as Arrow record batches with an explicit schema
+        
+        schema defaults to STREAM_ARROW_TYPES for the registration columns and
+        the backend's own type for any other column.
+        """
+        chunk_size = chunk_size or Config.FETCH_CHUNK_SIZE
+        try:
+            for batch in self.backend.stream_batches(query, params, chunk_size):
+                yield typed_batch(batch, schema)
+        except Exception as e:
+            logger.error(f"Error streaming data: {e}")
+            raise
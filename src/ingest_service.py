@@ -0,0 +1,304 @@
+"""
+Continuous ingestion of new and changed Excel files from a watched folder
+"""
+import os
+import queue
+import threading
+import time
+import logging
+from src.config import Config
+from src.data_processor import DataProcessor
+from src.manifest import FileManifest
+from src.utils.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+class FolderWatcher:
+    """Polls a folder and reports .xlsx files once they have stopped changing
+    
+    A file has settled when its size and mtime have not moved for
+    settle_seconds, so files still being copied or saved are not read half
+    written. Each settled version of a file is reported once.
+    """
+    
+    def __init__(self, folder, settle_seconds=None, clock=time.monotonic):
+        self.folder = folder
+        self.settle_seconds = settle_seconds if settle_seconds is not None else Config.INGEST_SETTLE_SECONDS
+        self.clock = clock
+        self._observed = {}
+        self._reported = {}
+        self._missing_logged = False
+    
+    @staticmethod
+    def is_candidate(name):
+        """Excel workbooks, excluding Excel's ~$ lock files and hidden temporary files"""
+        return name.endswith('.xlsx') and not name.startswith(('~$', '.'))
+    
+    def poll(self):
+        """Return the paths that settled since the last poll, longest settled first"""
+        now = self.clock()
+        try:
+            entries = [entry for entry in os.scandir(self.folder) if self.is_candidate(entry.name)]
+            self._missing_logged = False
+        except FileNotFoundError:
+            if not self._missing_logged:
+                logger.warning(f"Watched folder {self.folder} does not exist yet")
+                self._missing_logged = True
+            entries = []
+        
+        present = set()
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            present.add(entry.path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            observed = self._observed.get(entry.path)
+            if observed is None or observed[0] != signature:
+                self._observed[entry.path] = (signature, now)
+        
+        # Deleted files are forgotten, so one put back is reported again
+        for path in set(self._observed) - present:
+            del self._observed[path]
+            self._reported.pop(path, None)
+        
+        settled = []
+        for path, (signature, since) in self._observed.items():
+            if now - since >= self.settle_seconds and self._reported.get(path) != signature:
+                self._reported[path] = signature
+                settled.append((since, path))
+        return [path for _, path in sorted(settled)]
+
+class IngestService:
+    """Loads settled files from a watched folder through DataProcessor
+    
+    A watcher thread puts settled files on a bounded queue and stops polling
+    while the queue is full, so a burst of files waits on disk rather than in
+    memory. Worker threads load one file per transaction and then publish a
+    data version bump, which dashboards pick up on their next version check.
+    A file is never loaded by two workers at once; if it changes while queued
+    or loading, it is loaded again afterwards. A file that fails to load is
+    queued again after retry_seconds, doubling per attempt, up to
+    max_retries times; after that it waits until it changes on disk.
+    """
+    
+    def __init__(self, services, folder, workers=None, queue_size=None, poll_seconds=None, settle_seconds=None,
+                 retry_seconds=None, max_retries=None):
+        self.db_manager = services.db_manager
+        self.data_processor = services.data_processor
+        self.snapshot_store = services.snapshot_store
+        self.workers = workers or Config.INGEST_DAEMON_WORKERS
+        self.poll_seconds = poll_seconds if poll_seconds is not None else Config.INGEST_POLL_SECONDS
+        self.retry_seconds = retry_seconds if retry_seconds is not None else Config.INGEST_RETRY_SECONDS
+        self.max_retries = max_retries if max_retries is not None else Config.INGEST_MAX_RETRIES
+        self.watcher = FolderWatcher(folder, settle_seconds)
+        self.queue = queue.Queue(maxsize=queue_size or Config.INGEST_QUEUE_SIZE)
+        
+        self._stop = threading.Event()
+        self._threads = []
+        self._state_lock = threading.Lock()
+        self._in_flight = set()
+        self._changed_in_flight = set()
+        self._retry = []
+        # Failed files: attempts so far, and when each is next queued
+        self._attempts = {}
+        self._retry_due = {}
+        self._unpublished = 0
+        self._publish_lock = threading.Lock()
+        
+        self.stats = {
+            'loaded_files': 0, 'loaded_rows': 0, 'unchanged_files': 0,
+            'failed_files': 0, 'retried_files': 0, 'published_versions': 0
+        }
+    
+    def start(self):
+        """Start the watcher and worker threads"""
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._watch, name='ingest-watcher')]
+        self._threads += [
+            threading.Thread(target=self._work, name=f'ingest-worker-{number}')
+            for number in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Watching {self.watcher.folder} with {self.workers} workers")
+    
+    def request_stop(self):
+        """Ask every thread to finish its current file and exit; safe to call from a signal handler"""
+        self._stop.set()
+    
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+        logger.info(f"Ingestion stopped: {self.stats}")
+    
+    def run_forever(self):
+        """Run until request_stop(), then wait for in-flight files to finish"""
+        self.start()
+        try:
+            # Short waits keep the main thread responsive to signals
+            while not self._stop.wait(1):
+                pass
+        finally:
+            self.request_stop()
+            self.join()
+    
+    def _watch(self):
+        while not self._stop.is_set():
+            settled = self.watcher.poll()
+            now = time.monotonic()
+            with self._state_lock:
+                retry, self._retry = self._retry, []
+                # A new version of a failed file starts over with a full set of retries
+                for path in settled:
+                    self._attempts.pop(path, None)
+                due = [path for path, at in self._retry_due.items() if at <= now]
+                for path in retry + due + settled:
+                    self._retry_due.pop(path, None)
+            
+            fresh = dict.fromkeys(retry + settled)
+            for path in due:
+                if path in fresh:
+                    continue
+                if not os.path.exists(path):
+                    logger.info(f"Not retrying {os.path.basename(path)}: it was removed")
+                    with self._state_lock:
+                        self._attempts.pop(path, None)
+                    continue
+                self._count('retried_files')
+                self._enqueue(path)
+            for path in fresh:
+                self._enqueue(path)
+            self._stop.wait(self.poll_seconds)
+    
+    def _enqueue(self, path):
+        with self._state_lock:
+            if path in self._in_flight:
+                self._changed_in_flight.add(path)
+                return
+            self._in_flight.add(path)
+        
+        waiting_logged = False
+        while not self._stop.is_set():
+            try:
+                self.queue.put(path, timeout=self.poll_seconds)
+                return
+            except queue.Full:
+                if not waiting_logged:
+                    logger.info(f"Ingest queue full ({self.queue.maxsize} files), waiting before queueing more")
+                    waiting_logged = True
+        
+        with self._state_lock:
+            self._in_flight.discard(path)
+    
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                path = self.queue.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                continue
+            
+            try:
+                rows = self.ingest_file(path)
+            except Exception as e:
+                logger.error(f"Error ingesting {path}: {e}")
+                self._count('failed_files')
+                self._schedule_retry(path)
+                rows = 0
+            else:
+                with self._state_lock:
+                    self._attempts.pop(path, None)
+            
+            try:
+                if rows:
+                    self.publish()
+            except Exception as e:
+                # The load is committed; the next publish covers it
+                logger.error(f"Error publishing after {path}: {e}")
+            finally:
+                with self._state_lock:
+                    self._in_flight.discard(path)
+                    if path in self._changed_in_flight:
+                        # The watcher thread queues it again; workers never block on the queue
+                        self._changed_in_flight.discard(path)
+                        self._retry.append(path)
+                self.queue.task_done()
+    
+    def _schedule_retry(self, path):
+        """Queue a failed file again after an exponential backoff, or give up on this version"""
+        file_name = os.path.basename(path)
+        with self._state_lock:
+            attempts = self._attempts.get(path, 0) + 1
+            if attempts > self.max_retries:
+                self._attempts.pop(path, None)
+            else:
+                self._attempts[path] = attempts
+                delay = self.retry_seconds * 2 ** (attempts - 1)
+                self._retry_due[path] = time.monotonic() + delay
+        
+        if attempts > self.max_retries:
+            logger.error(f"Giving up on {file_name} after {self.max_retries} retries; it loads again once it changes")
+        else:
+            logger.warning(f"Retrying {file_name} in {delay:.1f}s (retry {attempts} of {self.max_retries})")
+    
+    def ingest_file(self, path):
+        """Load one file if the manifest says it is new or changed; returns the rows loaded
+        
+        Raises when the file cannot be parsed or loaded.
+        """
+        file_name = os.path.basename(path)
+        with span('ingest_file', file=file_name) as record:
+            manifest = FileManifest(self.db_manager)
+            manifest.load()
+            entry = manifest.check(path)
+            if entry is None:
+                logger.info(f"Skipping unchanged file {file_name}")
+                self._count('unchanged_files')
+                return 0
+            
+            df = DataProcessor.parse_excel_file(path)
+            if df is None or df.empty:
+                raise ValueError(f"No valid records extracted from {file_name}")
+            
+            rows = self.data_processor.load_file(df, entry)
+            record.rows = rows
+        
+        with self._state_lock:
+            self._unpublished += 1
+        self._count('loaded_files')
+        self._count('loaded_rows', rows)
+        logger.info(f"Loaded {file_name}: {rows} records")
+        return rows
+    
+    def publish(self):
+        """Refresh rollups, bump the data version and rewrite the snapshot for every unpublished load
+        
+        Publishes run one at a time. A load committed while another worker is
+        publishing is covered by the next publish, which always starts after
+        that commit; returns None when an earlier publish already covered it.
+        """
+        with self._publish_lock:
+            with self._state_lock:
+                pending, self._unpublished = self._unpublished, 0
+            if not pending:
+                return None
+            
+            with span('ingest_publish', files=pending):
+                try:
+                    version = self.data_processor.publish_changes()
+                except Exception:
+                    # Still unpublished; the next load's publish retries them
+                    with self._state_lock:
+                        self._unpublished += pending
+                    raise
+                self._count('published_versions')
+                try:
+                    self.snapshot_store.refresh(self.db_manager)
+                except Exception as e:
+                    logger.warning(f"Snapshot refresh failed (dashboards will query the database): {e}")
+            return version
+    
+    def _count(self, name, amount=1):
+        with self._state_lock:
+            self.stats[name] += amount
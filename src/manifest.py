@@ -0,0 +1,79 @@
+"""
+Source file manifest used to make ingestion idempotent
+"""
+import hashlib
+import os
+import logging
+from sqlalchemy import text
+from src.queries import MANIFEST_QUERY
+
+logger = logging.getLogger(__name__)
+
+class FileManifest:
+    """Remembers the size, mtime, content hash and row count of every loaded file"""
+    
+    HASH_CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.entries = {}
+    
+    def load(self):
+        """Load the manifest table into memory"""
+        manifest_df = self.db_manager.fetch_data(MANIFEST_QUERY)
+        self.entries = {row['file_name']: row for row in manifest_df.to_dict('records')}
+        return self.entries
+    
+    @classmethod
+    def hash_file(cls, file_path):
+        """SHA-256 of the file contents, read in fixed-size chunks"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(cls.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def check(self, file_path):
+        """Return a manifest entry for a new or changed file, or None when unchanged
+        
+        A matching size and mtime is trusted without reading the file; otherwise
+        the content hash decides.
+        """
+        file_name = os.path.basename(file_path)
+        stat = os.stat(file_path)
+        previous = self.entries.get(file_name)
+        
+        if previous and previous['file_size'] == stat.st_size and previous['file_mtime'] == stat.st_mtime:
+            return None
+        
+        entry = {
+            'file_name': file_name,
+            'content_hash': self.hash_file(file_path),
+            'file_size': stat.st_size,
+            'file_mtime': stat.st_mtime,
+            'row_count': None
+        }
+        
+        if previous and previous['content_hash'] == entry['content_hash']:
+            # Touched but not modified - refresh the stat so the next run skips hashing
+            entry['row_count'] = previous['row_count']
+            with self.db_manager.engine.begin() as conn:
+                self.record(conn, entry)
+            self.entries[file_name] = entry
+            return None
+        
+        return entry
+    
+    @staticmethod
+    def record(conn, entry):
+        """Insert or update a manifest entry inside the caller's transaction"""
+        conn.execute(text("""
+            INSERT INTO ingest_manifest (file_name, content_hash, file_size, file_mtime, row_count, loaded_at)
+            VALUES (:file_name, :content_hash, :file_size, :file_mtime, :row_count, CURRENT_TIMESTAMP)
+            ON CONFLICT (file_name) DO UPDATE SET
+                content_hash = EXCLUDED.content_hash,
+                file_size = EXCLUDED.file_size,
+                file_mtime = EXCLUDED.file_mtime,
+                row_count = EXCLUDED.row_count,
+                loaded_at = EXCLUDED.loaded_at
+        """), entry)
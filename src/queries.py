@@ -0,0 +1,280 @@
+"""
+SQL shared by the dashboard, the loader and the snapshot cache
+"""
+from datetime import date
+from sqlalchemy import bindparam, text
+
+# Materialized rollups maintained by the loader (see database/schema.sql)
+ROLLUP_VIEWS = [
+    'mv_registrations_daily',
+    'mv_yearly_category',
+    'mv_quarterly_category',
+    'mv_yearly_manufacturer'
+]
+
+# Columns that identify a registration row; loads upsert on this key
+NATURAL_KEY = [
+    'registration_date',
+    'vehicle_category',
+    'manufacturer',
+    'state',
+    'district',
+    'rto_code'
+]
+
+# Manifest the loader compares source files against
+MANIFEST_QUERY = """
+SELECT file_name, content_hash, file_size, file_mtime, row_count FROM ingest_manifest
+"""
+
+# Manifest entries of the files that loaded rows in [:start, :end)
+FORGET_SOURCE_FILES_QUERY = """
+DELETE FROM ingest_manifest
+WHERE file_name IN (
+    SELECT DISTINCT source_file FROM vehicle_registrations
+    WHERE registration_date >= :start AND registration_date < :end
+)
+RETURNING file_name
+"""
+
+# Working set behind every dashboard view
+DASHBOARD_DATA_QUERY = """
+SELECT 
+    registration_date,
+    vehicle_category,
+    manufacturer,
+    state,
+    district,
+    total_registrations
+FROM mv_registrations_daily 
+ORDER BY registration_date DESC
+"""
+
+# Filter options come from the small rollups instead of the working set
+FILTER_YEARS_QUERY = """
+SELECT DISTINCT year FROM mv_yearly_category ORDER BY year
+"""
+
+FILTER_CATEGORIES_QUERY = """
+SELECT DISTINCT vehicle_category FROM mv_yearly_category ORDER BY vehicle_category
+"""
+
+FILTER_MANUFACTURERS_QUERY = """
+SELECT manufacturer, SUM(total_registrations) AS total_registrations
+FROM mv_yearly_manufacturer
+GROUP BY manufacturer
+ORDER BY total_registrations DESC
+"""
+
+def standard_date_part(part, column):
+    """Integer YEAR, QUARTER or MONTH of a date column in standard SQL"""
+    return f"CAST(EXTRACT({part.upper()} FROM {column}) AS INTEGER)"
+
+class RegistrationQueryBuilder:
+    """Turns dashboard filter selections into a parameterized query over the daily rollup"""
+    
+    SELECT_SQL = """
+    SELECT 
+        registration_date,
+        vehicle_category,
+        manufacturer,
+        state,
+        district,
+        total_registrations
+    FROM mv_registrations_daily
+    """
+    
+    @staticmethod
+    def year_ranges(years):
+        """Collapse years into contiguous [first, last] runs"""
+        ranges = []
+        for year in sorted(set(int(year) for year in years)):
+            if ranges and year == ranges[-1][1] + 1:
+                ranges[-1][1] = year
+            else:
+                ranges.append([year, year])
+        return ranges
+    
+    @classmethod
+    def build(cls, years=None, categories=None, manufacturers=None):
+        """Return (statement, params) selecting only the filtered slice
+        
+        Empty or None years means every year, matching the in-memory filter;
+        categories and manufacturers are applied whenever they are given.
+        Years become date-range predicates so the registration_date index
+        can be used instead of evaluating EXTRACT per row.
+        """
+        clauses = []
+        params = {}
+        expanding = []
+        
+        if years:
+            year_clauses = []
+            for i, (first_year, last_year) in enumerate(cls.year_ranges(years)):
+                year_clauses.append(f"(registration_date >= :start_{i} AND registration_date < :end_{i})")
+                params[f"start_{i}"] = date(first_year, 1, 1)
+                params[f"end_{i}"] = date(last_year + 1, 1, 1)
+            clauses.append(f"({' OR '.join(year_clauses)})")
+        
+        if categories is not None:
+            clauses.append("vehicle_category IN :categories")
+            params['categories'] = list(categories)
+            expanding.append('categories')
+        
+        if manufacturers is not None:
+            clauses.append("manufacturer IN :manufacturers")
+            params['manufacturers'] = list(manufacturers)
+            expanding.append('manufacturers')
+        
+        sql = cls.SELECT_SQL.rstrip() + "\n"
+        if clauses:
+            sql += "    WHERE " + "\n      AND ".join(clauses) + "\n"
+        sql += "    ORDER BY registration_date DESC"
+        
+        statement = text(sql).bindparams(*[bindparam(name, expanding=True) for name in expanding])
+        return statement, params
+
+class GrowthQueryBuilder:
+    """Period-over-period growth SQL for any supported grain and dimension"""
+    
+    PERIOD_COLUMNS = {
+        'year': ['year'],
+        'quarter': ['year', 'quarter'],
+        'month': ['year', 'month']
+    }
+    
+    # Whitelisted so dimension names can be interpolated as identifiers
+    DIMENSION_COLUMNS = {
+        'category': 'vehicle_category',
+        'manufacturer': 'manufacturer',
+        'state': 'state'
+    }
+    
+    # Grains already maintained as materialized rollups
+    ROLLUP_SOURCES = {
+        ('year', 'category'): 'mv_yearly_category',
+        ('quarter', 'category'): 'mv_quarterly_category',
+        ('year', 'manufacturer'): 'mv_yearly_manufacturer'
+    }
+    
+    @classmethod
+    def columns(cls, grain, dimension):
+        """Return (period columns, dimension column), rejecting unknown names"""
+        if grain not in cls.PERIOD_COLUMNS:
+            raise ValueError(f"Unsupported growth grain: {grain}")
+        if dimension not in cls.DIMENSION_COLUMNS:
+            raise ValueError(f"Unsupported growth dimension: {dimension}")
+        return cls.PERIOD_COLUMNS[grain], cls.DIMENSION_COLUMNS[dimension]
+    
+    @classmethod
+    def source(cls, grain, dimension, date_part=standard_date_part):
+        """Relation holding one total per period and dimension value
+        
+        date_part(part, column) spells the period expressions in the backend's dialect.
+        """
+        rollup = cls.ROLLUP_SOURCES.get((grain, dimension))
+        if rollup:
+            return rollup
+        
+        period_columns, dimension_column = cls.columns(grain, dimension)
+        period_sql = ",\n            ".join(
+            f"{date_part(column, 'registration_date')} AS {column}" for column in period_columns
+        )
+        group_by = ", ".join(str(i) for i in range(1, len(period_columns) + 2))
+        return f"""(
+        SELECT
+            {period_sql},
+            {dimension_column},
+            SUM(total_registrations) AS total_registrations
+        FROM mv_registrations_daily
+        GROUP BY {group_by}
+    )"""
+    
+    @classmethod
+    def build(cls, grain='year', dimension='category', date_part=standard_date_part):
+        """Growth query evaluating LAG once per row through a named window"""
+        period_columns, dimension_column = cls.columns(grain, dimension)
+        key_sql = ", ".join(period_columns + [dimension_column])
+        order_sql = ", ".join(period_columns)
+        
+        return f"""
+SELECT
+    {key_sql},
+    total_registrations,
+    prev_registrations,
+    (total_registrations * 1.0 / NULLIF(prev_registrations, 0) - 1) * 100 AS growth_percent
+FROM (
+    SELECT
+        {key_sql},
+        total_registrations,
+        LAG(total_registrations) OVER growth_window AS prev_registrations
+    FROM {cls.source(grain, dimension, date_part)} AS totals
+    WINDOW growth_window AS (PARTITION BY {dimension_column} ORDER BY {order_sql})
+) AS growth
+ORDER BY {dimension_column}, {order_sql}
+"""
+
+    @classmethod
+    def totals(cls, grain='year', dimension='category', date_part=standard_date_part):
+        """Statement selecting one total per period and dimension value in the list bound to :years
+        
+        Used to fold freshly loaded years into an existing growth frame.
+        """
+        period_columns, dimension_column = cls.columns(grain, dimension)
+        key_sql = ", ".join(period_columns + [dimension_column])
+        
+        return text(f"""
+SELECT {key_sql}, total_registrations
+FROM {cls.source(grain, dimension, date_part)} AS totals
+WHERE year IN :years
+""").bindparams(bindparam('years', expanding=True))
+
+class UpsertQueryBuilder:
+    """Statements merging a staging table of one source file into vehicle_registrations"""
+    
+    @staticmethod
+    def create_staging(staging_table):
+        """Temporary table for one file's rows, declared without reading vehicle_registrations
+        
+        CREATE TABLE ... AS SELECT FROM vehicle_registrations would hold a lock
+        on the parent table that blocks other loads creating partitions.
+        """
+        return f"""
+CREATE TEMPORARY TABLE {staging_table} (
+    registration_date DATE NOT NULL,
+    vehicle_category VARCHAR NOT NULL,
+    manufacturer VARCHAR NOT NULL,
+    state VARCHAR,
+    district VARCHAR,
+    rto_code VARCHAR,
+    registrations_count INTEGER NOT NULL
+)
+"""
+
+    @staticmethod
+    def delete_stale(staging_table):
+        """Delete rows previously loaded from :source_file that are no longer staged"""
+        match_key = ' AND '.join(f"s.{column} = vehicle_registrations.{column}" for column in NATURAL_KEY)
+        return f"""
+DELETE FROM vehicle_registrations
+WHERE source_file = :source_file
+  AND NOT EXISTS (
+      SELECT 1 FROM {staging_table} s
+      WHERE {match_key}
+  )
+"""
+
+    @staticmethod
+    def insert(staging_table):
+        """Insert staged rows for :source_file, updating counts on natural-key conflicts"""
+        key_columns = ', '.join(NATURAL_KEY)
+        return f"""
+INSERT INTO vehicle_registrations ({key_columns}, registrations_count, source_file)
+SELECT {key_columns}, SUM(registrations_count), :source_file
+FROM {staging_table}
+WHERE 1 = 1
+GROUP BY {key_columns}
+ON CONFLICT ({key_columns}) DO UPDATE SET
+    registrations_count = EXCLUDED.registrations_count,
+    source_file = EXCLUDED.source_file
+"""
@@ -0,0 +1,68 @@
+"""
+Process-wide service container shared by dashboard sessions and loaders
+"""
+import threading
+import logging
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_services = None
+_services_lock = threading.Lock()
+
+class Services:
+    """Database manager, query cache, snapshot store and ETL processor for one process
+    
+    Every member is built the first time it is used and then reused, so all
+    of them share one engine. The ETL stack (DataProcessor, openpyxl) is only
+    imported when data_processor is first touched, which the dashboard never does.
+    """
+    
+    def __init__(self, database_url=None):
+        self.database_url = database_url or Config.get_database_url()
+        self._instances = {}
+        # Re-entrant: building one member may build the ones it depends on
+        self._lock = threading.RLock()
+    
+    def _get(self, name, factory):
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = factory()
+                logger.info(f"Created shared {name}")
+            return self._instances[name]
+    
+    @property
+    def db_manager(self):
+        def build():
+            from src.database import DatabaseManager
+            return DatabaseManager(self.database_url)
+        return self._get('db_manager', build)
+    
+    @property
+    def query_runner(self):
+        def build():
+            from src.cache import CachedQueryRunner
+            return CachedQueryRunner(self.db_manager)
+        return self._get('query_runner', build)
+    
+    @property
+    def snapshot_store(self):
+        def build():
+            from src.snapshot import SnapshotStore
+            return SnapshotStore()
+        return self._get('snapshot_store', build)
+    
+    @property
+    def data_processor(self):
+        def build():
+            from src.data_processor import DataProcessor
+            return DataProcessor(self.db_manager)
+        return self._get('data_processor', build)
+
+def get_services():
+    """The process-wide Services, created on first use"""
+    global _services
+    with _services_lock:
+        if _services is None:
+            _services = Services()
+        return _services
@@ -0,0 +1,79 @@
+"""
+Columnar snapshot of the dashboard working set
+"""
+import os
+import threading
+import logging
+import pyarrow as pa
+from src.config import Config
+from src.queries import DASHBOARD_DATA_QUERY
+from src.utils.frame_types import compact_registrations_frame
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = b'data_version'
+
+class SnapshotStore:
+    """Arrow IPC file holding the dashboard query result, stamped with a data version"""
+    
+    def __init__(self, path=None):
+        self.path = path or Config.SNAPSHOT_PATH
+    
+    def version(self):
+        """Data version the snapshot was written at, or None if there is no snapshot"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with pa.memory_map(self.path) as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+            return int(metadata[VERSION_KEY]) if VERSION_KEY in metadata else None
+        except Exception as e:
+            logger.warning(f"Unreadable snapshot {self.path}: {e}")
+            return None
+    
+    def read(self, data_version):
+        """Return the snapshot as a dataframe if it matches data_version, else None"""
+        if data_version is None or self.version() != data_version:
+            return None
+        
+        with pa.memory_map(self.path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        logger.info(f"Loaded {table.num_rows} rows from snapshot (data version {data_version})")
+        return table.to_pandas()
+    
+    def write(self, df, data_version):
+        """Atomically replace the snapshot with df stamped with data_version"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            VERSION_KEY: str(data_version).encode()
+        })
+        
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # One temp file per writer: the loader and the ingest daemon may write at once
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with pa.OSFile(temp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logger.info(f"Wrote snapshot of {table.num_rows} rows to {self.path} (data version {data_version})")
+    
+    def refresh(self, db_manager):
+        """Rewrite the snapshot from the database unless it is already current"""
+        # Read the version before the data: a concurrent load can only make the
+        # snapshot look stale, never make stale rows look current
+        data_version = db_manager.get_data_version()
+        if data_version is None:
+            return False
+        if self.version() == data_version:
+            logger.info("Snapshot is already current")
+            return False
+        
+        # Categorical columns are stored dictionary-encoded and read back as Categorical
+        self.write(compact_registrations_frame(db_manager.fetch_data(DASHBOARD_DATA_QUERY)), data_version)
+        return True
@@ -2,5 +2,8 @@
 Utilities package for the vehicle dashboard
 """
 from .growth_calculator import GrowthCalculator
+from .frame_types import compact_registrations_frame
+from .aggregations import AggregationCube
+from .growth_engine import GrowthEngine
 
-__all__ = ['GrowthCalculator']
+__all__ = ['GrowthCalculator', 'compact_registrations_frame', 'AggregationCube', 'GrowthEngine']
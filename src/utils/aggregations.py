@@ -0,0 +1,129 @@
+"""
+Shared aggregation cube for one filter state
+"""
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+class AggregationCube:
+    """Registration totals at every grain the dashboard reads, from a single pass over the rows
+    
+    The frame is grouped once by year x category x manufacturer; every other
+    total is rolled up from that small base. Accessors return copies, so a
+    cube can be cached and shared between sections and sessions.
+    """
+    
+    BASE_KEYS = ['year', 'vehicle_category', 'manufacturer']
+    
+    def __init__(self, df):
+        values = df['total_registrations']
+        frame = pd.DataFrame({
+            'year': df['registration_date'].dt.year,
+            'vehicle_category': df['vehicle_category'],
+            'manufacturer': df['manufacturer'],
+            'total': values,
+            'total_sq': values.astype('float64') ** 2
+        })
+        self.base = frame.groupby(self.BASE_KEYS, observed=True).agg(
+            total=('total', 'sum'),
+            total_sq=('total_sq', 'sum'),
+            count=('total', 'size'),
+            min=('total', 'min'),
+            max=('total', 'max')
+        )
+    
+    @property
+    def empty(self):
+        return self.base.empty
+    
+    @property
+    def nbytes(self):
+        """Approximate memory held by the base aggregate"""
+        return int(self.base.memory_usage(index=True, deep=True).sum())
+    
+    @cached_property
+    def total(self):
+        """Sum of total_registrations"""
+        return self.base['total'].sum()
+    
+    @cached_property
+    def row_count(self):
+        """Number of rows in the source frame"""
+        return int(self.base['count'].sum())
+    
+    @property
+    def mean(self):
+        """Mean total_registrations per row"""
+        return self.total / self.row_count if self.row_count else np.nan
+    
+    @property
+    def manufacturer_count(self):
+        return len(self._by_manufacturer)
+    
+    @property
+    def category_count(self):
+        return len(self._by_category)
+    
+    def _rollup(self, levels):
+        return self.base['total'].groupby(level=levels, observed=True).sum()
+    
+    @cached_property
+    def _by_year(self):
+        return self._rollup('year')
+    
+    @cached_property
+    def _by_category(self):
+        return self._rollup('vehicle_category')
+    
+    @cached_property
+    def _by_manufacturer(self):
+        return self._rollup('manufacturer')
+    
+    @cached_property
+    def _by_year_category(self):
+        return self._rollup(['year', 'vehicle_category']).rename('total_registrations').reset_index()
+    
+    @cached_property
+    def _by_year_manufacturer(self):
+        return self._rollup(['year', 'manufacturer']).rename('total_registrations').reset_index()
+    
+    def by_year(self):
+        """Series of totals indexed by year"""
+        return self._by_year.copy()
+    
+    def by_category(self):
+        """Series of totals indexed by vehicle_category"""
+        return self._by_category.copy()
+    
+    def by_manufacturer(self):
+        """Series of totals indexed by manufacturer"""
+        return self._by_manufacturer.copy()
+    
+    def by_year_category(self):
+        """DataFrame of year, vehicle_category, total_registrations"""
+        return self._by_year_category.copy()
+    
+    def by_year_manufacturer(self):
+        """DataFrame of year, manufacturer, total_registrations"""
+        return self._by_year_manufacturer.copy()
+    
+    def top_manufacturers(self, k):
+        """Series of the k largest manufacturer totals, largest first"""
+        return self._by_manufacturer.sort_values(ascending=False).head(k)
+    
+    def category_summary(self):
+        """sum/mean/std/min/max/count of row totals per vehicle_category"""
+        grouped = self.base.groupby(level='vehicle_category', observed=True)
+        summary = pd.DataFrame({
+            'sum': grouped['total'].sum(),
+            'count': grouped['count'].sum(),
+            'min': grouped['min'].min(),
+            'max': grouped['max'].max()
+        })
+        sum_sq = grouped['total_sq'].sum()
+        mean = summary['sum'] / summary['count']
+        # Sample variance from running sums, matching pandas' ddof=1
+        variance = (sum_sq - summary['count'] * mean ** 2) / (summary['count'] - 1)
+        summary['mean'] = mean
+        summary['std'] = np.sqrt(variance.clip(lower=0)).where(summary['count'] > 1)
+        return summary[['sum', 'mean', 'std', 'min', 'max', 'count']]
@@ -0,0 +1,75 @@
+"""
+Thread-pool execution of independent queries and section payloads
+"""
+import threading
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Set inside pool threads, so nested calls run inline instead of waiting on the pool they occupy
+_in_worker = ContextVar('in_concurrency_worker', default=False)
+
+def get_executor():
+    """Process-wide worker pool shared by every session, created on first use
+    
+    It holds CONCURRENT_POOL_SIZE threads, while each run_concurrently call
+    keeps at most CONCURRENT_WORKERS of them busy, so one session's rerun
+    cannot occupy the pool other sessions need.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(Config.CONCURRENT_POOL_SIZE, Config.CONCURRENT_WORKERS),
+                thread_name_prefix='dashboard-worker'
+            )
+        return _executor
+
+def _run_in_worker(task):
+    _in_worker.set(True)
+    return task()
+
+def run_concurrently(tasks):
+    """Run independent callables at once and return their results by name
+    
+    tasks maps names to zero-argument callables. Each runs in a copy of the
+    caller's context, so spans it opens report to the caller's active
+    SpanRecorder. At most CONCURRENT_WORKERS of them run at a time; the rest
+    are submitted as earlier ones finish. Callables must not call Streamlit;
+    render their results on the calling thread. Once every task has
+    finished, the first failure (in task order) is re-raised. With one
+    worker, one task, or when already on a worker thread, tasks run inline
+    in order.
+    """
+    if Config.CONCURRENT_WORKERS <= 1 or len(tasks) <= 1 or _in_worker.get():
+        return {name: task() for name, task in tasks.items()}
+    
+    executor = get_executor()
+    pending = list(tasks.items())
+    futures = {}
+    running = set()
+    while pending or running:
+        while pending and len(running) < Config.CONCURRENT_WORKERS:
+            name, task = pending.pop(0)
+            futures[name] = executor.submit(copy_context().run, _run_in_worker, task)
+            running.add(futures[name])
+        _, running = wait(running, return_when=FIRST_COMPLETED)
+    
+    results = {}
+    error = None
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            logger.error(f"Concurrent task {name} failed: {e}")
+            error = error or e
+    
+    if error is not None:
+        raise error
+    return results
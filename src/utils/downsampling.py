@@ -0,0 +1,75 @@
+"""
+Shape-preserving downsampling for large time series
+"""
+import numpy as np
+import pandas as pd
+
+def lttb_indices(x, y, threshold):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps
+    
+    x must be sorted ascending. The first and last points are always kept,
+    plus the point of each bucket that forms the largest triangle with its
+    neighbours, which preserves peaks and troughs that averaging would flatten.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        
+        # Average of the next bucket (or the last point) is the third vertex
+        if bucket < threshold - 3:
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            next_x = x[next_start:next_end].mean()
+            next_y = y[next_start:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    
+    return selected
+
+def _numeric_axis(values):
+    """Float positions for an x column: numbers, epoch nanoseconds for dates, else row order"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype='float64')
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype='float64')
+    return np.arange(len(values), dtype='float64')
+
+def downsample_frame(data, x, y, threshold, group=None):
+    """Reduce each series in data to at most threshold points with LTTB
+    
+    Rows are sorted by x within each group; groups already under the threshold
+    are kept whole.
+    """
+    if group is None:
+        groups = [data.sort_values(x, kind='stable')]
+    else:
+        groups = [frame.sort_values(x, kind='stable') for _, frame in data.groupby(group, observed=True, sort=False)]
+    
+    kept = []
+    for frame in groups:
+        if len(frame) <= threshold:
+            kept.append(frame)
+            continue
+        indices = lttb_indices(_numeric_axis(frame[x]), frame[y].to_numpy(dtype='float64'), threshold)
+        kept.append(frame.iloc[indices])
+    
+    return pd.concat(kept) if kept else data.iloc[0:0]
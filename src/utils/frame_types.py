@@ -0,0 +1,121 @@
+"""
+Compact in-memory representation of the registrations working set
+"""
+import pandas as pd
+import pyarrow as pa
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fixed order so category codes never change between loads
+VEHICLE_CATEGORIES = ['2W', '3W', '4W']
+
+DIMENSION_COLUMNS = ['vehicle_category', 'manufacturer', 'state', 'district']
+
+INT32_MIN, INT32_MAX = -2**31, 2**31 - 1
+
+# Fixed dtypes for streamed chunks, so every chunk of a result has the same
+# types whatever values it happens to hold (categories would differ per chunk)
+STREAM_DTYPES = {
+    'id': 'int64',
+    'registration_date': 'datetime64[ns]',
+    'vehicle_category': 'string',
+    'manufacturer': 'string',
+    'state': 'string',
+    'district': 'string',
+    'rto_code': 'string',
+    'source_file': 'string',
+    'registrations_count': 'int64',
+    'total_registrations': 'int64',
+    'year': 'int64',
+    'quarter': 'int64',
+    'month': 'int64'
+}
+
+STREAM_ARROW_TYPES = {
+    'id': pa.int64(),
+    'registration_date': pa.date32(),
+    'vehicle_category': pa.string(),
+    'manufacturer': pa.string(),
+    'state': pa.string(),
+    'district': pa.string(),
+    'rto_code': pa.string(),
+    'source_file': pa.string(),
+    'registrations_count': pa.int64(),
+    'total_registrations': pa.int64(),
+    'year': pa.int64(),
+    'quarter': pa.int64(),
+    'month': pa.int64()
+}
+
+def _stable_categories(values, known=None):
+    """Known categories first, then any other values present, sorted"""
+    known = list(known or [])
+    extra = sorted(set(values.dropna().unique()) - set(known))
+    return known + extra
+
+def compact_registrations_frame(df, categories=None):
+    """Return df with Categorical dimensions, datetime64 dates and downcast counts
+    
+    categories optionally maps a column to the categories it should carry
+    (e.g. every filter option), so slices of the data share one dtype.
+    Groupbys over the result should pass observed=True.
+    """
+    if df.empty:
+        return df
+    
+    categories = categories or {}
+    compact = pd.DataFrame(index=df.index)
+    
+    for column in df.columns:
+        values = df[column]
+        
+        if column == 'registration_date':
+            compact[column] = pd.to_datetime(values)
+        elif column in DIMENSION_COLUMNS and not isinstance(values.dtype, pd.CategoricalDtype):
+            known = categories.get(column, VEHICLE_CATEGORIES if column == 'vehicle_category' else None)
+            compact[column] = pd.Categorical(values, categories=_stable_categories(values, known))
+        elif column in ('total_registrations', 'registrations_count'):
+            # SUM() comes back as int64 or Decimal; int32 holds any realistic count,
+            # and going no narrower keeps later sums well clear of overflow
+            counts = values.astype('int64')
+            fits_int32 = counts.between(INT32_MIN, INT32_MAX).all()
+            compact[column] = counts.astype('int32') if fits_int32 else counts
+        else:
+            compact[column] = values
+    
+    return compact
+
+def typed_frame(df, dtypes=None):
+    """Cast the columns of a streamed chunk to dtypes (STREAM_DTYPES by default)"""
+    dtypes = dtypes or STREAM_DTYPES
+    casts = {column: dtype for column, dtype in dtypes.items() if column in df.columns}
+    if 'registration_date' in casts and casts['registration_date'] == 'datetime64[ns]':
+        # Dates arrive as date objects or ISO text depending on the backend
+        df['registration_date'] = pd.to_datetime(df['registration_date'])
+    return df.astype(casts)
+
+def typed_batch(batch, schema=None):
+    """Cast an Arrow record batch to schema (STREAM_ARROW_TYPES for known columns by default)"""
+    if schema is None:
+        schema = pa.schema([
+            pa.field(field.name, STREAM_ARROW_TYPES.get(field.name, field.type))
+            for field in batch.schema
+        ])
+    arrays = [batch.column(field.name).cast(field.type) for field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def frame_footprint(df):
+    """Deep memory usage of a dataframe in bytes"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def log_footprint_report(before, after, label='registrations frame'):
+    """Log memory before/after compaction and return the reduction factor"""
+    before_bytes = frame_footprint(before)
+    after_bytes = frame_footprint(after)
+    factor = before_bytes / after_bytes if after_bytes else 0.0
+    logger.info(
+        f"Compacted {label}: {len(after):,} rows, "
+        f"{before_bytes / 1024 / 1024:.1f} MB -> {after_bytes / 1024 / 1024:.1f} MB ({factor:.1f}x smaller)"
+    )
+    return factor
@@ -1,61 +1,92 @@
 """
 Growth calculation utilities
 """
+import numpy as np
 import pandas as pd
 import logging
+from src.config import Config
+from .aggregations import AggregationCube
+from .growth_engine import GrowthEngine
 
 logger = logging.getLogger(__name__)
 
 class GrowthCalculator:
     
+    VIEWS = ('yoy', 'qoq', 'manufacturer')
+    
+    @staticmethod
+    def calculate_enhanced_growth_metrics(df, cube=None, seasonal_factors=None):
+        """Calculate both YoY and QoQ growth with better data structure
+        
+        Yearly totals come from the shared AggregationCube when one is given.
+        """
+        if cube is None:
+            cube = GrowthCalculator._cube(df)
+        
+        return tuple(
+            GrowthCalculator.calculate_view(view, df, cube, seasonal_factors)
+            for view in GrowthCalculator.VIEWS
+        )
+    
     @staticmethod
-    def calculate_enhanced_growth_metrics(df):
-        """Calculate both YoY and QoQ growth with better data structure"""
+    def calculate_view(view, df, cube=None, seasonal_factors=None):
+        """Calculate a single growth view ('yoy', 'qoq' or 'manufacturer')"""
         try:
-            df = df.copy()
-            df['registration_date'] = pd.to_datetime(df['registration_date'])
-            df['year'] = df['registration_date'].dt.year
-            df['quarter'] = df['registration_date'].dt.quarter
-            df['year_quarter'] = df['year'].astype(str) + '-Q' + df['quarter'].astype(str)
+            if cube is None:
+                cube = GrowthCalculator._cube(df)
             
-            # YoY Growth by Category
-            yearly_data = df.groupby(['year', 'vehicle_category'])['total_registrations'].sum().reset_index()
-            yearly_data = yearly_data.sort_values(['vehicle_category', 'year'])
-            yearly_data['yoy_growth'] = yearly_data.groupby('vehicle_category')['total_registrations'].pct_change() * 100
+            if view == 'yoy':
+                # YoY Growth by Category
+                return GrowthCalculator._growth(cube.by_year_category(), 'year', 'category', 'yoy_growth')
             
-            # QoQ Growth by Category (create synthetic quarterly data from annual)
-            quarterly_data = []
-            for year in df['year'].unique():
-                for quarter in [1, 2, 3, 4]:
-                    year_data = df[df['year'] == year]
-                    if not year_data.empty:
-                        for category in year_data['vehicle_category'].unique():
-                            cat_data = year_data[year_data['vehicle_category'] == category]
-                            # Distribute annual data across quarters (with some variation)
-                            base_value = cat_data['total_registrations'].sum() / 4
-                            # Add some realistic quarterly variation
-                            seasonal_factor = [0.9, 1.1, 1.0, 1.0][quarter-1]  # Q2 typically higher
-                            quarterly_value = base_value * seasonal_factor
-                            
-                            quarterly_data.append({
-                                'year': year,
-                                'quarter': quarter,
-                                'year_quarter': f"{year}-Q{quarter}",
-                                'vehicle_category': category,
-                                'total_registrations': quarterly_value
-                            })
+            if view == 'qoq':
+                # QoQ Growth by Category (create synthetic quarterly data from annual)
+                quarterly_df = GrowthCalculator.expand_quarters(cube.by_year_category(), seasonal_factors)
+                return GrowthCalculator._growth(quarterly_df, 'quarter', 'category', 'qoq_growth')
             
-            quarterly_df = pd.DataFrame(quarterly_data)
-            quarterly_df = quarterly_df.sort_values(['vehicle_category', 'year', 'quarter'])
-            quarterly_df['qoq_growth'] = quarterly_df.groupby('vehicle_category')['total_registrations'].pct_change() * 100
+            if view == 'manufacturer':
+                # Manufacturer/Vehicle Type Growth
+                return GrowthCalculator._growth(cube.by_year_manufacturer(), 'year', 'manufacturer', 'yoy_growth')
             
-            # Manufacturer/Vehicle Type Growth
-            manufacturer_yearly = df.groupby(['year', 'manufacturer'])['total_registrations'].sum().reset_index()
-            manufacturer_yearly = manufacturer_yearly.sort_values(['manufacturer', 'year'])
-            manufacturer_yearly['yoy_growth'] = manufacturer_yearly.groupby('manufacturer')['total_registrations'].pct_change() * 100
-            
-            return yearly_data, quarterly_df, manufacturer_yearly
+            raise ValueError(f"Unknown growth view: {view}")
             
         except Exception as e:
-            logger.error(f"Error calculating growth metrics: {e}")
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+            logger.error(f"Error calculating {view} growth metrics: {e}")
+            return pd.DataFrame()
+    
+    @staticmethod
+    def _cube(df):
+        df = df.copy()
+        df['registration_date'] = pd.to_datetime(df['registration_date'])
+        return AggregationCube(df)
+    
+    @staticmethod
+    def _growth(totals, grain, dimension, growth_column):
+        """GrowthEngine growth over pre-aggregated totals, in the dashboard's column layout"""
+        growth = GrowthEngine.from_totals(totals, grain, dimension)
+        return growth.drop(columns='prev_registrations').rename(columns={'growth_percent': growth_column})
+    
+    @staticmethod
+    def expand_quarters(yearly_data, seasonal_factors=None):
+        """Spread each year/category total across four quarters by seasonal factor
+        
+        One row per input row and quarter, built by broadcasting the yearly totals
+        against the factor array rather than filtering per quarter.
+        """
+        factors = np.asarray(Config.QUARTERLY_SEASONAL_FACTORS if seasonal_factors is None else seasonal_factors, dtype='float64')
+        if factors.shape != (4,):
+            raise ValueError(f"Expected 4 seasonal factors, got {factors.size}")
+        
+        quarters = np.arange(1, 5)
+        base_values = yearly_data['total_registrations'].to_numpy() / 4
+        years = pd.Series(np.repeat(yearly_data['year'].to_numpy(), 4))
+        quarter_column = pd.Series(np.tile(quarters, len(yearly_data)))
+        
+        return pd.DataFrame({
+            'year': years,
+            'quarter': quarter_column,
+            'year_quarter': years.astype(str) + '-Q' + quarter_column.astype(str),
+            'vehicle_category': np.repeat(yearly_data['vehicle_category'], 4).to_numpy(),
+            # Q2 is typically higher with the default factors
+            'total_registrations': (base_values[:, None] * factors).ravel()
+        })
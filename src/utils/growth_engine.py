@@ -0,0 +1,191 @@
+"""
+Period-over-period growth over any grain and dimension
+"""
+import threading
+import numpy as np
+import pandas as pd
+import logging
+from src.config import Config
+from src.queries import GrowthQueryBuilder
+
+logger = logging.getLogger(__name__)
+
+class GrowthEngine:
+    """One growth API with a SQL push-down path and an in-memory path
+    
+    Frames the caller already holds are computed in memory, unless the
+    database is remote and the frame is large; otherwise the growth query
+    runs in the database against the rollups, so only one row per period
+    and dimension value crosses the wire. Growth read from the database is
+    kept with the data version it was read at, brought up to date by
+    apply_changes() after this process publishes a load, and read again
+    when another process has published one.
+    """
+    
+    GROWTH_COLUMNS = ['total_registrations', 'prev_registrations', 'growth_percent']
+    
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager
+        self._maintained = {}
+        self._lock = threading.Lock()
+    
+    def compute(self, grain='year', dimension='category', df=None):
+        """Growth per period and dimension value
+        
+        df, when given, must hold every registration row (not a filtered
+        slice), since the push-down path reads the whole table.
+        """
+        if df is not None and not self.prefers_database(len(df)):
+            return self.from_frame(df, grain, dimension)
+        
+        if self.db_manager is None:
+            raise ValueError("GrowthEngine needs a dataframe or a database manager")
+        
+        key = (grain, dimension)
+        # Read before the growth, so a publish in between only costs a re-read
+        data_version = self.db_manager.get_data_version()
+        with self._lock:
+            version, growth = self._maintained.get(key, (None, None))
+        if growth is None or data_version is None or version != data_version:
+            growth = self.from_database(grain, dimension)
+            if data_version is not None:
+                with self._lock:
+                    self._maintained[key] = (data_version, growth)
+        return growth.copy()
+    
+    def prefers_database(self, rows):
+        """Whether a remote database computes growth over rows faster than pandas would"""
+        return (
+            self.db_manager is not None
+            and self.db_manager.backend.remote
+            and rows > Config.GROWTH_PUSHDOWN_ROWS
+        )
+    
+    def apply_changes(self, years, data_version):
+        """Fold the years a load changed into every growth frame read from the database
+        
+        Call after the rollups are refreshed, with the data version the load
+        was published as. Only the changed years' totals are read back, and
+        only into frames read at the version just before it; any other frame
+        (another process published in between) or one that cannot be updated
+        is dropped and read in full on its next compute().
+        """
+        years = sorted(int(year) for year in years)
+        with self._lock:
+            keys = list(self._maintained)
+        
+        for grain, dimension in keys:
+            try:
+                with self._lock:
+                    version, growth = self._maintained[(grain, dimension)]
+                if version != data_version - 1:
+                    with self._lock:
+                        self._maintained.pop((grain, dimension), None)
+                    continue
+                if years:
+                    statement = GrowthQueryBuilder.totals(grain, dimension, self.db_manager.backend.date_part)
+                    new_totals = self.db_manager.fetch_data(statement, params={'years': years})
+                    growth = self.update(growth, new_totals, grain, dimension, complete_years=years)
+                with self._lock:
+                    self._maintained[(grain, dimension)] = (data_version, growth)
+            except Exception as e:
+                logger.warning(f"Could not update {grain}/{dimension} growth incrementally, dropping it: {e}")
+                with self._lock:
+                    self._maintained.pop((grain, dimension), None)
+    
+    def invalidate(self):
+        """Forget every growth frame read from the database"""
+        with self._lock:
+            self._maintained.clear()
+    
+    def from_database(self, grain='year', dimension='category'):
+        """Run the growth query in the database"""
+        period_columns, dimension_column = GrowthQueryBuilder.columns(grain, dimension)
+        growth = self.db_manager.fetch_data(GrowthQueryBuilder.build(grain, dimension, self.db_manager.backend.date_part))
+        return growth[period_columns + [dimension_column] + self.GROWTH_COLUMNS]
+    
+    @classmethod
+    def from_frame(cls, df, grain='year', dimension='category'):
+        """Aggregate registration rows to the grain, then compute growth in memory"""
+        return cls.from_totals(cls.period_totals(df, grain, dimension), grain, dimension)
+    
+    @staticmethod
+    def period_totals(df, grain='year', dimension='category'):
+        """One total per period and dimension value from registration rows"""
+        period_columns, dimension_column = GrowthQueryBuilder.columns(grain, dimension)
+        dates = pd.to_datetime(df['registration_date'])
+        keys = {column: getattr(dates.dt, column) for column in period_columns}
+        keys[dimension_column] = df[dimension_column]
+        
+        frame = pd.DataFrame(keys)
+        frame['total_registrations'] = df['total_registrations']
+        return frame.groupby(period_columns + [dimension_column], observed=True)['total_registrations'].sum().reset_index()
+    
+    @staticmethod
+    def from_totals(totals, grain='year', dimension='category'):
+        """Growth from a frame already holding one total per period and dimension value"""
+        period_columns, dimension_column = GrowthQueryBuilder.columns(grain, dimension)
+        growth = totals.sort_values([dimension_column] + period_columns, ignore_index=True)
+        
+        previous = growth.groupby(dimension_column, observed=True)['total_registrations'].shift(1)
+        growth['prev_registrations'] = previous
+        # Same arithmetic as pct_change, with a zero base treated as undefined like NULLIF in SQL
+        growth['growth_percent'] = (growth['total_registrations'] / previous.where(previous != 0) - 1) * 100
+        return growth
+    
+    @staticmethod
+    def period_ordinal(frame, grain='year'):
+        """Sortable integer per period, e.g. year * 4 + quarter"""
+        ordinal = frame['year'].to_numpy().astype('int64')
+        if grain == 'quarter':
+            ordinal = ordinal * 4 + frame['quarter'].to_numpy()
+        elif grain == 'month':
+            ordinal = ordinal * 12 + frame['month'].to_numpy()
+        return ordinal
+    
+    @classmethod
+    def update(cls, growth, new_totals, grain='year', dimension='category', complete_years=None):
+        """Fold freshly loaded totals into an existing growth frame
+        
+        Each row of new_totals replaces the total for its (period, dimension
+        value); other dimension values of the same period are kept, so
+        new_totals may cover only the category one file loaded. When
+        complete_years is given, new_totals holds every total for those years
+        and values missing from it are removed. Only rows from the earliest
+        changed period onward are recomputed, seeded with the last earlier
+        total of each dimension value.
+        """
+        period_columns, dimension_column = GrowthQueryBuilder.columns(grain, dimension)
+        complete_years = list(complete_years or [])
+        if new_totals.empty and not complete_years:
+            return growth
+        if growth.empty:
+            return cls.from_totals(new_totals, grain, dimension)
+        
+        growth_ordinal = cls.period_ordinal(growth, grain)
+        new_ordinals = cls.period_ordinal(new_totals, grain)
+        new_keys = pd.MultiIndex.from_arrays([new_ordinals, new_totals[dimension_column].astype(str).to_numpy()])
+        replaced = pd.MultiIndex.from_arrays([growth_ordinal, growth[dimension_column].astype(str).to_numpy()]).isin(new_keys)
+        replaced |= growth['year'].isin(complete_years).to_numpy()
+        
+        changed_ordinals = np.concatenate([new_ordinals, growth_ordinal[replaced]])
+        if not len(changed_ordinals):
+            return growth
+        start = changed_ordinals.min()
+        
+        history = growth[growth_ordinal < start]
+        # Later rows not being replaced still need their previous total re-read
+        tail = growth[(growth_ordinal >= start) & ~replaced]
+        seeds = history.groupby(dimension_column, observed=True).tail(1)
+        
+        columns = period_columns + [dimension_column, 'total_registrations']
+        recompute = pd.concat([seeds[columns], tail[columns], new_totals[columns]], ignore_index=True)
+        seed_count = len(seeds)
+        recompute['_seed'] = np.arange(len(recompute)) < seed_count
+        
+        updated = cls.from_totals(recompute, grain, dimension)
+        updated = updated[~updated['_seed']].drop(columns='_seed')
+        
+        logger.info(f"Updated {grain}/{dimension} growth incrementally: {len(updated)} of {len(history) + len(updated)} rows recomputed")
+        combined = pd.concat([history, updated], ignore_index=True)
+        return combined.sort_values([dimension_column] + period_columns, ignore_index=True)
@@ -0,0 +1,167 @@
+"""
+Timing spans for dashboard reruns
+"""
+import os
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_active_recorder = ContextVar('active_span_recorder', default=None)
+
+def current_rss_bytes():
+    """Resident set size of this process, or peak RSS where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        # ru_maxrss is kilobytes on Linux and bytes on macOS; only deltas are reported
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class Span:
+    """Wall time, rows processed and memory delta of one named step"""
+    
+    def __init__(self, name, rows=None, **attributes):
+        self.name = name
+        self.rows = rows
+        self.attributes = attributes
+        self.seconds = None
+        self.memory_delta_bytes = None
+    
+    def as_dict(self):
+        return {
+            'span': self.name,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'memory_delta_bytes': self.memory_delta_bytes,
+            **self.attributes
+        }
+    
+    def log_line(self):
+        """logfmt-style key=value pairs"""
+        fields = [f"span={self.name}", f"seconds={self.seconds:.4f}"]
+        if self.rows is not None:
+            fields.append(f"rows={self.rows}")
+        fields.append(f"memory_delta_bytes={self.memory_delta_bytes}")
+        fields.extend(f"{key}={value}" for key, value in self.attributes.items())
+        return " ".join(fields)
+
+class SpanMetrics:
+    """Process-wide span totals, exported in the Prometheus text format"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+    
+    def observe(self, span):
+        with self._lock:
+            # A section's compute and render spans share its name; phase keeps them apart
+            key = (span.name, span.attributes.get('phase'))
+            totals = self._totals.setdefault(key, {'count': 0, 'seconds': 0.0, 'rows': 0})
+            totals['count'] += 1
+            totals['seconds'] += span.seconds
+            totals['rows'] += span.rows or 0
+            totals['last_seconds'] = span.seconds
+            totals['last_memory_delta_bytes'] = span.memory_delta_bytes
+    
+    def render(self):
+        with self._lock:
+            totals = {key: dict(values) for key, values in self._totals.items()}
+        
+        metrics = [
+            ('dashboard_span_count_total', 'counter', 'Completed spans', 'count'),
+            ('dashboard_span_seconds_total', 'counter', 'Wall time spent in each span', 'seconds'),
+            ('dashboard_span_rows_total', 'counter', 'Rows processed in each span', 'rows'),
+            ('dashboard_span_last_seconds', 'gauge', 'Wall time of the latest span', 'last_seconds'),
+            ('dashboard_span_last_memory_delta_bytes', 'gauge', 'RSS change over the latest span', 'last_memory_delta_bytes')
+        ]
+        
+        lines = []
+        for metric, metric_type, description, field in metrics:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for name, phase in sorted(totals, key=lambda key: (key[0], key[1] or '')):
+                labels = f'span="{name}"' if phase is None else f'span="{name}",phase="{phase}"'
+                lines.append(f'{metric}{{{labels}}} {totals[name, phase][field]}')
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path):
+        """Atomically replace path, so a scraper never reads a partial file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(self.render())
+        os.replace(temp_path, path)
+
+metrics = SpanMetrics()
+
+class SpanRecorder:
+    """Collects the spans of one dashboard rerun"""
+    
+    def __init__(self):
+        self.spans = []
+        self.wall_seconds = 0.0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def activate(self):
+        """Make this the recorder that span() reports to in the current context
+        
+        wall_seconds accumulates the elapsed time spent inside the block.
+        """
+        token = _active_recorder.set(self)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.wall_seconds += time.perf_counter() - start
+            _active_recorder.reset(token)
+    
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+    
+    def to_frame(self):
+        """One row per span in completion order"""
+        with self._lock:
+            return pd.DataFrame([span.as_dict() for span in self.spans])
+    
+    def export(self, metrics_path=None):
+        """Write the process-wide metrics file when a path is configured"""
+        if not metrics_path:
+            return
+        try:
+            metrics.write(metrics_path)
+        except OSError as e:
+            logger.warning(f"Could not write span metrics to {metrics_path}: {e}")
+
+@contextmanager
+def span(name, rows=None, **attributes):
+    """Time a block; set .rows on the yielded span when the row count is known inside it"""
+    record = Span(name, rows, **attributes)
+    start_rss = current_rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+        record.memory_delta_bytes = current_rss_bytes() - start_rss
+        
+        recorder = _active_recorder.get()
+        if recorder is not None:
+            recorder.add(record)
+        metrics.observe(record)
+        logger.info(record.log_line())
@@ -0,0 +1,68 @@
+"""
+CachedQueryRunner keys and hit accounting
+"""
+import time
+from datetime import date
+import numpy as np
+import pandas as pd
+from src.cache import CachedQueryRunner, QueryCache
+from src.queries import RegistrationQueryBuilder
+
+class CountingDatabase:
+    """Stands in for DatabaseManager, counting the queries that reach it"""
+    
+    def __init__(self):
+        self.queries = 0
+    
+    def get_data_version(self):
+        return 1
+    
+    def fetch_data(self, query, params=None):
+        self.queries += 1
+        return pd.DataFrame({'registration_date': [date(2024, 6, 15)], 'total_registrations': [10]})
+
+def test_identical_filter_queries_hit_the_cache():
+    db = CountingDatabase()
+    runner = CachedQueryRunner(db, QueryCache(max_bytes=1 << 20, max_entries=8, ttl_seconds=60))
+    
+    for _ in range(3):
+        # A fresh statement object per call, as on every dashboard rerun
+        statement, params = RegistrationQueryBuilder.build([2023, 2024], ['2W', '4W'], ['Hero Model 01'])
+        runner.fetch_data(statement, params=params)
+    
+    assert db.queries == 1
+    assert runner.cache.stats()['hits'] == 2
+    assert runner.cache.stats()['entries'] == 1
+
+def test_different_filters_are_cached_separately():
+    db = CountingDatabase()
+    runner = CachedQueryRunner(db, QueryCache(max_bytes=1 << 20, max_entries=8, ttl_seconds=60))
+    
+    for years in ([2023], [2024], [2023]):
+        statement, params = RegistrationQueryBuilder.build(years, ['2W'], ['Hero Model 01'])
+        runner.fetch_data(statement, params=params)
+    
+    assert db.queries == 2
+    assert runner.cache.stats()['hits'] == 1
+
+def test_figures_are_sized_by_their_trace_data():
+    import plotly.graph_objects as go
+    
+    points = np.arange(50000, dtype='float64')
+    figure = go.Figure(go.Scatter(x=points, y=points))
+    assert QueryCache.estimate_bytes(figure) >= 2 * points.nbytes
+    
+    # The byte budget holds one such figure at a time
+    cache = QueryCache(max_bytes=3 * points.nbytes, max_entries=8, ttl_seconds=60)
+    cache.put('first', figure)
+    cache.put('second', go.Figure(figure))
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['evictions'] == 1
+
+def test_zero_ttl_is_kept_rather_than_replaced_by_the_default():
+    cache = QueryCache(ttl_seconds=0)
+    assert cache.ttl_seconds == 0
+    
+    cache.put('key', 1)
+    time.sleep(0.01)
+    assert cache.get('key') == (False, None)
@@ -0,0 +1,77 @@
+"""
+run_concurrently's per-call bound on the shared worker pool
+"""
+import threading
+import time
+import pytest
+from src.config import Config
+from src.utils import concurrency
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A fresh shared pool of 8 threads with 2 workers per call"""
+    monkeypatch.setattr(Config, 'CONCURRENT_WORKERS', 2)
+    monkeypatch.setattr(Config, 'CONCURRENT_POOL_SIZE', 8)
+    monkeypatch.setattr(concurrency, '_executor', None)
+    yield
+    concurrency.get_executor().shutdown(wait=True)
+
+def meeting_tasks(count, barrier, tracker):
+    """Tasks that each wait at barrier, so they only finish if barrier.parties of them run at once"""
+    def task(number):
+        with tracker['lock']:
+            tracker['running'] += 1
+            tracker['peak'] = max(tracker['peak'], tracker['running'])
+        try:
+            barrier.wait(timeout=5)
+        finally:
+            with tracker['lock']:
+                tracker['running'] -= 1
+        return number
+    return {f"task_{number}": (lambda number=number: task(number)) for number in range(count)}
+
+def new_tracker():
+    return {'lock': threading.Lock(), 'running': 0, 'peak': 0}
+
+def test_one_call_uses_at_most_concurrent_workers_threads(pool):
+    tracker = new_tracker()
+    # Tasks meet in pairs: a third running task would still pass, but show in peak
+    results = concurrency.run_concurrently(meeting_tasks(6, threading.Barrier(2), tracker))
+    
+    assert results == {f"task_{number}": number for number in range(6)}
+    assert tracker['peak'] == 2
+
+def test_sessions_do_not_queue_behind_each_other(pool):
+    # Every task of four sessions must be running at once to pass the barrier
+    barrier = threading.Barrier(8)
+    trackers = [new_tracker() for _ in range(4)]
+    errors = []
+    
+    def session(tracker):
+        try:
+            concurrency.run_concurrently(meeting_tasks(2, barrier, tracker))
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=session, args=(tracker,)) for tracker in trackers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert all(tracker['peak'] == 2 for tracker in trackers)
+
+def test_first_failure_is_raised_after_every_task_finishes(pool):
+    finished = []
+    
+    def fail():
+        raise ValueError("first")
+    
+    def succeed():
+        time.sleep(0.05)
+        finished.append(True)
+    
+    with pytest.raises(ValueError, match="first"):
+        concurrency.run_concurrently({'fail': fail, 'slow': succeed, 'also_slow': succeed})
+    assert len(finished) == 2
@@ -0,0 +1,38 @@
+"""
+DataProcessor's vectorized transform against the row loop it replaced
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.reference import clean_and_transform_rows, wide_vahan_sheet
+from src.data_processor import DataProcessor
+
+def header_rows(columns):
+    return [[f"Header {i}"] + [None] * (columns - 1) for i in range(DataProcessor.DATA_START_ROW)]
+
+FIXTURE_SHEETS = {
+    'wide_state_sheet': lambda: wide_vahan_sheet(2000, columns=40, seed=1),
+    'narrow_sheet': lambda: wide_vahan_sheet(500, columns=3, seed=2),
+    'integer_columns': lambda: pd.DataFrame(np.arange(60).reshape(20, 3)),
+    'float_totals': lambda: pd.DataFrame(header_rows(3) + [[i, f"Type {i}", float(i * 10)] for i in range(1, 10)]),
+    'bool_and_negative_cells': lambda: pd.DataFrame(header_rows(4) + [
+        [1, 'Scooter', 120, True],
+        [2, 'Moped', '-40', None],
+        [3, 'Tractor', '1,250', '-3'],
+        [4, 'Trailer', 0, None],
+        [' 5 ', 'e-rickshaw', None, ' 7,000 ']
+    ]),
+    'no_valid_rows': lambda: pd.DataFrame(header_rows(3) + [['Total', 'All', '10'], [None, None, None]]),
+    'single_column': lambda: pd.DataFrame(header_rows(1) + [[1], [2]])
+}
+
+@pytest.mark.parametrize('name', sorted(FIXTURE_SHEETS))
+def test_vectorized_transform_matches_row_loop(name):
+    sheet = FIXTURE_SHEETS[name]()
+    expected = clean_and_transform_rows(sheet.copy(), '2W', '2024')
+    result = DataProcessor.clean_and_transform_data(sheet.copy(), '2W', '2024', f"{name}.xlsx")
+    
+    if expected is None:
+        assert result is None
+    else:
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
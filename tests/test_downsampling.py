@@ -0,0 +1,55 @@
+"""
+LTTB downsampling of large chart series
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.downsampling import downsample_frame, lttb_indices
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype='float64'), rng.normal(size=n).cumsum()
+
+@pytest.mark.parametrize('n,threshold', [(1000, 100), (1000, 3), (101, 100), (5000, 997)])
+def test_indices_keep_the_ends_and_exactly_threshold_points_in_order(n, threshold):
+    x, y = random_walk(n)
+    indices = lttb_indices(x, y, threshold)
+    
+    assert len(indices) == threshold
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert (np.diff(indices) > 0).all()
+
+@pytest.mark.parametrize('threshold', [1000, 5000, 2, 0])
+def test_indices_keep_every_point_at_or_above_the_length_or_below_three(threshold):
+    x, y = random_walk(1000)
+    np.testing.assert_array_equal(lttb_indices(x, y, threshold), np.arange(1000))
+
+def test_indices_keep_an_isolated_spike():
+    x = np.arange(1000, dtype='float64')
+    y = np.zeros(1000)
+    y[537] = 100.0
+    assert 537 in lttb_indices(x, y, 50)
+
+def daily_frame(days, categories=('2W', '3W')):
+    dates = pd.date_range('2024-01-01', periods=days, freq='D')
+    _, y = random_walk(days * len(categories))
+    return pd.DataFrame({
+        'registration_date': np.tile(dates, len(categories)),
+        'vehicle_category': np.repeat(categories, days),
+        'total_registrations': y
+    })
+
+def test_frame_is_reduced_per_group_keeping_each_series_ends():
+    data = daily_frame(1000)
+    result = downsample_frame(data, 'registration_date', 'total_registrations', 100, group='vehicle_category')
+    
+    assert result.groupby('vehicle_category').size().to_dict() == {'2W': 100, '3W': 100}
+    for _, series in result.groupby('vehicle_category'):
+        assert series['registration_date'].iloc[0] == data['registration_date'].min()
+        assert series['registration_date'].iloc[-1] == data['registration_date'].max()
+        assert series['registration_date'].is_monotonic_increasing
+
+@pytest.mark.parametrize('threshold', [1000, 1500, 2, 0])
+def test_frame_comes_back_unchanged_at_or_above_the_length_or_below_three(threshold):
+    data = daily_frame(1000, categories=('2W',))
+    pd.testing.assert_frame_equal(downsample_frame(data, 'registration_date', 'total_registrations', threshold), data)
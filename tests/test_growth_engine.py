@@ -0,0 +1,98 @@
+"""
+GrowthEngine's incremental updates and their maintenance on publish
+"""
+import shutil
+import tempfile
+import pandas as pd
+import pytest
+from benchmarks import synthetic
+from benchmarks.standin import create_standin_database
+from src.data_processor import DataProcessor, RECORD_COLUMNS
+from src.database import DatabaseManager
+from src.utils.growth_engine import GrowthEngine
+
+def quarterly_totals(rows):
+    """(year, quarter, vehicle_category, total) rows as a totals frame"""
+    return pd.DataFrame(rows, columns=['year', 'quarter', 'vehicle_category', 'total_registrations'])
+
+BASE = quarterly_totals([
+    (2023, quarter, category, 100 * quarter + offset)
+    for quarter in range(1, 5)
+    for category, offset in (('2W', 0), ('3W', 7), ('4W', 13))
+] + [(2024, 1, '2W', 500), (2024, 1, '3W', 60), (2024, 1, '4W', 90)])
+
+def assert_same_growth(result, expected):
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
+
+def test_update_for_one_category_keeps_other_categories_of_the_period():
+    growth = GrowthEngine.from_totals(BASE, 'quarter', 'category')
+    # One file's worth: a single category of an existing and a new period
+    new_totals = quarterly_totals([(2024, 1, '3W', 75), (2024, 2, '3W', 80)])
+    
+    expected_totals = pd.concat([BASE[~((BASE['year'] == 2024) & (BASE['vehicle_category'] == '3W'))], new_totals])
+    expected = GrowthEngine.from_totals(expected_totals, 'quarter', 'category')
+    
+    assert_same_growth(GrowthEngine.update(growth, new_totals, 'quarter', 'category'), expected)
+
+def test_update_with_complete_years_removes_missing_values():
+    growth = GrowthEngine.from_totals(BASE, 'quarter', 'category')
+    # Every 2024 total after a reload that no longer has any 4W rows
+    new_totals = quarterly_totals([(2024, 1, '2W', 510), (2024, 1, '3W', 60)])
+    
+    expected = GrowthEngine.from_totals(pd.concat([BASE[BASE['year'] < 2024], new_totals]), 'quarter', 'category')
+    
+    assert_same_growth(GrowthEngine.update(growth, new_totals, 'quarter', 'category', complete_years=[2024]), expected)
+
+@pytest.fixture
+def processor():
+    workdir = tempfile.mkdtemp(prefix='vehicle_dashboard_growth_test_')
+    db_manager = DatabaseManager(create_standin_database(workdir, 'sqlite'))
+    db_manager.insert_dataframe(synthetic.generate_registrations(5000, seed=5, start_year=2022, years=3), 'vehicle_registrations')
+    try:
+        yield DataProcessor(db_manager)
+    finally:
+        db_manager.engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def file_frame(year, category, manufacturers):
+    return pd.DataFrame([
+        (f"{year}-06-15", category, manufacturer, 'ALL INDIA', 'ALL DISTRICTS', 'ALL_RTO', count)
+        for manufacturer, count in manufacturers.items()
+    ], columns=RECORD_COLUMNS)
+
+def manifest_entry(file_name):
+    return {'file_name': file_name, 'content_hash': file_name, 'file_size': 1, 'file_mtime': 0.0, 'row_count': None}
+
+@pytest.mark.parametrize('grain,dimension', [('year', 'category'), ('quarter', 'category'), ('month', 'manufacturer')])
+def test_publish_updates_maintained_growth_incrementally(processor, grain, dimension):
+    engine = processor.growth_engine
+    engine.compute(grain, dimension)
+    
+    # One category of an existing year, then a year the database has not seen
+    processor.load_file(file_frame(2023, '3W', {'Hero Model 01': 400, 'Bajaj Model 02': 25}), manifest_entry('2023_3W.xlsx'))
+    processor.publish_changes()
+    processor.load_file(file_frame(2025, '2W', {'Hero Model 01': 900}), manifest_entry('2025_2W.xlsx'))
+    processor.publish_changes()
+    
+    assert_same_growth(engine.compute(grain, dimension), engine.from_database(grain, dimension))
+
+def test_growth_read_by_another_process_follows_the_data_version(processor):
+    # A dashboard server's engine: same database, but it never runs publish_changes itself
+    other = GrowthEngine(processor.db_manager)
+    before = other.compute('year', 'category')
+    
+    processor.load_file(file_frame(2025, '2W', {'Hero Model 01': 900}), manifest_entry('2025_2W.xlsx'))
+    processor.publish_changes()
+    
+    after = other.compute('year', 'category')
+    assert 2025 not in set(before['year'])
+    assert_same_growth(after, other.from_database('year', 'category'))
+    assert 2025 in set(after['year'])
+
+def test_large_frames_are_pushed_down_only_to_remote_databases(processor, monkeypatch):
+    monkeypatch.setattr('src.config.Config.GROWTH_PUSHDOWN_ROWS', 10)
+    assert not processor.growth_engine.prefers_database(1000)
+    
+    monkeypatch.setattr(type(processor.db_manager.backend), 'remote', True)
+    assert processor.growth_engine.prefers_database(1000)
+    assert not processor.growth_engine.prefers_database(5)
@@ -0,0 +1,86 @@
+"""
+IngestService retries of files that fail to load
+"""
+import os
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+import pytest
+from benchmarks import synthetic
+from benchmarks.standin import create_standin_database
+from src.data_processor import DataProcessor
+from src.database import DatabaseManager
+from src.ingest_service import IngestService
+from src.snapshot import SnapshotStore
+
+class FlakyProcessor(DataProcessor):
+    """Fails its first `failures` loads, like a transient database error"""
+    
+    def __init__(self, db_manager, failures):
+        super().__init__(db_manager)
+        self.failures = failures
+        self.attempts = 0
+    
+    def load_file(self, frames, manifest_entry):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise RuntimeError("could not serialize access")
+        return super().load_file(frames, manifest_entry)
+
+@pytest.fixture
+def workdir():
+    path = tempfile.mkdtemp(prefix='vehicle_dashboard_ingest_test_')
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+def start_service(workdir, failures, max_retries):
+    db_manager = DatabaseManager(create_standin_database(workdir, 'sqlite'))
+    services = SimpleNamespace(
+        db_manager=db_manager,
+        data_processor=FlakyProcessor(db_manager, failures),
+        snapshot_store=SnapshotStore(os.path.join(workdir, 'snapshot.arrow'))
+    )
+    folder = os.path.join(workdir, 'raw')
+    os.makedirs(folder)
+    service = IngestService(
+        services, folder, workers=2, poll_seconds=0.02, settle_seconds=0.05,
+        retry_seconds=0.05, max_retries=max_retries
+    )
+    synthetic.write_vahan_workbook(os.path.join(folder, '2024_2W.xlsx'), 50)
+    service.start()
+    return service
+
+def wait_for(condition, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not condition():
+        time.sleep(0.02)
+    return condition()
+
+def test_failed_file_is_retried_until_it_loads(workdir):
+    service = start_service(workdir, failures=2, max_retries=5)
+    try:
+        assert wait_for(lambda: service.stats['loaded_files'] == 1)
+    finally:
+        service.request_stop()
+        service.join()
+    
+    assert service.stats['failed_files'] == 2
+    assert service.stats['retried_files'] == 2
+    assert service.stats['published_versions'] == 1
+    count = service.db_manager.fetch_data("SELECT COUNT(*) AS n FROM vehicle_registrations")['n'].iloc[0]
+    assert count == 50
+
+def test_retries_stop_after_max_retries(workdir):
+    service = start_service(workdir, failures=100, max_retries=2)
+    try:
+        assert wait_for(lambda: service.stats['failed_files'] == 3)
+        # Backoff would have queued a fourth attempt by now
+        time.sleep(0.5)
+    finally:
+        service.request_stop()
+        service.join()
+    
+    assert service.stats['failed_files'] == 3
+    assert service.stats['retried_files'] == 2
+    assert service.stats['loaded_files'] == 0
@@ -0,0 +1,32 @@
+"""
+Span recording for the performance panel
+"""
+import time
+from src.utils.instrumentation import SpanMetrics, SpanRecorder, span
+
+def test_nested_spans_are_measured_against_wall_clock_time():
+    recorder = SpanRecorder()
+    with recorder.activate():
+        with span('outer'):
+            with span('inner'):
+                time.sleep(0.05)
+    
+    spans = recorder.to_frame().set_index('span')['seconds']
+    # Nested spans add up to more than the rerun took, but neither exceeds it
+    assert spans.sum() > recorder.wall_seconds
+    assert spans.max() <= recorder.wall_seconds
+
+def test_metrics_keep_a_sections_compute_and_render_spans_apart():
+    metrics = SpanMetrics()
+    recorder = SpanRecorder()
+    with recorder.activate():
+        with span('kpi', rows=10, phase='compute'):
+            pass
+        with span('kpi', rows=10, phase='render'):
+            pass
+    for recorded in recorder.spans:
+        metrics.observe(recorded)
+    
+    rendered = metrics.render()
+    assert 'dashboard_span_count_total{span="kpi",phase="compute"} 1' in rendered
+    assert 'dashboard_span_count_total{span="kpi",phase="render"} 1' in rendered
@@ -0,0 +1,82 @@
+"""
+Upgrading a pre-partitioning PostgreSQL table that re-runs filled with duplicates
+
+Needs an empty, throwaway PostgreSQL database; its public schema is dropped
+and recreated:
+
+    TEST_POSTGRES_URL=postgresql://localhost/vehicle_dashboard_test python -m pytest tests/test_schema_upgrade.py
+"""
+import os
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from src.data_processor import RECORD_COLUMNS
+from src.database import DatabaseManager
+
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+# vehicle_registrations as the loader created it before rows had a natural key
+LEGACY_TABLE = """
+CREATE TABLE vehicle_registrations (
+    id SERIAL PRIMARY KEY,
+    registration_date DATE NOT NULL,
+    vehicle_category VARCHAR(10) NOT NULL CHECK (vehicle_category IN ('2W', '3W', '4W')),
+    manufacturer VARCHAR(100) NOT NULL,
+    state VARCHAR(100),
+    district VARCHAR(100),
+    rto_code VARCHAR(20),
+    registrations_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_vehicle_reg_date ON vehicle_registrations(registration_date);
+"""
+
+LEGACY_ROWS = [
+    # The same file loaded three times, plus a row loaded once
+    ('2023-06-15', '2W', 'Hero', 'ALL INDIA', 'ALL DISTRICTS', 'ALL_RTO', 100),
+    ('2023-06-15', '2W', 'Hero', 'ALL INDIA', 'ALL DISTRICTS', 'ALL_RTO', 100),
+    ('2023-06-15', '2W', 'Hero', 'ALL INDIA', 'ALL DISTRICTS', 'ALL_RTO', 100),
+    ('2024-06-15', '3W', 'Bajaj', 'ALL INDIA', 'ALL DISTRICTS', 'ALL_RTO', 40),
+]
+
+@pytest.fixture
+def legacy_database():
+    db_manager = DatabaseManager(POSTGRES_URL)
+    with db_manager.engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA public CASCADE"))
+        conn.execute(text("CREATE SCHEMA public"))
+        conn.execute(text(LEGACY_TABLE))
+        conn.execute(text(
+            "INSERT INTO vehicle_registrations "
+            "(registration_date, vehicle_category, manufacturer, state, district, rto_code, registrations_count) "
+            "VALUES (:date, :category, :manufacturer, :state, :district, :rto_code, :count)"
+        ), [
+            dict(zip(['date', 'category', 'manufacturer', 'state', 'district', 'rto_code', 'count'], row))
+            for row in LEGACY_ROWS
+        ])
+    try:
+        yield db_manager
+    finally:
+        db_manager.engine.dispose()
+
+def test_upgrade_collapses_duplicate_rows_onto_the_natural_key(legacy_database):
+    legacy_database.execute_schema()
+    
+    rows = legacy_database.fetch_data(
+        "SELECT id, EXTRACT(YEAR FROM registration_date)::INTEGER AS year, manufacturer, registrations_count "
+        "FROM vehicle_registrations ORDER BY registration_date"
+    )
+    assert rows[['year', 'manufacturer', 'registrations_count']].values.tolist() == [[2023, 'Hero', 300], [2024, 'Bajaj', 40]]
+    assert rows['id'].tolist() == [1, 4]
+    
+    # The upsert now has a unique index to conflict on
+    frame = pd.DataFrame([('2023-06-15', '2W', 'Hero', 'ALL INDIA', 'ALL DISTRICTS', 'ALL_RTO', 120)], columns=RECORD_COLUMNS)
+    with legacy_database.engine.begin() as conn:
+        legacy_database.upsert_registrations(conn, frame, '2023_2W.xlsx')
+    total = legacy_database.fetch_data(
+        "SELECT COUNT(*) AS row_count, SUM(registrations_count) AS total FROM vehicle_registrations WHERE manufacturer = 'Hero'"
+    )
+    assert total.values.tolist() == [[1, 120]]
@@ -0,0 +1,30 @@
+"""
+SnapshotStore writes from several writers at once
+"""
+import os
+import threading
+import pandas as pd
+from src.snapshot import SnapshotStore
+
+def test_concurrent_writers_each_replace_the_snapshot_whole(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'snapshot.arrow'))
+    frames = {version: pd.DataFrame({'total_registrations': range(version * 1000, version * 1000 + 50000)}) for version in range(1, 9)}
+    errors = []
+    
+    def write(version):
+        try:
+            for _ in range(5):
+                store.write(frames[version], version)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=write, args=(version,)) for version in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    version = store.version()
+    pd.testing.assert_frame_equal(store.read(version), frames[version])
+    assert os.listdir(tmp_path) == ['snapshot.arrow']
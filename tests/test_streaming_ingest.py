@@ -0,0 +1,27 @@
+"""
+Bounded memory of the streaming Excel reader as files grow
+"""
+import pytest
+from benchmarks import ingest_memory
+
+MB = 1024 * 1024
+
+@pytest.fixture(scope='module')
+def peaks():
+    return ingest_memory.measure([4000, 32000], chunk_size=1000)
+
+def test_streamed_records_match_read_excel(peaks):
+    for modes in peaks.values():
+        assert modes['stream']['records'] == modes['read_excel']['records']
+        assert modes['stream']['total'] == modes['read_excel']['total']
+
+def test_streamed_peak_stays_flat_as_files_grow(peaks):
+    small, large = peaks[4000], peaks[32000]
+    whole_growth = large['read_excel']['peak_rss_delta_bytes'] - small['read_excel']['peak_rss_delta_bytes']
+    streamed_growth = large['stream']['peak_rss_delta_bytes'] - small['stream']['peak_rss_delta_bytes']
+    
+    # read_excel grows with the file; the streamed peak only grows with the
+    # workbook's shared-strings table, which openpyxl always reads whole
+    assert whole_growth > 20 * MB
+    assert streamed_growth < whole_growth / 4
+    assert large['stream']['peak_rss_delta_bytes'] < large['read_excel']['peak_rss_delta_bytes'] / 2